@@ -1,34 +1,210 @@
 # -*- coding: utf-8 -*-
 """Windows EventLog resources database reader."""
 
+import argparse
+import asyncio
 import collections
+import hashlib
+import mmap
 import os
+import pathlib
+import re
 import sqlite3
+import string
+import struct
+import sys
+import threading
+import time
+
+from concurrent import futures
 
 from acstore import sqlite_store
 from acstore.containers import interface as containers_interface
 
-from plaso.engine import path_helper
 from plaso.helpers.windows import languages
 from plaso.helpers.windows import resource_files
 from plaso.output import logger
 
 
+def _GetEnvironmentVariableFlag(name, default=False):
+  """Retrieves a boolean flag from an environment variable.
+
+  Args:
+    name (str): name of the environment variable.
+    default (Optional[bool]): value if the environment variable is not set.
+
+  Returns:
+    bool: value of the flag.
+  """
+  value = os.environ.get(name, None)
+  if value is None:
+    return default
+
+  return value.strip().lower() in ('1', 'on', 'true', 'yes')
+
+
+def _GetObjectSize(value):
+  """Approximates the memory size of a value including the values it contains.
+
+  Args:
+    value (object): value, such as a dict, tuple, str or int.
+
+  Returns:
+    int: approximate size in bytes.
+  """
+  size = sys.getsizeof(value)
+  if isinstance(value, dict):
+    for key, dict_value in value.items():
+      size += _GetObjectSize(key) + _GetObjectSize(dict_value)
+  elif isinstance(value, (frozenset, list, set, tuple)):
+    for item in value:
+      size += _GetObjectSize(item)
+  return size
+
+
+def _IsSupportedFilterValue(value):
+  """Determines if a string value can be used in a filter expression.
+
+  The filter expression is converted into SQL by the attribute container
+  store, where quotes or backslashes in a string value cannot be represented.
+
+  Args:
+    value (str): string value.
+
+  Returns:
+    bool: True if the value can be used in a filter expression.
+  """
+  return '"' not in value and '\\' not in value
+
+
 class Sqlite3DatabaseFile(object):
-  """Class that defines a sqlite3 database file."""
+  """Class that defines a sqlite3 database file.
+
+  Every thread that queries the database uses its own connection, which is
+  created on first use and closed when the database file is closed. This
+  allows the database to be queried from multiple threads concurrently.
+  """
 
-  _HAS_TABLE_QUERY = (
-      'SELECT name FROM sqlite_master '
-      'WHERE type = "table" AND name = "{0:s}"')
+  _TABLE_NAMES_QUERY = 'SELECT name FROM sqlite_master WHERE type = "table"'
+
+  # The maximum number of cached prepared statements.
+  _MAXIMUM_CACHED_STATEMENTS = 128
+
+  # Pragmas used when opening an immutable database. The page cache size is
+  # in KiB, as indicated by the negative value.
+  _IMMUTABLE_PRAGMAS = (
+      'PRAGMA query_only = ON',
+      'PRAGMA mmap_size = 268435456',
+      'PRAGMA cache_size = -16384',
+      'PRAGMA temp_store = MEMORY')
 
   def __init__(self):
     """Initializes the database file object."""
     super(Sqlite3DatabaseFile, self).__init__()
     self._connection = None
-    self._cursor = None
+    self._connection_arguments = None
+    self._connections = []
+    self._lock = threading.Lock()
+    self._statement_cache = collections.OrderedDict()
+    self._thread_local = threading.local()
+    self._table_names = frozenset()
     self.filename = None
+    self.immutable = None
     self.read_only = None
 
+  def _Connect(self):
+    """Creates a connection to the database.
+
+    Returns:
+      sqlite3.Connection: connection.
+
+    Raises:
+      sqlite3.DatabaseError: if the database cannot be connected.
+    """
+    database, uri = self._connection_arguments
+
+    # The connection is only used by the thread that created it, but it is
+    # closed by the thread that closes the database file.
+    connection = sqlite3.connect(
+        database, cached_statements=self._MAXIMUM_CACHED_STATEMENTS,
+        check_same_thread=False, uri=uri)
+
+    if self.immutable:
+      try:
+        for pragma in self._IMMUTABLE_PRAGMAS:
+          connection.execute(pragma)
+      except sqlite3.DatabaseError:
+        connection.close()
+        raise
+
+    return connection
+
+  def _GetConnection(self):
+    """Retrieves the connection of the current thread.
+
+    Returns:
+      sqlite3.Connection: connection.
+
+    Raises:
+      sqlite3.DatabaseError: if the database cannot be connected.
+    """
+    connection = getattr(self._thread_local, 'connection', None)
+    if not connection:
+      connection = self._Connect()
+      with self._lock:
+        self._connections.append(connection)
+
+      self._thread_local.connection = connection
+
+    return connection
+
+  def _GetStatement(self, table_names, column_names, condition_shape):
+    """Retrieves a parameterized SELECT statement.
+
+    The statements are cached by their shape. Since the sqlite3 module caches
+    compiled statements by their SQL text, reusing the same text for the same
+    shape allows SQLite to skip parsing and planning of repeated queries.
+
+    Args:
+      table_names (tuple[str]): table names.
+      column_names (tuple[str]): column names.
+      condition_shape (tuple[tuple[str, int]]): name of the condition column
+          and number of values it is compared against, where 0 represents
+          an equality comparison against a single value.
+
+    Returns:
+      str: SQL statement.
+    """
+    lookup_key = (table_names, column_names, condition_shape)
+    with self._lock:
+      sql_query = self._statement_cache.get(lookup_key, None)
+      if sql_query:
+        self._statement_cache.move_to_end(lookup_key)
+        return sql_query
+
+    conditions = []
+    for column_name, number_of_values in condition_shape:
+      if not number_of_values:
+        conditions.append(f'{column_name:s} = ?')
+      else:
+        place_holders = ', '.join(['?'] * number_of_values)
+        conditions.append(f'{column_name:s} IN ({place_holders:s})')
+
+    table_names_string = ', '.join(table_names)
+    column_names_string = ', '.join(column_names)
+    sql_query = f'SELECT {column_names_string:s} FROM {table_names_string:s}'
+    if conditions:
+      conditions_string = ' AND '.join(conditions)
+      sql_query = f'{sql_query:s} WHERE {conditions_string:s}'
+
+    with self._lock:
+      if len(self._statement_cache) >= self._MAXIMUM_CACHED_STATEMENTS:
+        self._statement_cache.popitem(last=False)
+
+      self._statement_cache[lookup_key] = sql_query
+
+    return sql_query
+
   def Close(self):
     """Closes the database file.
 
@@ -38,18 +214,32 @@ class Sqlite3DatabaseFile(object):
     if not self._connection:
       raise RuntimeError('Cannot close database not opened.')
 
-    # We need to run commit or not all data is stored in the database.
-    self._connection.commit()
-    self._connection.close()
+    with self._lock:
+      connections = self._connections
+      self._connections = []
+
+    for connection in connections:
+      # We need to run commit or not all data is stored in the database.
+      if not self.read_only:
+        connection.commit()
+
+      connection.close()
 
     self._connection = None
-    self._cursor = None
+    self._connection_arguments = None
+    self._statement_cache = collections.OrderedDict()
+    self._thread_local = threading.local()
+    self._table_names = frozenset()
     self.filename = None
+    self.immutable = None
     self.read_only = None
 
   def HasTable(self, table_name):
     """Determines if a specific table exists.
 
+    The table names are read from the schema when the database is opened, so
+    this does not query the database.
+
     Args:
       table_name (str): table name.
 
@@ -63,60 +253,88 @@ class Sqlite3DatabaseFile(object):
       raise RuntimeError(
           'Cannot determine if table exists database not opened.')
 
-    sql_query = self._HAS_TABLE_QUERY.format(table_name)
+    return table_name in self._table_names
 
-    self._cursor.execute(sql_query)
-    if self._cursor.fetchone():
-      return True
+  def GetTableNames(self):
+    """Retrieves the names of the tables in the database.
+
+    Returns:
+      frozenset[str]: table names.
+
+    Raises:
+      RuntimeError: if the database is not opened.
+    """
+    if not self._connection:
+      raise RuntimeError('Cannot retrieve table names database not opened.')
+
+    return self._table_names
 
-    return False
+  def GetRows(
+      self, table_names, column_names, condition_column_names=None,
+      values=None, row_factory=None):
+    """Retrieves rows from a table using a parameterized query.
 
-  def GetValues(self, table_names, column_names, condition):
-    """Retrieves values from a table.
+    The values are bound to the query instead of being interpolated, which
+    allows the prepared statement to be reused for every lookup with the same
+    table and column shape.
 
     Args:
       table_names (list[str]): table names.
       column_names (list[str]): column names.
-      condition (str): query condition such as
-          "log_source == 'Application Error'".
+      condition_column_names (Optional[list[str]]): names of the columns to
+          compare against values. A name can be followed by a collation,
+          such as "log_source COLLATE NOCASE".
+      values (Optional[list[object]]): values of the condition columns. A list
+          or tuple value is compared with "IN" against all of its items.
+      row_factory (Optional[type]): factory of the rows, such as sqlite3.Row,
+          where None represents tuples.
 
-    Yields:
-      sqlite3.row: row.
+    Returns:
+      list[tuple|sqlite3.Row]: rows.
 
     Raises:
       RuntimeError: if the database is not opened.
+      ValueError: if the number of condition columns and values do not match.
     """
     if not self._connection:
-      raise RuntimeError('Cannot retrieve values database not opened.')
-
-    if condition:
-      condition = f' WHERE {condition:s}'
-    else:
-      condition = ''
-
-    table_names_string = ', '.join(table_names)
-    column_names_string = ', '.join(column_names)
-    sql_query = (
-        f'SELECT {column_names_string:s} FROM {table_names_string:s}'
-        f'{condition:s}')
+      raise RuntimeError('Cannot retrieve rows database not opened.')
+
+    condition_column_names = condition_column_names or []
+    values = values or []
+    if len(condition_column_names) != len(values):
+      raise ValueError('Number of condition columns and values do not match.')
+
+    condition_shape = []
+    parameters = []
+    for column_name, value in zip(condition_column_names, values):
+      if isinstance(value, (list, tuple)):
+        condition_shape.append((column_name, len(value)))
+        parameters.extend(value)
+      else:
+        condition_shape.append((column_name, 0))
+        parameters.append(value)
 
-    self._cursor.execute(sql_query)
+    sql_query = self._GetStatement(
+        tuple(table_names), tuple(column_names), tuple(condition_shape))
 
-    # TODO: have a look at https://docs.python.org/2/library/
-    # sqlite3.html#sqlite3.Row.
-    for row in self._cursor:
-      yield {
-          column_name: row[column_index]
-          for column_index, column_name in enumerate(column_names)}
+    # Use a local cursor to prevent another query interrupting the results.
+    cursor = self._GetConnection().cursor()
+    cursor.row_factory = row_factory
+    cursor.execute(sql_query, parameters)
+    return cursor.fetchall()
 
-  def Open(self, filename, read_only=False):
+  def Open(self, filename, read_only=False, immutable=False):
     """Opens the database file.
 
     Args:
       filename (str): filename of the database.
       read_only (Optional[bool]): True if the database should be opened in
-          read-only mode. Since sqlite3 does not support a real read-only
-          mode we fake it by only permitting SELECT queries.
+          read-only mode.
+      immutable (Optional[bool]): True if the database should be opened as
+          an immutable file, which implies read-only mode. SQLite then does
+          not use locking or check the journal, and the file is memory
+          mapped so that multiple processes share the same page cache. Only
+          use this for database files that do not change while opened.
 
     Returns:
       bool: True if successful.
@@ -127,62 +345,130 @@ class Sqlite3DatabaseFile(object):
     if self._connection:
       raise RuntimeError('Cannot open database already opened.')
 
+    read_only = read_only or immutable
+
     self.filename = filename
+    self.immutable = immutable
     self.read_only = read_only
 
+    path_uri = None
+    if read_only:
+      try:
+        path_uri = pathlib.Path(os.path.abspath(filename)).as_uri()
+      except ValueError:
+        pass
+
+    if not path_uri:
+      self._connection_arguments = (filename, False)
+    elif immutable:
+      self._connection_arguments = (f'{path_uri:s}?mode=ro&immutable=1', True)
+    else:
+      self._connection_arguments = (f'{path_uri:s}?mode=ro', True)
+
     try:
-      self._connection = sqlite3.connect(filename)
-    except sqlite3.OperationalError:
-      return False
+      self._connection = self._GetConnection()
 
-    if not self._connection:
-      return False
+      # Read the schema once, since the database is not expected to change
+      # while opened by the reader.
+      cursor = self._connection.execute(self._TABLE_NAMES_QUERY)
+      self._table_names = frozenset(row[0] for row in cursor)
+
+    except sqlite3.DatabaseError:
+      if self._connection:
+        self.Close()
 
-    self._cursor = self._connection.cursor()
-    if not self._cursor:
+      self._connection_arguments = None
+      self._thread_local = threading.local()
       return False
 
     return True
 
 
 class WinevtResourcesSqlite3DatabaseReader(object):
-  """Windows EventLog resources SQLite database reader."""
+  """Windows EventLog resources SQLite database reader.
 
-  def __init__(self):
-    """Initializes a Windows EventLog resources SQLite database reader."""
+  Attributes:
+    preload (bool): True if the EventLog providers and their message files
+        are loaded into memory when the database is opened.
+    preload_size (int): approximate memory size, in bytes, of the preloaded
+        EventLog providers and message files.
+    preload_time (float): time, in seconds, it took to preload the EventLog
+        providers and message files.
+  """
+
+  _MESSAGE_TABLE_NAME_RE = re.compile(
+      r'^message_table_([0-9]+)_0x([0-9a-f]{8})$', re.IGNORECASE)
+
+  # The EventLog sources are compared case-insensitive with the NOCASE
+  # collation of SQLite, which only folds the case of ASCII characters. The
+  # preloaded EventLog sources are folded the same way.
+  _LOG_SOURCE_CASE_FOLDING = str.maketrans(
+      string.ascii_uppercase, string.ascii_lowercase)
+
+  # The maximum number of values compared against in a single query, which
+  # is well below the SQLite default limit of 999 bound parameters.
+  _MAXIMUM_NUMBER_OF_QUERY_VALUES = 512
+
+  def __init__(self, preload=False):
+    """Initializes a Windows EventLog resources SQLite database reader.
+
+    Args:
+      preload (Optional[bool]): True if the EventLog providers and their
+          message files should be loaded into memory when the database is
+          opened, instead of being queried on every lookup.
+    """
     super(WinevtResourcesSqlite3DatabaseReader, self).__init__()
     self._database_file = Sqlite3DatabaseFile()
+    self._event_log_provider_keys = None
+    self._message_file_keys = None
+    self._message_tables = {}
     self._resouce_file_helper = resource_files.WindowsResourceFileHelper
     self._string_format = 'wrc'
+    self.preload = preload
+    self.preload_size = 0
+    self.preload_time = 0.0
+
+  def _FormatMessageString(self, message_string):
+    """Converts a message string from Windows Resource to PEP 3101 format.
+
+    Args:
+      message_string (str): message string in Windows Resource format.
+
+    Returns:
+      str: message string in PEP 3101 format.
+    """
+    return self._resouce_file_helper.FormatMessageStringInPEP3101(
+        message_string)
 
   def _GetEventLogProviderKey(self, log_source):
     """Retrieves the EventLog provider key.
 
+    The EventLog source is compared case-insensitive. If multiple providers
+    define the EventLog source, the provider with the lowest key is used,
+    both with and without preloading.
+
     Args:
       log_source (str): EventLog source.
 
     Returns:
-      str: EventLog provider key or None if not available.
-
-    Raises:
-      RuntimeError: if more than one value is found in the database.
+      int: EventLog provider key or None if not available.
     """
-    table_names = ['event_log_providers']
-    column_names = ['event_log_provider_key']
-    condition = f'log_source == "{log_source:s}"'
+    if not log_source:
+      return None
 
-    values_list = list(self._database_file.GetValues(
-        table_names, column_names, condition))
+    if self._event_log_provider_keys is not None:
+      return self._event_log_provider_keys.get(
+          log_source.translate(self._LOG_SOURCE_CASE_FOLDING), None)
 
-    number_of_values = len(values_list)
-    if number_of_values == 0:
-      return None
+    rows = self._database_file.GetRows(
+        ['event_log_providers'], ['event_log_provider_key'],
+        condition_column_names=['log_source COLLATE NOCASE'],
+        values=[log_source])
 
-    if number_of_values == 1:
-      values = values_list[0]
-      return values['event_log_provider_key']
+    if not rows:
+      return None
 
-    raise RuntimeError('More than one value found in database.')
+    return min(row[0] for row in rows)
 
   def _GetMessage(self, message_file_key, lcid, message_identifier):
     """Retrieves a specific message from a specific message table.
@@ -198,27 +484,68 @@ class WinevtResourcesSqlite3DatabaseReader(object):
     Raises:
       RuntimeError: if more than one value is found in the database.
     """
-    table_name = f'message_table_{message_file_key:d}_0x{lcid:08x}'
-
-    has_table = self._database_file.HasTable(table_name)
-    if not has_table:
+    table_name = self._message_tables.get((message_file_key, lcid), None)
+    if not table_name:
       return None
 
-    column_names = ['message_string']
-    condition = f'message_identifier == "0x{message_identifier:08x}"'
-
-    values = list(self._database_file.GetValues(
-        [table_name], column_names, condition))
+    rows = self._database_file.GetRows(
+        [table_name], ['message_string'],
+        condition_column_names=['message_identifier'],
+        values=[f'0x{message_identifier:08x}'])
 
-    number_of_values = len(values)
-    if number_of_values == 0:
+    number_of_rows = len(rows)
+    if number_of_rows == 0:
       return None
 
-    if number_of_values == 1:
-      return values[0]['message_string']
+    if number_of_rows == 1:
+      return rows[0][0]
 
     raise RuntimeError('More than one value found in database.')
 
+  def _GetMessages(self, table_name, message_identifiers):
+    """Retrieves specific messages from a specific message table.
+
+    Args:
+      table_name (str): name of the message table.
+      message_identifiers (list[int]): message identifiers.
+
+    Returns:
+      dict[int, str]: message strings per message identifier.
+
+    Raises:
+      RuntimeError: if more than one value is found in the database.
+    """
+    lookup_values = {
+        f'0x{message_identifier:08x}': message_identifier
+        for message_identifier in message_identifiers}
+    lookup_values_list = list(lookup_values.keys())
+
+    message_strings = {}
+    for chunk_index in range(
+        0, len(lookup_values_list), self._MAXIMUM_NUMBER_OF_QUERY_VALUES):
+      values = lookup_values_list[
+          chunk_index:chunk_index + self._MAXIMUM_NUMBER_OF_QUERY_VALUES]
+
+      # Pad the values to a power of 2 to bound the number of distinct
+      # statements that need to be prepared.
+      number_of_values = 1
+      while number_of_values < len(values):
+        number_of_values *= 2
+      values.extend([values[-1]] * (number_of_values - len(values)))
+
+      rows = self._database_file.GetRows(
+          [table_name], ['message_identifier', 'message_string'],
+          condition_column_names=['message_identifier'], values=[values])
+
+      for lookup_value, message_string in rows:
+        message_identifier = lookup_values[lookup_value]
+        if message_identifier in message_strings:
+          raise RuntimeError('More than one value found in database.')
+
+        message_strings[message_identifier] = message_string
+
+    return message_strings
+
   def _GetMessageFileKeys(self, event_log_provider_key):
     """Retrieves the message file keys.
 
@@ -228,18 +555,100 @@ class WinevtResourcesSqlite3DatabaseReader(object):
     Yields:
       int: message file key.
     """
-    table_names = ['message_file_per_event_log_provider']
-    column_names = ['message_file_key']
-    condition = f'event_log_provider_key == {event_log_provider_key:d}'
+    if self._message_file_keys is not None:
+      yield from self._message_file_keys.get(event_log_provider_key, ())
+      return
+
+    rows = self._database_file.GetRows(
+        ['message_file_per_event_log_provider'], ['message_file_key'],
+        condition_column_names=['event_log_provider_key'],
+        values=[event_log_provider_key])
+
+    for row in rows:
+      yield row[0]
+
+  def _PreloadEventLogProviders(self):
+    """Loads the EventLog providers and their message files into memory."""
+    start_time = time.perf_counter()
+
+    self._event_log_provider_keys = self._ReadEventLogProviderKeys()
+    self._message_file_keys = self._ReadMessageFileKeys()
+
+    self.preload_time = time.perf_counter() - start_time
+    self.preload_size = (
+        _GetObjectSize(self._event_log_provider_keys) +
+        _GetObjectSize(self._message_file_keys))
+
+    logger.info((
+        f'Preloaded {len(self._event_log_provider_keys):d} EventLog sources '
+        f'and message files of {len(self._message_file_keys):d} providers in '
+        f'{self.preload_time:.3f} seconds using approximately '
+        f'{self.preload_size:d} bytes.'))
+
+  def _ReadEventLogProviderKeys(self):
+    """Reads the EventLog provider keys of all the EventLog sources.
+
+    Returns:
+      dict[str, int]: EventLog provider key per EventLog source, where the
+          case of the EventLog source is folded as for the lookups.
+    """
+    event_log_provider_keys = {}
+    for event_log_provider_key, log_source in self._database_file.GetRows(
+        ['event_log_providers'], ['event_log_provider_key', 'log_source']):
+      if log_source:
+        log_source = sys.intern(
+            log_source.translate(self._LOG_SOURCE_CASE_FOLDING))
+        existing_key = event_log_provider_keys.get(log_source, None)
+        if existing_key is None or event_log_provider_key < existing_key:
+          event_log_provider_keys[log_source] = event_log_provider_key
+
+    return event_log_provider_keys
 
-    generator = self._database_file.GetValues(
-        table_names, column_names, condition)
-    for values in generator:
-      yield values['message_file_key']
+  def _ReadMessageFileKeys(self):
+    """Reads the message file keys of all the EventLog providers.
+
+    Returns:
+      dict[int, tuple[int]]: message file keys per EventLog provider key.
+    """
+    message_file_keys = {}
+    for message_file_key, event_log_provider_key in self._database_file.GetRows(
+        ['message_file_per_event_log_provider'],
+        ['message_file_key', 'event_log_provider_key']):
+      message_file_keys.setdefault(event_log_provider_key, []).append(
+          message_file_key)
+
+    return {
+        event_log_provider_key: tuple(keys)
+        for event_log_provider_key, keys in message_file_keys.items()}
+
+  def _ReadMessageTables(self):
+    """Reads the message table catalog from the database schema."""
+    self._message_tables = {}
+    for table_name in self._database_file.GetTableNames():
+      match = self._MESSAGE_TABLE_NAME_RE.match(table_name)
+      if match:
+        message_file_key = int(match.group(1), 10)
+        lcid = int(match.group(2), 16)
+        self._message_tables[(message_file_key, lcid)] = table_name
 
   def Close(self):
     """Closes the database reader object."""
     self._database_file.Close()
+    self._event_log_provider_keys = None
+    self._message_file_keys = None
+    self._message_tables = {}
+
+  def GetEventLogProviderKeys(self):
+    """Retrieves the EventLog provider keys of all the EventLog sources.
+
+    Returns:
+      dict[str, int]: EventLog provider key per EventLog source, where the
+          case of the EventLog source is folded as for the lookups.
+    """
+    if self._event_log_provider_keys is not None:
+      return dict(self._event_log_provider_keys)
+
+    return self._ReadEventLogProviderKeys()
 
   def GetMessage(self, log_source, lcid, message_identifier):
     """Retrieves a specific message for a specific EventLog source.
@@ -269,11 +678,113 @@ class WinevtResourcesSqlite3DatabaseReader(object):
         break
 
     if self._string_format == 'wrc':
-      message_string = self._resouce_file_helper.FormatMessageStringInPEP3101(
-          message_string)
+      message_string = self._FormatMessageString(message_string)
 
     return message_string
 
+  def GetMessages(self, requests):
+    """Retrieves messages for multiple EventLog sources in a single pass.
+
+    The requests are grouped by EventLog provider and LCID, and the messages
+    of each group are retrieved with one query per message table.
+
+    Args:
+      requests (list[tuple[str, int, int]]): EventLog source, language code
+          identifier (LCID) and message identifier of the requested messages.
+
+    Returns:
+      list[str]: message strings, or None if not available, in the order of
+          the requests.
+    """
+    message_strings = [None] * len(requests)
+
+    event_log_provider_keys = {}
+    request_indexes_per_group = {}
+    for request_index, (log_source, lcid, message_identifier) in enumerate(
+        requests):
+      if log_source not in event_log_provider_keys:
+        event_log_provider_keys[log_source] = self._GetEventLogProviderKey(
+            log_source)
+
+      event_log_provider_key = event_log_provider_keys[log_source]
+      if not event_log_provider_key:
+        continue
+
+      request_indexes = request_indexes_per_group.setdefault(
+          (event_log_provider_key, lcid), {})
+      request_indexes.setdefault(message_identifier, []).append(request_index)
+
+    for (event_log_provider_key, lcid), request_indexes in (
+        request_indexes_per_group.items()):
+      for message_file_key in self._GetMessageFileKeys(event_log_provider_key):
+        if not request_indexes:
+          break
+
+        table_name = self._message_tables.get((message_file_key, lcid), None)
+        if not table_name:
+          continue
+
+        messages = self._GetMessages(table_name, list(request_indexes.keys()))
+        for message_identifier, message_string in messages.items():
+          if not message_string:
+            continue
+
+          if self._string_format == 'wrc':
+            message_string = self._FormatMessageString(message_string)
+
+          for request_index in request_indexes.pop(message_identifier):
+            message_strings[request_index] = message_string
+
+    return message_strings
+
+  def GetMessageFileKeys(self):
+    """Retrieves the message file keys of all the EventLog providers.
+
+    Returns:
+      dict[int, tuple[int]]: message file keys per EventLog provider key.
+    """
+    if self._message_file_keys is not None:
+      return dict(self._message_file_keys)
+
+    return self._ReadMessageFileKeys()
+
+  def GetMessageTableStrings(self, message_file_key, lcid):
+    """Retrieves all the message strings of a specific message table.
+
+    Only message strings with a message identifier in the format that is
+    looked up, such as "0x00000001", can be resolved and are returned. The
+    first message string of a message identifier is used.
+
+    Args:
+      message_file_key (int): message file key.
+      lcid (int): language code identifier (LCID).
+
+    Returns:
+      dict[int, str]: message string per message identifier.
+    """
+    table_name = self._message_tables.get((message_file_key, lcid), None)
+    if not table_name:
+      return {}
+
+    message_strings = {}
+    for lookup_value, message_string in self._database_file.GetRows(
+        [table_name], ['message_identifier', 'message_string']):
+      try:
+        message_identifier = int(lookup_value, 16)
+      except (TypeError, ValueError):
+        continue
+
+      if (not message_string or message_identifier in message_strings or
+          lookup_value != f'0x{message_identifier:08x}'):
+        continue
+
+      if self._string_format == 'wrc':
+        message_string = self._FormatMessageString(message_string)
+
+      message_strings[message_identifier] = message_string
+
+    return message_strings
+
   def GetMetadataAttribute(self, attribute_name):
     """Retrieves the metadata attribute.
 
@@ -292,26 +803,40 @@ class WinevtResourcesSqlite3DatabaseReader(object):
     if not has_table:
       return None
 
-    column_names = ['value']
-    condition = f'name == "{attribute_name:s}"'
+    rows = self._database_file.GetRows(
+        [table_name], ['value'], condition_column_names=['name'],
+        values=[attribute_name])
 
-    values = list(self._database_file.GetValues(
-        [table_name], column_names, condition))
-
-    number_of_values = len(values)
-    if number_of_values == 0:
+    number_of_rows = len(rows)
+    if number_of_rows == 0:
       return None
 
-    if number_of_values == 1:
-      return values[0]['value']
+    if number_of_rows == 1:
+      return rows[0][0]
 
     raise RuntimeError('More than one value found in database.')
 
-  def Open(self, filename):
+  @classmethod
+  def IsMessageTableName(cls, table_name):
+    """Determines if a table name is the name of a message table.
+
+    Args:
+      table_name (str): table name.
+
+    Returns:
+      bool: True if the table name is the name of a message table, such as
+          "message_table_1_0x00000409".
+    """
+    return bool(cls._MESSAGE_TABLE_NAME_RE.match(table_name))
+
+  def Open(self, filename, immutable=True):
     """Opens the database reader object.
 
     Args:
       filename (str): filename of the database.
+      immutable (Optional[bool]): True if the database should be opened as an
+          immutable, memory mapped, file. The winevt-rc database is a static
+          artifact, hence this is the default.
 
     Returns:
       bool: True if successful.
@@ -319,91 +844,633 @@ class WinevtResourcesSqlite3DatabaseReader(object):
     Raises:
       RuntimeError: if the version or string format of the database
           is not supported.
+      sqlite3.DatabaseError: if the metadata of the database cannot be read.
     """
-    if not self._database_file.Open(filename, read_only=True):
+    if not self._database_file.Open(
+        filename, read_only=True, immutable=immutable):
       return False
 
-    version = self.GetMetadataAttribute('version')
-    if not version or version != '20150315':
-      raise RuntimeError(f'Unsupported version: {version:s}')
+    # Close the database file if it is not supported, since other database
+    # formats are tried next.
+    try:
+      version = self.GetMetadataAttribute('version')
+      if not version or version != '20150315':
+        raise RuntimeError(f'Unsupported version: {version!s}')
 
-    string_format = self.GetMetadataAttribute('string_format')
-    if not string_format:
-      string_format = 'wrc'
+      string_format = self.GetMetadataAttribute('string_format')
+      if not string_format:
+        string_format = 'wrc'
 
-    if string_format not in ('pep3101', 'wrc'):
-      raise RuntimeError(f'Unsupported string format: {string_format:s}')
+      if string_format not in ('pep3101', 'wrc'):
+        raise RuntimeError(f'Unsupported string format: {string_format!s}')
+
+    except (RuntimeError, sqlite3.DatabaseError):
+      self._database_file.Close()
+      raise
 
     self._string_format = string_format
+
+    self._ReadMessageTables()
+
+    if self.preload:
+      self._PreloadEventLogProviders()
+
     return True
 
 
-class WinevtResourcesEventLogProvider(containers_interface.AttributeContainer):
-  """Windows Event Log provider.
+# Displacement of a bucket of a lookup file.
+_LOOKUP_FILE_DISPLACEMENT = struct.Struct('<I')
 
-  Attributes:
-    additional_identifier (str): additional identifier of the provider,
-        contains a GUID.
-    category_message_files (set[str]): paths of the category message files.
-    event_message_files (set[str]): paths of the event message files.
-    identifier (str): identifier of the provider, contains a GUID.
-    log_sources (list[str]): names of the corresponding Event Log sources.
-    log_types (list[str]): Windows Event Log types.
-    name (str): name of the provider.
-    parameter_message_files (set[str]): paths of the parameter message
-        files.
-    windows_version (str): Windows version.
-  """
+# Hash of a lookup file key, as 32-bit bucket hash, 32-bit slot step hash and
+# 64-bit slot hash.
+_LOOKUP_FILE_HASH = struct.Struct('<IIQ')
 
-  CONTAINER_TYPE = 'winevtrc_eventlog_provider'
+# Header of a lookup file: signature, format version, salt of the hash
+# function, number of LCIDs, number of buckets, number of slots, followed by
+# the offsets of the buckets, slots, keys and strings sections and the size
+# of the file.
+_LOOKUP_FILE_HEADER = struct.Struct('<8sI16sIIIQQQQQ')
 
-  SCHEMA = {
-      'additional_identifier': 'str',
-      'category_message_files': 'List[str]',
-      'event_message_files': 'List[str]',
-      'identifier': 'str',
-      'log_sources': 'List[str]',
-      'log_types': 'List[str]',
-      'name': 'str',
-      'parameter_message_files': 'List[str]',
-      'windows_version': 'str'}
+_LOOKUP_FILE_SIGNATURE = b'WEVTRCLF'
 
-  def __init__(self):
-    """Initializes the Windows Event Log provider."""
-    super(WinevtResourcesEventLogProvider, self).__init__()
-    self.additional_identifier = None
-    self.category_message_files = set()
-    self.event_message_files = set()
-    self.identifier = None
-    self.log_sources = []
-    self.log_types = []
-    self.name = None
-    self.parameter_message_files = set()
-    self.windows_version = None
+_LOOKUP_FILE_FORMAT_VERSION = 1
 
+# Slot of a lookup file: offset and size of the key, and the value, which is
+# either an integer, if the value size is 0, or the offset of a UTF-8 encoded
+# string of value size bytes.
+_LOOKUP_FILE_SLOT = struct.Struct('<IIII')
 
-class WinevtResourcesMessageFile(containers_interface.AttributeContainer):
-  """Windows Event Log message file.
+# Key of an event definition in a lookup file: "D", provider number, event
+# identifier, event version and LCID.
+_LOOKUP_FILE_EVENT_DEFINITION_KEY = struct.Struct('<cIIII')
+
+# Key of a message string in a lookup file: "M", provider number, message
+# identifier and LCID.
+_LOOKUP_FILE_MESSAGE_KEY = struct.Struct('<cIII')
+
+# Event version of event definitions that apply to any version.
+_LOOKUP_FILE_ANY_VERSION = 0xffffffff
+
+
+def _HashLookupFileKey(key, salt):
+  """Hashes a key of a winevt-rc lookup file.
+
+  Args:
+    key (bytes): key.
+    salt (bytes): salt of the hash function of the lookup file.
+
+  Returns:
+    tuple[int, int, int]: bucket hash, slot hash and slot step hash.
+  """
+  digest = hashlib.blake2b(key, digest_size=16, salt=salt).digest()
+  bucket_hash, step_hash, slot_hash = _LOOKUP_FILE_HASH.unpack(digest)
+  return bucket_hash, slot_hash, step_hash
+
+
+class WinevtResourcesLookupFile(object):
+  """Windows EventLog resources lookup file.
+
+  A lookup file is an immutable, memory mapped, file compiled from a winevt-rc
+  database, for specific LCIDs, with CreateLookupFile. The EventLog providers,
+  event definitions and message strings are stored in a perfect hash table,
+  such that a lookup needs no more than a few hash computations and page
+  accesses, and the pages are shared by all processes that open the file.
+  Message strings are stored in PEP 3101 format and only decoded when looked
+  up.
+
+  The keys of the hash table are:
+  * "I" + EventLog provider identifier, which maps to the provider number;
+  * "S" + lower case EventLog source, which maps to the provider number;
+  * "D" + provider number, event identifier, event version and LCID, which
+        maps to the message identifier of the event definition;
+  * "M" + provider number, message identifier and LCID, which maps to the
+        message string.
 
   Attributes:
-    file_version (str): file version.
-    product_version (str): product version.
-    windows_path (str): path as defined by the Window Event Log provider.
-    windows_version (str): Windows version.
+    lcids (frozenset[int]): language code identifiers (LCIDs) of the message
+        strings in the lookup file.
   """
 
-  CONTAINER_TYPE = 'winevtrc_message_file'
+  def __init__(self):
+    """Initializes a Windows EventLog resources lookup file."""
+    super(WinevtResourcesLookupFile, self).__init__()
+    self._buckets_offset = 0
+    self._keys_offset = 0
+    self._mapped_file = None
+    self._number_of_buckets = 0
+    self._number_of_slots = 0
+    self._salt = None
+    self._slots_offset = 0
+    self._strings_offset = 0
+    self.lcids = frozenset()
+
+  def _GetProviderNumber(self, provider_identifier, log_source):
+    """Retrieves the number of an EventLog provider.
 
-  SCHEMA = {
-      'file_version': 'str',
-      'product_version': 'str',
-      'windows_path': 'str',
-      'windows_version': 'str'}
+    Args:
+      provider_identifier (str): EventLog provider identifier.
+      log_source (str): EventLog source, such as "Application Error".
 
-  def __init__(
-      self, file_version=None, product_version=None, windows_path=None,
-      windows_version=None):
-    """Initializes a Windows Event Log message file.
+    Returns:
+      tuple[int, bool]: EventLog provider number or None if not available,
+          and True if the provider was resolved by its identifier.
+    """
+    if provider_identifier:
+      provider_number = self._GetValue(
+          b'I' + provider_identifier.lower().encode('utf-8', 'surrogatepass'))
+      if provider_number is not None:
+        return provider_number, True
+
+    if log_source:
+      provider_number = self._GetValue(
+          b'S' + log_source.lower().encode('utf-8', 'surrogatepass'))
+      if provider_number is not None:
+        return provider_number, False
+
+    return None, False
+
+  def _GetValue(self, key):
+    """Retrieves the value of a specific key.
+
+    Args:
+      key (bytes): key.
+
+    Returns:
+      object: integer or string value, or None if not available.
+    """
+    bucket_hash, slot_hash, step_hash = _HashLookupFileKey(key, self._salt)
+
+    displacement, = _LOOKUP_FILE_DISPLACEMENT.unpack_from(
+        self._mapped_file, self._buckets_offset + (
+            (bucket_hash % self._number_of_buckets) *
+            _LOOKUP_FILE_DISPLACEMENT.size))
+
+    slot_index = (
+        slot_hash + displacement * (
+            1 + step_hash % (self._number_of_slots - 1))
+    ) % self._number_of_slots
+
+    key_offset, key_size, value, value_size = _LOOKUP_FILE_SLOT.unpack_from(
+        self._mapped_file, self._slots_offset + (
+            slot_index * _LOOKUP_FILE_SLOT.size))
+
+    # The slot can contain another key, since keys that are not in the hash
+    # table map to an arbitrary slot.
+    if key_size != len(key):
+      return None
+
+    key_offset += self._keys_offset
+    if self._mapped_file[key_offset:key_offset + key_size] != key:
+      return None
+
+    if not value_size:
+      return value
+
+    value += self._strings_offset
+    return str(
+        self._mapped_file[value:value + value_size], 'utf-8', 'surrogatepass')
+
+  def Close(self):
+    """Closes the lookup file."""
+    if self._mapped_file:
+      self._mapped_file.close()
+      self._mapped_file = None
+
+    self.lcids = frozenset()
+
+  def GetMessageString(
+      self, provider_identifier, log_source, lcid, message_identifier,
+      event_version):
+    """Retrieves a specific message string.
+
+    The event definitions, which map an event identifier and version to a
+    message identifier, are only applied if the EventLog provider is resolved
+    by its identifier. As for lookups in the winevt-rc database, where event
+    definitions are matched by the identifier as provided, this requires
+    a lower case identifier.
+
+    Args:
+      provider_identifier (str): EventLog provider identifier.
+      log_source (str): EventLog source, such as "Application Error".
+      lcid (int): language code identifier (LCID).
+      message_identifier (int): message identifier.
+      event_version (int): event version or None if not set.
+
+    Returns:
+      str: message string or None if not available.
+    """
+    if not 0 <= message_identifier <= 0xffffffff:
+      return None
+
+    provider_number, resolved_by_identifier = self._GetProviderNumber(
+        provider_identifier, log_source)
+    if provider_number is None:
+      return None
+
+    if (resolved_by_identifier and
+        provider_identifier == provider_identifier.lower() and (
+            event_version is None or
+            0 <= event_version < _LOOKUP_FILE_ANY_VERSION)):
+      if event_version is None:
+        event_version = _LOOKUP_FILE_ANY_VERSION
+
+      mapped_message_identifier = self._GetValue(
+          _LOOKUP_FILE_EVENT_DEFINITION_KEY.pack(
+              b'D', provider_number, message_identifier, event_version, lcid))
+      if mapped_message_identifier is not None:
+        message_identifier = mapped_message_identifier
+
+    return self._GetValue(_LOOKUP_FILE_MESSAGE_KEY.pack(
+        b'M', provider_number, message_identifier, lcid))
+
+  def Open(self, path):
+    """Opens the lookup file.
+
+    Args:
+      path (str): path of the lookup file.
+
+    Returns:
+      bool: True if successful or False if the file is not a lookup file.
+
+    Raises:
+      IOError: if the format version of the lookup file is not supported or
+          the file is truncated.
+      OSError: if the format version of the lookup file is not supported or
+          the file is truncated.
+    """
+    with open(path, 'rb') as file_object:
+      header_data = file_object.read(_LOOKUP_FILE_HEADER.size)
+      if len(header_data) < _LOOKUP_FILE_HEADER.size:
+        return False
+
+      (signature, format_version, salt, number_of_lcids, number_of_buckets,
+       number_of_slots, buckets_offset, slots_offset, keys_offset,
+       strings_offset, file_size) = _LOOKUP_FILE_HEADER.unpack(header_data)
+
+      if signature != _LOOKUP_FILE_SIGNATURE:
+        return False
+
+      if format_version != _LOOKUP_FILE_FORMAT_VERSION:
+        raise IOError(f'Unsupported format version: {format_version:d}')
+
+      if os.fstat(file_object.fileno()).st_size != file_size:
+        raise IOError('Lookup file is truncated.')
+
+      mapped_file = mmap.mmap(
+          file_object.fileno(), 0, access=mmap.ACCESS_READ)
+
+    lcids = struct.unpack_from(
+        f'<{number_of_lcids:d}I', mapped_file, _LOOKUP_FILE_HEADER.size)
+
+    self._buckets_offset = buckets_offset
+    self._keys_offset = keys_offset
+    self._mapped_file = mapped_file
+    self._number_of_buckets = number_of_buckets
+    self._number_of_slots = number_of_slots
+    self._salt = salt
+    self._slots_offset = slots_offset
+    self._strings_offset = strings_offset
+    self.lcids = frozenset(lcids)
+
+    return True
+
+
+class WinevtResourcesLookupFileWriter(object):
+  """Windows EventLog resources lookup file writer.
+
+  The perfect hash table is built with the hash and displace algorithm, where
+  the keys are hashed into buckets and the buckets, largest first, are
+  assigned the first displacement that maps all their keys to free slots.
+  The hash table is not minimal, since it has more slots than keys, as
+  defined by the load factor.
+  """
+
+  # The maximum number of keys per bucket on average.
+  _AVERAGE_BUCKET_SIZE = 4
+
+  # The maximum number of salts of the hash function that are tried.
+  _MAXIMUM_NUMBER_OF_SALTS = 16
+
+  # The ratio of keys to slots.
+  _LOAD_FACTOR = 0.8
+
+  def __init__(self):
+    """Initializes a Windows EventLog resources lookup file writer."""
+    super(WinevtResourcesLookupFileWriter, self).__init__()
+    self._string_offsets = {}
+    self._strings = []
+    self._strings_size = 0
+    self._values = {}
+
+  def _GetNumberOfSlots(self, number_of_keys):
+    """Determines the number of slots of the hash table.
+
+    The number of slots is a prime, such that every slot step visits every
+    slot.
+
+    Args:
+      number_of_keys (int): number of keys.
+
+    Returns:
+      int: number of slots.
+    """
+    number_of_slots = max(3, int(number_of_keys / self._LOAD_FACTOR) + 1)
+    while any(
+        number_of_slots % divisor == 0
+        for divisor in range(2, int(number_of_slots ** 0.5) + 1)):
+      number_of_slots += 1
+
+    return number_of_slots
+
+  def _PlaceKeys(self, keys, salt, number_of_buckets, number_of_slots):
+    """Places the keys into the slots of the hash table.
+
+    Args:
+      keys (list[bytes]): keys.
+      salt (bytes): salt of the hash function.
+      number_of_buckets (int): number of buckets.
+      number_of_slots (int): number of slots.
+
+    Returns:
+      tuple[list[int], list[int]]: displacement per bucket and key index per
+          slot, where None represents an empty slot, or None if no
+          displacement could be found for one of the buckets.
+    """
+    buckets = [[] for _ in range(number_of_buckets)]
+    for key_index, key in enumerate(keys):
+      bucket_hash, slot_hash, step_hash = _HashLookupFileKey(key, salt)
+      buckets[bucket_hash % number_of_buckets].append((
+          key_index, slot_hash % number_of_slots,
+          1 + step_hash % (number_of_slots - 1)))
+
+    displacements = [0] * number_of_buckets
+    slots = [None] * number_of_slots
+
+    for bucket_index in sorted(
+        range(number_of_buckets), key=lambda index: len(buckets[index]),
+        reverse=True):
+      bucket = buckets[bucket_index]
+      if not bucket:
+        break
+
+      for displacement in range(number_of_slots):
+        slot_indexes = [
+            (slot_index + displacement * slot_step) % number_of_slots
+            for _, slot_index, slot_step in bucket]
+
+        if (len(set(slot_indexes)) == len(slot_indexes) and all(
+            slots[slot_index] is None for slot_index in slot_indexes)):
+          break
+      else:
+        return None
+
+      displacements[bucket_index] = displacement
+      for (key_index, _, _), slot_index in zip(bucket, slot_indexes):
+        slots[slot_index] = key_index
+
+    return displacements, slots
+
+  def AddEventDefinition(
+      self, provider_number, event_identifier, event_version, lcid,
+      message_identifier):
+    """Adds an event definition.
+
+    Args:
+      provider_number (int): EventLog provider number.
+      event_identifier (int): event identifier.
+      event_version (int): event version or None if the event definition
+          applies to any version.
+      lcid (int): language code identifier (LCID).
+      message_identifier (int): message identifier.
+
+    Returns:
+      bool: True if the event definition was added or False if its values
+          cannot be stored in a lookup file.
+    """
+    if event_version is None:
+      event_version = _LOOKUP_FILE_ANY_VERSION
+
+    if not (0 <= event_identifier <= 0xffffffff and
+            0 <= event_version <= _LOOKUP_FILE_ANY_VERSION and
+            0 <= message_identifier <= 0xffffffff):
+      return False
+
+    self.AddValue(_LOOKUP_FILE_EVENT_DEFINITION_KEY.pack(
+        b'D', provider_number, event_identifier, event_version, lcid),
+        message_identifier)
+    return True
+
+  def AddLogSource(self, log_source, provider_number):
+    """Adds an EventLog source.
+
+    Args:
+      log_source (str): EventLog source, such as "Application Error", which
+          is looked up case-insensitive.
+      provider_number (int): EventLog provider number.
+    """
+    self.AddValue(
+        b'S' + log_source.lower().encode('utf-8', 'surrogatepass'),
+        provider_number)
+
+  def AddMessageString(
+      self, provider_number, message_identifier, lcid, message_string):
+    """Adds a message string.
+
+    Args:
+      provider_number (int): EventLog provider number.
+      message_identifier (int): message identifier.
+      lcid (int): language code identifier (LCID).
+      message_string (str): message string in PEP 3101 format.
+
+    Returns:
+      bool: True if the message string was added or False if its values
+          cannot be stored in a lookup file.
+    """
+    if not message_string or not 0 <= message_identifier <= 0xffffffff:
+      return False
+
+    self.AddValue(_LOOKUP_FILE_MESSAGE_KEY.pack(
+        b'M', provider_number, message_identifier, lcid), message_string)
+    return True
+
+  def AddProviderIdentifier(self, provider_identifier, provider_number):
+    """Adds an EventLog provider identifier.
+
+    Args:
+      provider_identifier (str): EventLog provider identifier, which is
+          looked up in lower case.
+      provider_number (int): EventLog provider number.
+    """
+    self.AddValue(
+        b'I' + provider_identifier.encode('utf-8', 'surrogatepass'),
+        provider_number)
+
+  def AddValue(self, key, value):
+    """Adds the value of a specific key.
+
+    The value of a key that was added before is replaced.
+
+    Args:
+      key (bytes): key.
+      value (object): integer or string value.
+    """
+    if isinstance(value, str):
+      string_offset = self._string_offsets.get(value, None)
+      if string_offset is None:
+        encoded_string = value.encode('utf-8', 'surrogatepass')
+        string_offset = (self._strings_size, len(encoded_string))
+        self._string_offsets[value] = string_offset
+        self._strings.append(encoded_string)
+        self._strings_size += len(encoded_string)
+
+      value = string_offset
+
+    self._values[key] = value
+
+  def Write(self, path, lcids):
+    """Writes the lookup file.
+
+    Args:
+      path (str): path of the lookup file.
+      lcids (list[int]): language code identifiers (LCIDs) of the message
+          strings.
+
+    Raises:
+      IOError: if the hash table cannot be built or the lookup file cannot
+          be written.
+      OSError: if the hash table cannot be built or the lookup file cannot
+          be written.
+    """
+    keys = list(self._values.keys())
+
+    number_of_buckets = max(1, len(keys) // self._AVERAGE_BUCKET_SIZE)
+    number_of_slots = self._GetNumberOfSlots(len(keys))
+
+    for salt_index in range(self._MAXIMUM_NUMBER_OF_SALTS):
+      salt = salt_index.to_bytes(16, 'little')
+      result = self._PlaceKeys(keys, salt, number_of_buckets, number_of_slots)
+      if result:
+        break
+    else:
+      raise IOError('Unable to build hash table.')
+
+    displacements, slots = result
+
+    lcids = sorted(lcids)
+    buckets_offset = _LOOKUP_FILE_HEADER.size + (len(lcids) * 4)
+    slots_offset = buckets_offset + (number_of_buckets * 4)
+    keys_offset = slots_offset + (number_of_slots * _LOOKUP_FILE_SLOT.size)
+
+    slots_data = bytearray(number_of_slots * _LOOKUP_FILE_SLOT.size)
+    keys_size = 0
+    for slot_index, key_index in enumerate(slots):
+      if key_index is None:
+        continue
+
+      key = keys[key_index]
+      value = self._values[key]
+      if isinstance(value, tuple):
+        value, value_size = value
+      else:
+        value_size = 0
+
+      _LOOKUP_FILE_SLOT.pack_into(
+          slots_data, slot_index * _LOOKUP_FILE_SLOT.size, keys_size,
+          len(key), value, value_size)
+      keys_size += len(key)
+
+    strings_offset = keys_offset + keys_size
+    file_size = strings_offset + self._strings_size
+
+    header_data = _LOOKUP_FILE_HEADER.pack(
+        _LOOKUP_FILE_SIGNATURE, _LOOKUP_FILE_FORMAT_VERSION, salt, len(lcids),
+        number_of_buckets, number_of_slots, buckets_offset, slots_offset,
+        keys_offset, strings_offset, file_size)
+
+    # Write to a temporary file first, such that a helper never opens a
+    # partially written lookup file.
+    temporary_path = f'{path:s}.tmp'
+    with open(temporary_path, 'wb') as file_object:
+      file_object.write(header_data)
+      file_object.write(struct.pack(f'<{len(lcids):d}I', *lcids))
+      file_object.write(struct.pack(
+          f'<{number_of_buckets:d}I', *displacements))
+      file_object.write(slots_data)
+      for key_index in slots:
+        if key_index is not None:
+          file_object.write(keys[key_index])
+      for encoded_string in self._strings:
+        file_object.write(encoded_string)
+
+    os.replace(temporary_path, path)
+
+
+class WinevtResourcesEventLogProvider(containers_interface.AttributeContainer):
+  """Windows Event Log provider.
+
+  Attributes:
+    additional_identifier (str): additional identifier of the provider,
+        contains a GUID.
+    category_message_files (set[str]): paths of the category message files.
+    event_message_files (set[str]): paths of the event message files.
+    identifier (str): identifier of the provider, contains a GUID.
+    log_sources (list[str]): names of the corresponding Event Log sources.
+    log_types (list[str]): Windows Event Log types.
+    name (str): name of the provider.
+    parameter_message_files (set[str]): paths of the parameter message
+        files.
+    windows_version (str): Windows version.
+  """
+
+  CONTAINER_TYPE = 'winevtrc_eventlog_provider'
+
+  SCHEMA = {
+      'additional_identifier': 'str',
+      'category_message_files': 'List[str]',
+      'event_message_files': 'List[str]',
+      'identifier': 'str',
+      'log_sources': 'List[str]',
+      'log_types': 'List[str]',
+      'name': 'str',
+      'parameter_message_files': 'List[str]',
+      'windows_version': 'str'}
+
+  def __init__(self):
+    """Initializes the Windows Event Log provider."""
+    super(WinevtResourcesEventLogProvider, self).__init__()
+    self.additional_identifier = None
+    self.category_message_files = set()
+    self.event_message_files = set()
+    self.identifier = None
+    self.log_sources = []
+    self.log_types = []
+    self.name = None
+    self.parameter_message_files = set()
+    self.windows_version = None
+
+
+class WinevtResourcesMessageFile(containers_interface.AttributeContainer):
+  """Windows Event Log message file.
+
+  Attributes:
+    file_version (str): file version.
+    product_version (str): product version.
+    windows_path (str): path as defined by the Window Event Log provider.
+    windows_version (str): Windows version.
+  """
+
+  CONTAINER_TYPE = 'winevtrc_message_file'
+
+  SCHEMA = {
+      'file_version': 'str',
+      'product_version': 'str',
+      'windows_path': 'str',
+      'windows_version': 'str'}
+
+  def __init__(
+      self, file_version=None, product_version=None, windows_path=None,
+      windows_version=None):
+    """Initializes a Windows Event Log message file.
 
     Args:
       file_version (Optional[str]): file version.
@@ -599,10 +1666,15 @@ class WinevtResourcesAttributeContainerStore(
     super(WinevtResourcesAttributeContainerStore, self).__init__()
     self.string_format = string_format
 
+    # The attribute containers are registered with a class-wide manager,
+    # hence only register them for the first store.
+    container_types = self._containers_manager.GetContainerTypes()
     self._containers_manager.RegisterAttributeContainers([
-        WinevtResourcesEventLogProvider, WinevtResourcesMessageFile,
-        WinevtResourcesMessageString, WinevtResourcesMessageStringMapping,
-        WinevtResourcesMessageTable])
+        container_class for container_class in (
+            WinevtResourcesEventLogProvider, WinevtResourcesMessageFile,
+            WinevtResourcesMessageString, WinevtResourcesMessageStringMapping,
+            WinevtResourcesMessageTable)
+        if container_class.CONTAINER_TYPE not in container_types])
 
   def _ReadAndCheckStorageMetadata(self, check_readable_only=False):
     """Reads storage metadata and checks that the values are valid.
@@ -631,502 +1703,2353 @@ class WinevtResourcesAttributeContainerStore(
     self.string_format = metadata_values['string_format']
 
 
-class WinevtResourcesHelper(object):
-  """Windows EventLog resources helper."""
+class WinevtResourcesMessageTemplate(object):
+  """Windows EventLog resources compiled message template.
 
-  # LCID 0x0409 is en-US.
-  DEFAULT_LCID = 0x0409
+  The message string template, in PEP 3101 format, is split once into its
+  literal segments and placeholders, such that rendering a message string
+  only needs to fill in the string values and join the segments.
 
-  _DEFAULT_PARAMETER_MESSAGE_FILES = (
-      '%SystemRoot%\\System32\\MsObjs.dll',
-      '%SystemRoot%\\System32\\kernel32.dll')
+  Templates with placeholders other than "{N}" or "{N:s}", such as with a
+  conversion or another format specification, are not compiled and are
+  rendered with str.format() instead.
+
+  Attributes:
+    template (str): message string template in PEP 3101 format.
+  """
 
-  # The maximum number of cached message strings
-  _MAXIMUM_CACHED_MESSAGE_STRINGS = 64 * 1024
+  __slots__ = ('_placeholders', '_segments', 'template')
 
-  _WINEVT_RC_DATABASE = 'winevt-rc.db'
+  _FORMATTER = string.Formatter()
 
-  def __init__(self, storage_reader, data_location, lcid):
-    """Initializes Windows EventLog resources helper.
+  def __init__(self, template):
+    """Initializes a compiled message template.
 
     Args:
-      storage_reader (StorageReader): storage reader.
-      data_location (str): data location of the winevt-rc database.
-      lcid (int): Windows Language Code Identifier (LCID).
+      template (str): message string template in PEP 3101 format.
     """
-    language_tag = languages.WindowsLanguageHelper.GetLanguageTagForLCID(
-        lcid or self.DEFAULT_LCID)
+    super(WinevtResourcesMessageTemplate, self).__init__()
+    self._placeholders = None
+    self._segments = None
+    self.template = template
 
-    super(WinevtResourcesHelper, self).__init__()
-    self._data_location = data_location
-    self._environment_variables = None
-    self._language_tag = language_tag.lower()
-    self._lcid = lcid or self.DEFAULT_LCID
-    self._message_string_cache = collections.OrderedDict()
-    self._resouce_file_helper = resource_files.WindowsResourceFileHelper
-    self._storage_reader = None
-    self._windows_eventlog_message_files = None
-    self._windows_eventlog_providers = None
-    self._winevt_database_reader = None
+    self._Compile()
 
-    if storage_reader and storage_reader.HasAttributeContainers(
-        'windows_eventlog_provider'):
-      self._storage_reader = storage_reader
+  def _Compile(self):
+    """Splits the template into literal segments and placeholders."""
+    placeholders = []
+    segments = []
+    literal_parts = []
 
-  def _CacheMessageString(
-      self, provider_identifier, log_source, message_identifier,
-      event_version, message_string):
-    """Caches a specific message string.
+    try:
+      parsed_template = list(self._FORMATTER.parse(self.template))
+    except ValueError:
+      # Leave malformed templates to str.format() to report the error.
+      return
 
-    Args:
-      provider_identifier (str): EventLog provider identifier.
-      log_source (str): EventLog source, such as "Application Error".
-      message_identifier (int): message identifier.
-      event_version (int): event version or None if not set.
-      message_string (str): message string.
-    """
-    if len(self._message_string_cache) >= self._MAXIMUM_CACHED_MESSAGE_STRINGS:
-      self._message_string_cache.popitem(last=True)
+    for literal_text, field_name, format_spec, conversion in parsed_template:
+      if literal_text:
+        literal_parts.append(literal_text)
 
-    if provider_identifier:
-      lookup_key = f'{provider_identifier:s}:0x{message_identifier:08x}'
-      if event_version is not None:
-        lookup_key = f'{lookup_key:s}:{event_version:d}'
-      self._message_string_cache[lookup_key] = message_string
-      self._message_string_cache.move_to_end(lookup_key, last=False)
+      if field_name is None:
+        continue
 
-    if log_source:
-      lookup_key = f'{log_source:s}:0x{message_identifier:08x}'
-      if event_version is not None:
-        lookup_key = f'{lookup_key:s}:{event_version:d}'
-      self._message_string_cache[lookup_key] = message_string
-      self._message_string_cache.move_to_end(lookup_key, last=False)
+      if (not field_name.isdigit() or conversion or
+          format_spec not in ('', 's')):
+        return
 
-  def _GetCachedMessageString(
-      self, provider_identifier, log_source, message_identifier, event_version):
-    """Retrieves a specific cached message string.
+      if literal_parts:
+        segments.append(''.join(literal_parts))
+        literal_parts = []
+
+      placeholders.append((len(segments), int(field_name, 10)))
+      segments.append(None)
+
+    if literal_parts:
+      segments.append(''.join(literal_parts))
+
+    self._placeholders = tuple(placeholders)
+    self._segments = segments
+
+  def Render(self, string_values):
+    """Renders a message string.
 
     Args:
-      provider_identifier (str): EventLog provider identifier.
-      log_source (str): EventLog source, such as "Application Error".
-      message_identifier (int): message identifier.
-      event_version (int): event version or None if not set.
+      string_values (list[object]): string values, where values that are not
+          a string are converted to one.
 
     Returns:
-      str: message string or None if not available.
+      str: message string.
+
+    Raises:
+      IndexError: if a placeholder has no corresponding string value.
+      KeyError: if the template contains a named placeholder.
+      ValueError: if the template is malformed.
     """
-    lookup_key = None
-    message_string = None
+    if self._segments is None:
+      return self.template.format(*string_values)
 
-    if provider_identifier:
-      lookup_key = f'{provider_identifier:s}:0x{message_identifier:08x}'
-      if event_version is not None:
-        lookup_key = f'{lookup_key:s}:{event_version:d}'
-      message_string = self._message_string_cache.get(lookup_key, None)
+    segments = self._segments.copy()
+    for segment_index, value_index in self._placeholders:
+      string_value = string_values[value_index]
+      if not isinstance(string_value, str):
+        string_value = f'{string_value!s}'
 
-    if not message_string and log_source:
-      lookup_key = f'{log_source:s}:0x{message_identifier:08x}'
-      if event_version is not None:
-        lookup_key = f'{lookup_key:s}:{event_version:d}'
-      message_string = self._message_string_cache.get(lookup_key, None)
+      segments[segment_index] = string_value
 
-    if message_string:
-      self._message_string_cache.move_to_end(lookup_key, last=False)
+    return ''.join(segments)
 
-    return message_string
 
-  def _GetEventMessageFileIdentifiers(self, message_files):
-    """Retrieves event message file identifiers.
+class WinevtResourcesMessageStringCache(object):
+  """Windows EventLog resources message string cache.
 
-    Args:
-      message_files (list[str]): Windows EventLog message files.
+  The cache is a thread-safe least recently used (LRU) cache with tuple
+  lookup keys. The first element of a lookup key is the namespace, such as
+  "event" for event message strings and "parameter" for parameter strings,
+  which keeps the lookup keys of different types of strings apart.
 
-    Returns:
-      list[str]: message file identifiers.
-    """
-    message_file_identifiers = []
-    for windows_path in message_files or []:
-      path, filename = path_helper.PathHelper.GetWindowsSystemPath(
-          windows_path, self._environment_variables)
+  Attributes:
+    maximum_number_of_entries (int): maximum number of cached entries or None
+        if not bounded by the number of entries.
+    maximum_size (int): maximum size of the cached values in bytes or None if
+        not bounded by size.
+    number_of_evictions (int): number of entries evicted from the cache.
+    number_of_hits (int): number of lookups found in the cache.
+    number_of_misses (int): number of lookups not found in the cache.
+    size (int): approximate size of the cached entries in bytes.
+  """
 
-      lookup_path = '\\'.join([path, filename]).lower()
-      message_file_identifier = self._windows_eventlog_message_files.get(
-          lookup_path, None)
-      if message_file_identifier:
-        message_file_identifier = message_file_identifier.CopyToString()
-        message_file_identifiers.append(message_file_identifier)
+  # The default maximum number of cached entries.
+  DEFAULT_MAXIMUM_NUMBER_OF_ENTRIES = 64 * 1024
 
-      mui_filename = f'{filename:s}.mui'
-      lookup_path = '\\'.join([path, self._language_tag, mui_filename]).lower()
-      message_file_identifier = self._windows_eventlog_message_files.get(
-          lookup_path, None)
-      if message_file_identifier:
-        message_file_identifier = message_file_identifier.CopyToString()
-        message_file_identifiers.append(message_file_identifier)
+  # Environment variable that defines the maximum cache size, such as "65536"
+  # for a number of entries or "64MiB" for a size in bytes.
+  _CACHE_SIZE_ENVIRONMENT_VARIABLE = 'PLASO_WINEVT_RC_CACHE_SIZE'
 
-    return message_file_identifiers
+  _CACHE_SIZE_RE = re.compile(
+      r'^\s*([0-9]+)\s*(B|KB|KIB|MB|MIB|GB|GIB)?\s*$', re.IGNORECASE)
 
-  def _GetMappedMessageIdentifier(
-      self, storage_reader, provider_identifier, message_identifier,
-      event_version):
-    """Retrieves a WEVT_TEMPLATE mapped message identifier if available.
+  _SIZE_UNITS = {
+      'B': 1,
+      'KB': 1000,
+      'KIB': 1024,
+      'MB': 1000 * 1000,
+      'MIB': 1024 * 1024,
+      'GB': 1000 * 1000 * 1000,
+      'GIB': 1024 * 1024 * 1024}
+
+  # Approximate size of the bookkeeping of an entry, such as the OrderedDict
+  # slot and linked list node.
+  _ENTRY_OVERHEAD_SIZE = 104
+
+  def __init__(self, maximum_number_of_entries=None, maximum_size=None):
+    """Initializes a Windows EventLog resources message string cache.
+
+    If neither the maximum number of entries nor maximum size are provided
+    they are determined by the PLASO_WINEVT_RC_CACHE_SIZE environment variable
+    and otherwise DEFAULT_MAXIMUM_NUMBER_OF_ENTRIES is used.
 
     Args:
-      storage_reader (StorageReader): storage reader.
-      provider_identifier (str): EventLog provider identifier.
-      message_identifier (int): message identifier.
-      event_version (int): event version or None if not set.
+      maximum_number_of_entries (Optional[int]): maximum number of cached
+          entries.
+      maximum_size (Optional[int]): maximum size of the cached entries in
+          bytes.
+    """
+    if maximum_number_of_entries is None and maximum_size is None:
+      maximum_number_of_entries, maximum_size = self._GetCacheSizeFromEnviron()
+
+    super(WinevtResourcesMessageStringCache, self).__init__()
+    self._entries = collections.OrderedDict()
+    self._lock = threading.Lock()
+    self.maximum_number_of_entries = maximum_number_of_entries
+    self.maximum_size = maximum_size
+    self.number_of_evictions = 0
+    self.number_of_hits = 0
+    self.number_of_misses = 0
+    self.size = 0
+
+  def __len__(self):
+    """Retrieves the number of cached entries.
 
     Returns:
-      int: message identifier.
+      int: number of cached entries.
     """
-    # Map the event identifier to a message identifier as defined by the
-    # WEVT_TEMPLATE event definition.
-    if provider_identifier and storage_reader.HasAttributeContainers(
-        'windows_wevt_template_event'):
-      # TODO: add message_file_identifiers to filter_expression
-      filter_expression = (
-          f'provider_identifier == "{provider_identifier:s}" and '
-          f'identifier == {message_identifier:d}')
-      if event_version is not None:
-        filter_expression = (
-            f'{filter_expression:s} and version == {event_version:d}')
-
-      for event_definition in storage_reader.GetAttributeContainers(
-          'windows_wevt_template_event', filter_expression=filter_expression):
-        logger.debug((
-            f'Message: 0x{message_identifier:08x} of provider: '
-            f'{provider_identifier:s} maps to: '
-            f'0x{event_definition.message_identifier:08x}'))
+    return len(self._entries)
 
-        return event_definition.message_identifier
+  def _GetCacheSizeFromEnviron(self):
+    """Retrieves the maximum cache size from the environment.
 
-    return message_identifier
+    Returns:
+      tuple[int, int]: maximum number of entries and maximum size in bytes,
+          where None represents not bounded.
+    """
+    value = os.environ.get(self._CACHE_SIZE_ENVIRONMENT_VARIABLE, None)
+    if value:
+      match = self._CACHE_SIZE_RE.match(value)
+      if not match:
+        logger.warning((
+            f'Unsupported {self._CACHE_SIZE_ENVIRONMENT_VARIABLE:s} value: '
+            f'{value:s}'))
+
+      elif match.group(2):
+        unit = match.group(2).upper()
+        return None, int(match.group(1), 10) * self._SIZE_UNITS[unit]
 
-  def _GetMessageStrings(
-      self, storage_reader, message_file_identifiers, message_identifier):
-    """Retrieves message strings.
+      else:
+        return int(match.group(1), 10), None
+
+    return self.DEFAULT_MAXIMUM_NUMBER_OF_ENTRIES, None
+
+  def _GetEntrySize(self, lookup_key, value):
+    """Approximates the size of a cache entry.
 
     Args:
-      storage_reader (StorageReader): storage reader.
-      message_file_identifiers (list[str]): message file identifiers.
-      message_identifier (int): message identifier.
+      lookup_key (tuple): lookup key.
+      value (object): cached value.
 
     Returns:
-      list[str]: message strings.
+      int: approximate size in bytes.
     """
-    message_strings = []
+    key_size = sys.getsizeof(lookup_key) + sum(
+        sys.getsizeof(element) for element in lookup_key)
+    return self._ENTRY_OVERHEAD_SIZE + key_size + sys.getsizeof(value)
 
-    # TODO: add message_file_identifiers to filter_expression
-    filter_expression = (
-        f'language_identifier == {self._lcid:d} and '
-        f'message_identifier == {message_identifier:d}')
+  def _IsFull(self):
+    """Determines if the cache exceeds one of its limits.
 
-    for message_string in storage_reader.GetAttributeContainers(
-        'windows_eventlog_message_string', filter_expression=filter_expression):
-      identifier = message_string.GetMessageFileIdentifier()
-      identifier = identifier.CopyToString()
-      if identifier in message_file_identifiers:
-        message_strings.append(message_string)
+    Returns:
+      bool: True if the cache exceeds one of its limits.
+    """
+    if (self.maximum_number_of_entries is not None and
+        len(self._entries) > self.maximum_number_of_entries):
+      return True
 
-    return message_strings
+    return self.maximum_size is not None and self.size > self.maximum_size
 
-  def _GetMessageStringsWithMessageTable(
-      self, storage_reader, message_file_identifiers, message_identifier):
-    """Retrieves message strings.
+  def CacheValue(self, lookup_key, value):
+    """Caches a value.
 
     Args:
-      storage_reader (StorageReader): storage reader.
-      message_file_identifiers (list[str]): message file identifiers.
-      message_identifier (int): message identifier.
-
-    Returns:
-      list[str]: message strings.
+      lookup_key (tuple): lookup key, where the first element is the namespace.
+      value (object): value.
     """
-    message_strings = []
-
-    for message_file_identifier in message_file_identifiers:
-      filter_expression = (
-          f'_message_file_identifier == "{message_file_identifier:s}" and '
-          f'language_identifier == {self._lcid:d}')
-      for message_table in storage_reader.GetAttributeContainers(
-          'winevtrc_message_table', filter_expression=filter_expression):
-        if not message_table:
-          continue
-
-        identifier = message_table.GetIdentifier()
-        message_table_identifier = identifier.CopyToString()
+    with self._lock:
+      existing_value = self._entries.pop(lookup_key, None)
+      if existing_value is not None:
+        self.size -= self._GetEntrySize(lookup_key, existing_value)
 
-        filter_expression = (
-            f'_message_table_identifier == "{message_table_identifier:s}" and '
-            f'message_identifier == {message_identifier:d}')
+      self._entries[lookup_key] = value
+      self.size += self._GetEntrySize(lookup_key, value)
 
-        identifier = message_table.GetMessageFileIdentifier()
-        message_file_identifier = identifier.CopyToString()
+      while self._entries and self._IsFull():
+        evicted_lookup_key, evicted_value = self._entries.popitem(last=False)
+        self.size -= self._GetEntrySize(evicted_lookup_key, evicted_value)
+        self.number_of_evictions += 1
 
-        for message_string in storage_reader.GetAttributeContainers(
-            'winevtrc_message_string', filter_expression=filter_expression):
-          if message_file_identifier in message_file_identifiers:
-            message_strings.append(message_string)
+  def Clear(self):
+    """Removes all entries from the cache."""
+    with self._lock:
+      self._entries = collections.OrderedDict()
+      self.size = 0
 
-    return message_strings
+  def GetStatistics(self):
+    """Retrieves a snapshot of the cache statistics.
 
-  def _GetWindowsEventLogProvider(self, provider_identifier, log_source):
-    """Retrieves a Windows EventLog provider.
+    Returns:
+      dict[str, int]: cache statistics.
+    """
+    with self._lock:
+      return {
+          'maximum_number_of_entries': self.maximum_number_of_entries,
+          'maximum_size': self.maximum_size,
+          'number_of_entries': len(self._entries),
+          'number_of_evictions': self.number_of_evictions,
+          'number_of_hits': self.number_of_hits,
+          'number_of_misses': self.number_of_misses,
+          'size': self.size}
+
+  def GetValue(self, lookup_key):
+    """Retrieves a cached value.
 
     Args:
-      provider_identifier (str): EventLog provider identifier.
-      log_source (str): EventLog source, such as "Application Error".
+      lookup_key (tuple): lookup key, where the first element is the namespace.
 
     Returns:
-      tuple[WindowsEventLogProviderArtifact, str]: Windows EventLog provider
-          or None if not available, and provider lookup key.
+      object: cached value or None if not available.
     """
-    provider = None
+    with self._lock:
+      value = self._entries.get(lookup_key, None)
+      if value is None:
+        self.number_of_misses += 1
+        return None
 
-    if provider_identifier:
-      lookup_key = provider_identifier.lower()
-      provider = self._windows_eventlog_providers.get(lookup_key, None)
+      self.number_of_hits += 1
+      self._entries.move_to_end(lookup_key)
 
-    if not provider:
-      lookup_key = log_source.lower()
-      provider = self._windows_eventlog_providers.get(lookup_key, None)
+    return value
 
-    return provider, lookup_key
 
-  def _GetWinevtRcDatabaseReader(self):
-    """Opens the Windows EventLog resource database reader.
+class WinevtResourcesPersistentMessageStringCache(object):
+  """Windows EventLog resources persistent message string cache.
 
-    Returns:
-      WinevtResourcesSqlite3DatabaseReader: Windows EventLog resource
-          database reader or None.
-    """
-    if not self._winevt_database_reader and self._data_location:
-      logger.warning((
-          f'Falling back to {self._WINEVT_RC_DATABASE:s}. Please make sure '
-          f'the Windows EventLog message strings in the database correspond '
-          f'to those in the EventLog files.'))
+  The cache is a SQLite database file that stores resolved message strings
+  across runs. The message strings are stored per fingerprint of the source
+  they were resolved from and LCID, such that message strings of a changed
+  source are not reused. The database uses write-ahead logging, which allows
+  multiple processes to append to the same cache concurrently, and is memory
+  mapped when read.
+  """
 
-      database_path = os.path.join(
-          self._data_location, self._WINEVT_RC_DATABASE)
-      if not os.path.isfile(database_path):
-        return None
+  _FORMAT_VERSION = 1
 
-      try:
-        self._winevt_database_reader = WinevtResourcesSqlite3DatabaseReader()
-        result = self._winevt_database_reader.Open(database_path)
-      except sqlite3.OperationalError:
-        result = False
+  _PRAGMAS = (
+      'PRAGMA journal_mode = WAL',
+      'PRAGMA synchronous = NORMAL',
+      'PRAGMA mmap_size = 268435456')
 
-      if not result:
-        try:
-          self._winevt_database_reader = (
-              WinevtResourcesAttributeContainerStore())
-          self._winevt_database_reader.Open(path=database_path, read_only=True)  # pylint: disable=no-value-for-parameter,unexpected-keyword-arg
-          result = True
-        except IOError:
-          result = False
+  _CREATE_TABLE_QUERY = (
+      'CREATE TABLE IF NOT EXISTS message_strings ('
+      'fingerprint TEXT NOT NULL, lcid INTEGER NOT NULL, '
+      'namespace TEXT NOT NULL, name TEXT NOT NULL, '
+      'message_identifier INTEGER NOT NULL, event_version INTEGER NOT NULL, '
+      'message_string TEXT NOT NULL, PRIMARY KEY (fingerprint, lcid, '
+      'namespace, name, message_identifier, event_version)) WITHOUT ROWID')
 
-      if not result:
-        self._winevt_database_reader = None
+  _INSERT_QUERY = (
+      'INSERT OR IGNORE INTO message_strings VALUES (?, ?, ?, ?, ?, ?, ?)')
 
-    return self._winevt_database_reader
+  _SELECT_QUERY = (
+      'SELECT namespace, name, message_identifier, event_version, '
+      'message_string FROM message_strings WHERE fingerprint = ? AND lcid = ?')
 
-  def _GetWinevtRcDatabaseMessageString(
-      self, provider_identifier, log_source, message_identifier, event_version):
-    """Retrieves a specific Windows EventLog resource database message string.
+  # The maximum time, in seconds, to wait for another writer to finish.
+  _TIMEOUT = 5.0
+
+  def __init__(self):
+    """Initializes a Windows EventLog resources persistent cache."""
+    super(WinevtResourcesPersistentMessageStringCache, self).__init__()
+    self._connection = None
+    self._lock = threading.Lock()
+    self.path = None
+
+  @classmethod
+  def GetFingerprint(cls, paths):
+    """Determines the fingerprint of source files.
+
+    The fingerprint is based on the path, size and modification time of the
+    files, which avoids reading large files in their entirety. Files that are
+    not available are not part of the fingerprint, such that the fingerprint
+    changes when such a file is created.
 
     Args:
-      provider_identifier (str): EventLog provider identifier.
-      log_source (str): EventLog source, such as "Application Error".
-      message_identifier (int): message identifier.
-      event_version (int): event version or None if not set.
+      paths (list[str]): paths of the source files.
 
     Returns:
-      str: message string or None if not available.
+      str: fingerprint or None if none of the files are available.
     """
-    database_reader = self._GetWinevtRcDatabaseReader()
-    if not database_reader:
-      return None
-
-    if isinstance(database_reader, WinevtResourcesSqlite3DatabaseReader):
-      return database_reader.GetMessage(
-          log_source, self._lcid, message_identifier)
-
-    if self._windows_eventlog_providers is None:
-      self._ReadWindowsEventLogProviders(
-          database_reader, container_type='winevtrc_eventlog_provider')
+    file_fingerprints = []
+    for path in paths:
+      try:
+        stat_object = os.stat(path)
+      except OSError:
+        continue
 
-    if self._windows_eventlog_message_files is None:
-      self._ReadWindowsEventLogMessageFiles(
-          database_reader, container_type='winevtrc_message_file',
-          path_attribute='windows_path')
+      file_fingerprints.append(
+          f'{os.path.abspath(path):s}:{stat_object.st_size:d}:'
+          f'{stat_object.st_mtime_ns:d}')
 
-    provider, provider_lookup_key = self._GetWindowsEventLogProvider(
-        provider_identifier, log_source)
-    if not provider:
+    if not file_fingerprints:
       return None
 
-    original_message_identifier = message_identifier
+    fingerprint = '\n'.join(file_fingerprints)
+    return hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()
 
-    # TODO: pass message_file_identifiers
-    message_identifier = self._GetMappedMessageIdentifier(
-        database_reader, provider_identifier, message_identifier, event_version)
+  def CacheMessageStrings(self, fingerprint, lcid, message_strings):
+    """Appends message strings to the cache.
 
-    message_file_identifiers = self._GetEventMessageFileIdentifiers(
-        provider.event_message_files)
-    if not message_file_identifiers:
-      logger.warning((
-          f'No event message file for identifier: 0x{message_identifier:08x} '
-          f'(original: 0x{original_message_identifier:08x}) '
-          f'of provider: {provider_lookup_key:s}'))
-      return None
+    The cache is best effort, message strings that cannot be written, for
+    example because another writer holds the lock for too long, are not
+    cached.
 
-    message_strings = self._GetMessageStringsWithMessageTable(
-        database_reader, message_file_identifiers, message_identifier)
-    if not message_strings:
-      logger.warning((
-          f'No message string for identifier: 0x{message_identifier:08x} '
-          f'(original: 0x{original_message_identifier:08x}) '
-          f'of provider: {provider_lookup_key:s}'))
-      return None
+    Args:
+      fingerprint (str): fingerprint of the source of the message strings.
+      lcid (int): language code identifier (LCID).
+      message_strings (list[tuple[tuple, str]]): lookup key and message string
+          of the message strings to cache.
+    """
+    values = []
+    for lookup_key, message_string in message_strings:
+      namespace, name, message_identifier, event_version = lookup_key
+      if event_version is None:
+        event_version = -1
+
+      values.append((
+          fingerprint, lcid, namespace, name, message_identifier, event_version,
+          message_string))
+
+    with self._lock:
+      if not self._connection:
+        return
 
-    message_string = message_strings[0].text
-    if database_reader.string_format == 'wrc':
-      message_string = self._resouce_file_helper.FormatMessageStringInPEP3101(
-          message_string)
+      try:
+        with self._connection:
+          self._connection.executemany(self._INSERT_QUERY, values)
+      except sqlite3.DatabaseError as exception:
+        logger.debug(
+            f'Unable to write persistent message string cache with error: '
+            f'{exception!s}')
 
-    return message_string
+  def Close(self):
+    """Closes the cache."""
+    with self._lock:
+      if self._connection:
+        self._connection.close()
+        self._connection = None
 
-  def _ReadEnvironmentVariables(self, storage_reader):
-    """Reads the environment variables.
+    self.path = None
+
+  def GetMessageStrings(self, fingerprint, lcid):
+    """Retrieves the cached message strings of a specific source and LCID.
 
     Args:
-      storage_reader (StorageReader): storage reader.
+      fingerprint (str): fingerprint of the source of the message strings.
+      lcid (int): language code identifier (LCID).
+
+    Returns:
+      list[tuple[tuple, str]]: lookup key and message string of the cached
+          message strings.
     """
-    # TODO: get environment variables related to the source.
-    # FIX: Add null check to prevent AttributeError when storage_reader is None
-    if storage_reader is None:
-        self._environment_variables = []
-        return
-    self._environment_variables = list(storage_reader.GetAttributeContainers(
-        'environment_variable'))
+    with self._lock:
+      if not self._connection:
+        return []
 
-  def _ReadEventMessageString(
-      self, storage_reader, provider_identifier, log_source,
-      message_identifier, event_version):
-    """Reads an event message string.
+      try:
+        rows = self._connection.execute(
+            self._SELECT_QUERY, (fingerprint, lcid)).fetchall()
+      except sqlite3.DatabaseError as exception:
+        logger.warning(
+            f'Unable to read persistent message string cache with error: '
+            f'{exception!s}')
+        return []
+
+    message_strings = []
+    for namespace, name, message_identifier, event_version, message_string in (
+        rows):
+      if event_version == -1:
+        event_version = None
+
+      message_strings.append((
+          (namespace, name, message_identifier, event_version), message_string))
+
+    return message_strings
+
+  def Open(self, path):
+    """Opens the cache, which is created if it does not exist.
 
     Args:
-      storage_reader (StorageReader): storage reader.
-      provider_identifier (str): EventLog provider identifier.
-      log_source (str): EventLog source, such as "Application Error".
-      message_identifier (int): message identifier.
-      event_version (int): event version or None if not set.
+      path (str): path of the cache.
 
     Returns:
-      str: message string or None if not available.
+      bool: True if successful.
     """
-    if self._environment_variables is None:
-      self._ReadEnvironmentVariables(storage_reader)
-
-    if self._windows_eventlog_providers is None:
-      self._ReadWindowsEventLogProviders(storage_reader)
+    if self._connection:
+      raise RuntimeError('Cannot open cache already opened.')
 
-    if self._windows_eventlog_message_files is None:
-      self._ReadWindowsEventLogMessageFiles(storage_reader)
+    connection = None
+    try:
+      # The connection is shared by the threads of the helper, which
+      # serializes its use.
+      connection = sqlite3.connect(
+          path, check_same_thread=False, timeout=self._TIMEOUT)
+
+      for pragma in self._PRAGMAS:
+        connection.execute(pragma)
+
+      with connection:
+        format_version = connection.execute('PRAGMA user_version').fetchone()[0]
+        if format_version == 0:
+          connection.execute(self._CREATE_TABLE_QUERY)
+          connection.execute(f'PRAGMA user_version = {self._FORMAT_VERSION:d}')
+
+        elif format_version != self._FORMAT_VERSION:
+          logger.warning((
+              f'Unsupported persistent message string cache format version: '
+              f'{format_version:d}'))
+          connection.close()
+          return False
+
+    except sqlite3.DatabaseError as exception:
+      logger.warning(
+          f'Unable to open persistent message string cache: {path:s} with '
+          f'error: {exception!s}')
+      if connection:
+        connection.close()
+      return False
 
-    provider, provider_lookup_key = self._GetWindowsEventLogProvider(
-        provider_identifier, log_source)
-    if not provider:
-      return None
+    self._connection = connection
+    self.path = path
+    return True
 
-    if not storage_reader.HasAttributeContainers(
-        'windows_eventlog_message_string'):
-      return None
 
-    original_message_identifier = message_identifier
+class WinevtResourcesLookupStatistics(object):
+  """Windows EventLog resources lookup statistics.
 
-    # TODO: pass message_file_identifiers
-    message_identifier = self._GetMappedMessageIdentifier(
-        storage_reader, provider_identifier, message_identifier, event_version)
+  Collects the number of calls, the number of calls without a result and the
+  elapsed time per lookup phase. Phases can be nested, for example the
+  "lookup" phase includes the time spent in all other phases of the lookup.
 
-    message_file_identifiers = self._GetEventMessageFileIdentifiers(
-        provider.event_message_files)
-    if not message_file_identifiers:
-      logger.warning((
-          f'No event message file for identifier: 0x{message_identifier:08x} '
-          f'(original: 0x{original_message_identifier:08x}) '
-          f'of provider: {provider_lookup_key:s}'))
-      return None
+  Attributes:
+    summary_interval (float): interval, in seconds, between summary log
+        messages, where 0 represents no summary log messages.
+  """
 
-    message_strings = self._GetMessageStrings(
-        storage_reader, message_file_identifiers, message_identifier)
-    if not message_strings:
-      logger.warning((
-          f'No message string for identifier: 0x{message_identifier:08x} '
-          f'(original: 0x{original_message_identifier:08x}) '
-          f'of provider: {provider_lookup_key:s}'))
-      return None
+  def __init__(self, summary_interval=0):
+    """Initializes Windows EventLog resources lookup statistics.
 
-    return message_strings[0].string
+    Args:
+      summary_interval (Optional[float]): interval, in seconds, between
+          summary log messages, where 0 represents no summary log messages.
+    """
+    super(WinevtResourcesLookupStatistics, self).__init__()
+    self._last_summary_time = time.perf_counter()
+    self._lock = threading.Lock()
+    self._phases = {}
+    self.summary_interval = summary_interval
 
-  def _ReadParameterMessageString(
-      self, storage_reader, provider_identifier, log_source,
-      message_identifier):
-    """Reads a parameter message string.
+  def _FormatSummary(self, phases):
+    """Formats a summary of the lookup phases.
 
     Args:
-      storage_reader (StorageReader): storage reader.
-      provider_identifier (str): EventLog provider identifier.
-      log_source (str): EventLog source, such as "Application Error".
-      message_identifier (int): message identifier.
+      phases (dict[str, dict[str, object]]): statistics per lookup phase.
 
     Returns:
-      str: parameter string or None if not available.
+      str: summary.
     """
-    if self._environment_variables is None:
-      self._ReadEnvironmentVariables(storage_reader)
+    phase_summaries = []
+    for phase, phase_statistics in sorted(phases.items()):
+      phase_summaries.append((
+          f'{phase:s}: {phase_statistics["number_of_calls"]:d} calls '
+          f'({phase_statistics["number_of_empty_results"]:d} empty) '
+          f'{phase_statistics["total_time"]:.3f}s'))
 
-    if self._windows_eventlog_providers is None:
-      self._ReadWindowsEventLogProviders(storage_reader)
+    return ', '.join(phase_summaries)
 
-    if self._windows_eventlog_message_files is None:
-      self._ReadWindowsEventLogMessageFiles(storage_reader)
+  def _GetPhases(self):
+    """Retrieves the statistics per lookup phase.
 
-    provider, provider_lookup_key = self._GetWindowsEventLogProvider(
-        provider_identifier, log_source)
-    if not provider:
-      return None
+    Returns:
+      dict[str, dict[str, object]]: statistics per lookup phase.
+    """
+    phases = {}
+    for phase, phase_statistics in self._phases.items():
+      number_of_calls, number_of_empty_results, total_time, maximum_time = (
+          phase_statistics)
+      phases[phase] = {
+          'maximum_time': maximum_time,
+          'mean_time': total_time / number_of_calls,
+          'number_of_calls': number_of_calls,
+          'number_of_empty_results': number_of_empty_results,
+          'total_time': total_time}
+
+    return phases
+
+  def AddTiming(self, phase, elapsed_time, has_result):
+    """Adds the timing of a call of a lookup phase.
 
-    if not storage_reader.HasAttributeContainers(
-        'windows_eventlog_message_string'):
-      return None
+    Args:
+      phase (str): name of the lookup phase.
+      elapsed_time (float): elapsed time of the call, in seconds.
+      has_result (bool): True if the call returned a result.
+    """
+    summary = None
+
+    with self._lock:
+      phase_statistics = self._phases.get(phase, None)
+      if phase_statistics is None:
+        # Number of calls, number of empty results, total and maximum time.
+        phase_statistics = [0, 0, 0.0, 0.0]
+        self._phases[phase] = phase_statistics
+
+      phase_statistics[0] += 1
+      if not has_result:
+        phase_statistics[1] += 1
+      phase_statistics[2] += elapsed_time
+      if elapsed_time > phase_statistics[3]:
+        phase_statistics[3] = elapsed_time
+
+      if self.summary_interval:
+        current_time = time.perf_counter()
+        if current_time - self._last_summary_time >= self.summary_interval:
+          self._last_summary_time = current_time
+          summary = self._FormatSummary(self._GetPhases())
+
+    if summary:
+      logger.info(f'Windows EventLog resources lookups: {summary:s}')
+
+  def GetPhases(self):
+    """Retrieves a snapshot of the statistics per lookup phase.
+
+    Returns:
+      dict[str, dict[str, object]]: statistics per lookup phase, such as the
+          number of calls, the number of calls without a result and the total,
+          mean and maximum time in seconds.
+    """
+    with self._lock:
+      return self._GetPhases()
+
+  def InstrumentFunction(self, phase, function):
+    """Instruments a function to time its calls as a lookup phase.
+
+    Args:
+      phase (str): name of the lookup phase.
+      function (function): function to instrument.
+
+    Returns:
+      function: instrumented function.
+    """
+    def _InstrumentedFunction(*args, **kwargs):
+      start_time = time.perf_counter()
+      result = function(*args, **kwargs)
+      elapsed_time = time.perf_counter() - start_time
+
+      has_result = result is not None
+      if isinstance(result, tuple) and len(result) == 2:
+        # Results such as a provider and its lookup key are empty when the
+        # first value is not available.
+        has_result = result[0] is not None
+      elif isinstance(result, (dict, list, str, tuple)):
+        has_result = bool(result)
+
+      self.AddTiming(phase, elapsed_time, has_result)
+      return result
+
+    return _InstrumentedFunction
+
+  def InstrumentMethods(self, instance, phases):
+    """Instruments methods of an object to time their calls.
+
+    The instrumented methods replace the methods on the object itself, such
+    that objects without instrumentation are not affected.
+
+    Args:
+      instance (object): object of which to instrument the methods.
+      phases (dict[str, str]): name of the lookup phase per method name.
+    """
+    for method_name, phase in phases.items():
+      setattr(instance, method_name, self.InstrumentFunction(
+          phase, getattr(instance, method_name)))
+
+
+class WinevtResourcesProvider(object):
+  """Compact Windows EventLog provider.
+
+  Only the attributes needed to resolve message strings are kept, instead of
+  the full provider attribute container.
+
+  Attributes:
+    event_message_file_identifiers (tuple[str]): identifiers of the event
+        message files or None if not yet determined.
+    event_message_files (tuple[str]): paths of the event message files.
+    identifier (str): identifier of the provider, contains a GUID.
+    parameter_message_file_identifiers (tuple[str]): identifiers of the
+        parameter message files or None if not yet determined.
+    parameter_message_files (tuple[str]): paths of the parameter message
+        files.
+  """
+
+  __slots__ = (
+      'event_message_file_identifiers', 'event_message_files', 'identifier',
+      'parameter_message_file_identifiers', 'parameter_message_files')
+
+  def __init__(
+      self, identifier=None, event_message_files=None,
+      parameter_message_files=None):
+    """Initializes a compact Windows EventLog provider.
+
+    Args:
+      identifier (Optional[str]): identifier of the provider, contains a GUID.
+      event_message_files (Optional[list[str]]): paths of the event message
+          files.
+      parameter_message_files (Optional[list[str]]): paths of the parameter
+          message files.
+    """
+    super(WinevtResourcesProvider, self).__init__()
+    self.event_message_file_identifiers = None
+    self.event_message_files = tuple(
+        sys.intern(path) for path in event_message_files or [])
+    self.identifier = sys.intern(identifier) if identifier else None
+    self.parameter_message_file_identifiers = None
+    self.parameter_message_files = tuple(
+        sys.intern(path) for path in parameter_message_files or [])
+
+  @classmethod
+  def FromAttributeContainer(cls, provider):
+    """Creates a compact Windows EventLog provider from an attribute container.
+
+    Args:
+      provider (AttributeContainer): Windows EventLog provider attribute
+          container, such as WindowsEventLogProviderArtifact or
+          WinevtResourcesEventLogProvider.
+
+    Returns:
+      WinevtResourcesProvider: compact Windows EventLog provider.
+    """
+    # Message files can be stored as a set, which has no defined order.
+    event_message_files = provider.event_message_files or []
+    if isinstance(event_message_files, set):
+      event_message_files = sorted(event_message_files)
+
+    parameter_message_files = provider.parameter_message_files or []
+    if isinstance(parameter_message_files, set):
+      parameter_message_files = sorted(parameter_message_files)
+
+    return cls(
+        identifier=provider.identifier,
+        event_message_files=event_message_files,
+        parameter_message_files=parameter_message_files)
+
+
+class WinevtResourcesHelper(object):
+  """Windows EventLog resources helper.
+
+  Message and parameter strings are resolved from lookup tiers in order of
+  precedence: the storage reader, followed by the winevt-rc database, which
+  is either a lookup file compiled from the database, a SQLite database or an
+  attribute container store. Lookups that a tier cannot resolve fall through
+  to the next tier. The tier that resolved a lookup is remembered, such that
+  repeated lookups go straight to that tier, and lookups that no tier
+  resolved are remembered as well.
+
+  The helper can be used from multiple threads. Lookups in a winevt-rc lookup
+  file or SQLite database run concurrently, while lookups that need the
+  storage reader or the winevt-rc attribute container store are serialized,
+  since these are not safe to use from multiple threads at the same time.
+  """
+
+  # LCID 0x0409 is en-US.
+  DEFAULT_LCID = 0x0409
+
+  _DEFAULT_PARAMETER_MESSAGE_FILES = (
+      '%SystemRoot%\\System32\\MsObjs.dll',
+      '%SystemRoot%\\System32\\kernel32.dll')
+
+  # The maximum number of cached lookup tiers that resolved a lookup
+  _MAXIMUM_CACHED_LOOKUP_TIERS = 64 * 1024
+
+  # The maximum number of cached compiled message templates
+  _MAXIMUM_CACHED_MESSAGE_TEMPLATES = 16 * 1024
+
+  # The maximum number of cached string values with expanded parameter
+  # string references
+  _MAXIMUM_CACHED_STRING_VALUES = 16 * 1024
+
+  # The maximum number of cached lookups that could not be resolved
+  _MAXIMUM_CACHED_UNRESOLVED_LOOKUPS = 16 * 1024
+
+  # The maximum number of cached parameters with their message strings per
+  # message file
+  _MAXIMUM_CACHED_PARAMETER_MESSAGE_STRINGS = 16 * 1024
+
+  # The maximum number of threads used by the asynchronous lookups
+  _MAXIMUM_NUMBER_OF_LOOKUP_THREADS = 4
+
+  # The maximum number of parameter identifiers per message string query,
+  # which keeps the filter expression well within the SQLite expression
+  # depth limit.
+  _MAXIMUM_NUMBER_OF_QUERY_VALUES = 64
+
+  # Environment variable that enables indexing the message strings of the
+  # storage reader in memory.
+  _INDEX_MESSAGE_STRINGS_ENVIRONMENT_VARIABLE = (
+      'PLASO_WINEVT_RC_INDEX_MESSAGE_STRINGS')
+
+  # Environment variable that enables preloading the EventLog providers of
+  # the winevt-rc database.
+  _PRELOAD_DATABASE_ENVIRONMENT_VARIABLE = 'PLASO_WINEVT_RC_PRELOAD'
+
+  # Environment variable that enables collecting lookup statistics.
+  _STATISTICS_ENVIRONMENT_VARIABLE = 'PLASO_WINEVT_RC_STATISTICS'
+
+  # Environment variable that defines the interval, in seconds, between
+  # lookup statistics summary log messages.
+  _STATISTICS_INTERVAL_ENVIRONMENT_VARIABLE = (
+      'PLASO_WINEVT_RC_STATISTICS_INTERVAL')
+
+  # Lookup phase per instrumented method of the helper.
+  _INSTRUMENTED_HELPER_METHODS = {
+      '_FormatMessageString': 'format_conversion',
+      '_FormatStringValues': 'parameter_expansion',
+      '_GetCachedMessageString': 'cache_lookup',
+      '_GetMappedMessageIdentifier': 'template_mapping',
+      '_GetMessageStrings': 'string_fetch',
+      '_GetMessageStringsWithMessageTable': 'string_fetch',
+      '_GetProviderMessageFileIdentifiers': 'message_file_resolution',
+      '_GetWindowsEventLogProvider': 'provider_resolution',
+      '_ReadParameterMessageStringIndex': 'string_fetch',
+      '_ResolveMessageStrings': 'tier_resolution',
+      'GetFormattedMessage': 'formatted_lookup',
+      'GetMessageString': 'lookup',
+      'GetMessageStrings': 'lookup',
+      'GetParameterString': 'parameter_lookup',
+      'GetParameterStrings': 'parameter_lookup'}
+
+  # Parameter string reference in a string value, such as "%%1833".
+  _PARAMETER_RE = re.compile(r'(%%[1-9][0-9]*)')
+
+  # Lookup phase per instrumented method of the SQLite database reader.
+  _INSTRUMENTED_DATABASE_READER_METHODS = {
+      '_FormatMessageString': 'format_conversion',
+      '_GetEventLogProviderKey': 'provider_resolution',
+      '_GetMessage': 'string_fetch',
+      '_GetMessages': 'string_fetch'}
+
+  # Lookup phase per instrumented method of the lookup file.
+  _INSTRUMENTED_LOOKUP_FILE_METHODS = {
+      '_GetProviderNumber': 'provider_resolution',
+      'GetMessageString': 'string_fetch'}
+
+  # Environment variable that enables the persistent message string cache.
+  _PERSISTENT_CACHE_ENVIRONMENT_VARIABLE = 'PLASO_WINEVT_RC_PERSISTENT_CACHE'
+
+  # Environment variable that defines the path of the persistent message
+  # string cache.
+  _PERSISTENT_CACHE_PATH_ENVIRONMENT_VARIABLE = (
+      'PLASO_WINEVT_RC_PERSISTENT_CACHE_PATH')
+
+  _PERSISTENT_CACHE_FILENAME = 'winevt-rc.cache.db'
+
+  # Environment variable that enables warming up the message string cache
+  # when the helper is created.
+  _WARM_UP_ENVIRONMENT_VARIABLE = 'PLASO_WINEVT_RC_WARM_UP'
+
+  # Environment variable that defines the path of the warm-up lookups file.
+  _WARM_UP_PATH_ENVIRONMENT_VARIABLE = 'PLASO_WINEVT_RC_WARM_UP_PATH'
+
+  # Frequently looked up event messages, as EventLog provider identifier,
+  # EventLog source, message identifier and event version, used to warm up
+  # the message string cache.
+  _DEFAULT_WARM_UP_LOOKUPS = (
+      # Microsoft-Windows-Security-Auditing
+      ('{54849625-5478-4994-a5ba-3e3b0328c30d}',
+       'Microsoft-Windows-Security-Auditing', 4624, 2),
+      ('{54849625-5478-4994-a5ba-3e3b0328c30d}',
+       'Microsoft-Windows-Security-Auditing', 4625, 0),
+      ('{54849625-5478-4994-a5ba-3e3b0328c30d}',
+       'Microsoft-Windows-Security-Auditing', 4634, 0),
+      ('{54849625-5478-4994-a5ba-3e3b0328c30d}',
+       'Microsoft-Windows-Security-Auditing', 4647, 0),
+      ('{54849625-5478-4994-a5ba-3e3b0328c30d}',
+       'Microsoft-Windows-Security-Auditing', 4648, 0),
+      ('{54849625-5478-4994-a5ba-3e3b0328c30d}',
+       'Microsoft-Windows-Security-Auditing', 4672, 0),
+      ('{54849625-5478-4994-a5ba-3e3b0328c30d}',
+       'Microsoft-Windows-Security-Auditing', 4688, 2),
+      ('{54849625-5478-4994-a5ba-3e3b0328c30d}',
+       'Microsoft-Windows-Security-Auditing', 4689, 0),
+      ('{54849625-5478-4994-a5ba-3e3b0328c30d}',
+       'Microsoft-Windows-Security-Auditing', 4798, 0),
+      ('{54849625-5478-4994-a5ba-3e3b0328c30d}',
+       'Microsoft-Windows-Security-Auditing', 5379, 0),
+      # Microsoft-Windows-Sysmon
+      ('{5770385f-c22a-43e0-bf4c-06f5698ffbd9}',
+       'Microsoft-Windows-Sysmon', 1, 5),
+      ('{5770385f-c22a-43e0-bf4c-06f5698ffbd9}',
+       'Microsoft-Windows-Sysmon', 3, 5),
+      ('{5770385f-c22a-43e0-bf4c-06f5698ffbd9}',
+       'Microsoft-Windows-Sysmon', 11, 2),
+      # Service Control Manager
+      ('{555908d1-a6d7-4695-8e1e-26931d2012f4}',
+       'Service Control Manager', 7036, 0),
+      ('{555908d1-a6d7-4695-8e1e-26931d2012f4}',
+       'Service Control Manager', 7040, 0),
+      ('{555908d1-a6d7-4695-8e1e-26931d2012f4}',
+       'Service Control Manager', 7045, 0),
+      # Microsoft-Windows-Kernel-General
+      ('{a68ca8b7-004f-d7b6-a698-07e2de0f1f5d}',
+       'Microsoft-Windows-Kernel-General', 12, 0),
+      ('{a68ca8b7-004f-d7b6-a698-07e2de0f1f5d}',
+       'Microsoft-Windows-Kernel-General', 13, 0),
+      # EventLog
+      (None, 'EventLog', 6005, 0),
+      (None, 'EventLog', 6006, 0))
+
+  # Names of the event identifier and version attributes per attribute
+  # container type of event definitions.
+  _EVENT_DEFINITION_ATTRIBUTES = {
+      'windows_wevt_template_event': ('identifier', 'version'),
+      'winevtrc_message_string_mapping': ('event_identifier', 'event_version')}
+
+  _WINEVT_RC_DATABASE = 'winevt-rc.db'
+
+  def __init__(
+      self, storage_reader, data_location, lcid, index_message_strings=None,
+      preload_database=None, collect_statistics=None, statistics_interval=None,
+      warm_up=None, warm_up_path=None, persistent_cache=None,
+      persistent_cache_path=None, storage_path=None):
+    """Initializes Windows EventLog resources helper.
+
+    Args:
+      storage_reader (StorageReader): storage reader.
+      data_location (str): data location of the winevt-rc database.
+      lcid (int): Windows Language Code Identifier (LCID).
+      index_message_strings (Optional[bool]): True if the message strings of
+          the storage reader should be indexed in memory on first use, instead
+          of being queried on every lookup. If None the value of the
+          PLASO_WINEVT_RC_INDEX_MESSAGE_STRINGS environment variable is used.
+      preload_database (Optional[bool]): True if the EventLog providers of the
+          winevt-rc database should be loaded into memory when the database
+          is opened. If None the value of the PLASO_WINEVT_RC_PRELOAD
+          environment variable is used.
+      collect_statistics (Optional[bool]): True if the number of calls and
+          the elapsed time of the lookup phases should be collected. If None
+          the value of the PLASO_WINEVT_RC_STATISTICS environment variable is
+          used.
+      statistics_interval (Optional[float]): interval, in seconds, between
+          lookup statistics summary log messages, where 0 represents no
+          summary log messages. If None the value of the
+          PLASO_WINEVT_RC_STATISTICS_INTERVAL environment variable is used.
+      warm_up (Optional[bool]): True if the message string cache should be
+          warmed up with frequently looked up event messages when the helper
+          is created. If None the value of the PLASO_WINEVT_RC_WARM_UP
+          environment variable is used.
+      warm_up_path (Optional[str]): path of a file with the event messages to
+          warm up the message string cache with, instead of the default event
+          messages. If None the value of the PLASO_WINEVT_RC_WARM_UP_PATH
+          environment variable is used.
+      persistent_cache (Optional[bool]): True if resolved message strings
+          should be stored in a persistent cache, which is reused by later
+          runs. If None the value of the PLASO_WINEVT_RC_PERSISTENT_CACHE
+          environment variable is used.
+      persistent_cache_path (Optional[str]): path of the persistent cache. If
+          None the value of the PLASO_WINEVT_RC_PERSISTENT_CACHE_PATH
+          environment variable is used and otherwise winevt-rc.cache.db in
+          the data location.
+      storage_path (Optional[str]): path of the storage file of the storage
+          reader. The persistent cache is not used for a storage reader with
+          Windows EventLog artifacts without the path of its storage file,
+          since the message strings it resolves cannot be fingerprinted.
+    """
+    if index_message_strings is None:
+      index_message_strings = _GetEnvironmentVariableFlag(
+          self._INDEX_MESSAGE_STRINGS_ENVIRONMENT_VARIABLE)
+
+    if preload_database is None:
+      preload_database = _GetEnvironmentVariableFlag(
+          self._PRELOAD_DATABASE_ENVIRONMENT_VARIABLE)
+
+    if collect_statistics is None:
+      collect_statistics = _GetEnvironmentVariableFlag(
+          self._STATISTICS_ENVIRONMENT_VARIABLE)
+
+    if statistics_interval is None:
+      statistics_interval = self._GetStatisticsIntervalFromEnviron()
+
+    if warm_up is None:
+      warm_up = _GetEnvironmentVariableFlag(self._WARM_UP_ENVIRONMENT_VARIABLE)
+
+    if warm_up_path is None:
+      warm_up_path = os.environ.get(
+          self._WARM_UP_PATH_ENVIRONMENT_VARIABLE, None)
+
+    if persistent_cache is None:
+      persistent_cache = _GetEnvironmentVariableFlag(
+          self._PERSISTENT_CACHE_ENVIRONMENT_VARIABLE)
+
+    if persistent_cache_path is None:
+      persistent_cache_path = os.environ.get(
+          self._PERSISTENT_CACHE_PATH_ENVIRONMENT_VARIABLE, None)
+
+    if not persistent_cache_path and data_location:
+      persistent_cache_path = os.path.join(
+          data_location, self._PERSISTENT_CACHE_FILENAME)
+
+    language_tag = languages.WindowsLanguageHelper.GetLanguageTagForLCID(
+        lcid or self.DEFAULT_LCID)
+
+    super(WinevtResourcesHelper, self).__init__()
+    self._data_location = data_location
+    self._environment_variables = None
+    self._event_definition_container_types = {}
+    self._event_definitions = {}
+    self._expanded_windows_paths = {}
+    self._index_message_strings = index_message_strings
+    self._language_tag = language_tag.lower()
+    self._lcid = lcid or self.DEFAULT_LCID
+    self._in_flight_lookups = {}
+    self._lock = threading.RLock()
+    self._lookup_executor = None
+    self._lookup_tier_cache = WinevtResourcesMessageStringCache(
+        maximum_number_of_entries=self._MAXIMUM_CACHED_LOOKUP_TIERS)
+    self._message_string_cache = WinevtResourcesMessageStringCache()
+    self._message_template_cache = WinevtResourcesMessageStringCache(
+        maximum_number_of_entries=self._MAXIMUM_CACHED_MESSAGE_TEMPLATES)
+    self._parameter_message_string_index = WinevtResourcesMessageStringCache(
+        maximum_number_of_entries=(
+            self._MAXIMUM_CACHED_PARAMETER_MESSAGE_STRINGS))
+    self._message_string_index = None
+    self._message_table_identifiers = None
+    self._persistent_cache = None
+    self._persistent_cache_fingerprint = None
+    self._persistent_cache_path = None
+    self._preload_database = preload_database
+    self._resouce_file_helper = resource_files.WindowsResourceFileHelper
+    self._statistics = None
+    self._storage_path = storage_path
+    self._storage_reader = None
+    self._string_value_cache = WinevtResourcesMessageStringCache(
+        maximum_number_of_entries=self._MAXIMUM_CACHED_STRING_VALUES)
+    self._unresolved_lookup_cache = WinevtResourcesMessageStringCache(
+        maximum_number_of_entries=self._MAXIMUM_CACHED_UNRESOLVED_LOOKUPS)
+    self._windows_eventlog_message_files = {}
+    self._windows_eventlog_provider_log_sources = {}
+    self._windows_eventlog_providers = {}
+    self._winevt_database_reader = None
+    self._winevt_database_reader_opened = False
+
+    if storage_reader and storage_reader.HasAttributeContainers(
+        'windows_eventlog_provider'):
+      self._storage_reader = storage_reader
+
+    if persistent_cache and persistent_cache_path:
+      self._persistent_cache_path = persistent_cache_path
+
+    # Only instrument the lookups when statistics are collected, such that
+    # lookups without statistics do not pay for the timing.
+    if collect_statistics:
+      self._statistics = WinevtResourcesLookupStatistics(
+          summary_interval=statistics_interval)
+      self._statistics.InstrumentMethods(
+          self, self._INSTRUMENTED_HELPER_METHODS)
+
+    if warm_up:
+      lookups = self._DEFAULT_WARM_UP_LOOKUPS
+      if warm_up_path:
+        lookups = self._ReadWarmUpLookups(warm_up_path)
+
+      self.WarmUpMessageStringCache(lookups)
+
+  def _CacheMessageString(
+      self, namespace, provider_identifier, log_source, message_identifier,
+      event_version, message_string):
+    """Caches a specific message string.
+
+    Args:
+      namespace (str): cache namespace, such as "event" or "parameter".
+      provider_identifier (str): EventLog provider identifier.
+      log_source (str): EventLog source, such as "Application Error".
+      message_identifier (int): message identifier.
+      event_version (int): event version or None if not set.
+      message_string (str): message string.
+    """
+    lookup_keys = []
+    if provider_identifier:
+      lookup_keys.append(
+          (namespace, provider_identifier, message_identifier, event_version))
+
+    if log_source:
+      lookup_keys.append(
+          (namespace, log_source, message_identifier, event_version))
+
+    for lookup_key in lookup_keys:
+      self._message_string_cache.CacheValue(lookup_key, message_string)
+
+    if self._persistent_cache:
+      self._persistent_cache.CacheMessageStrings(
+          self._persistent_cache_fingerprint, self._lcid, [
+              (lookup_key, message_string) for lookup_key in lookup_keys])
+
+  def _FormatMessageString(self, message_string):
+    """Converts a message string from Windows Resource to PEP 3101 format.
+
+    Args:
+      message_string (str): message string in Windows Resource format.
+
+    Returns:
+      str: message string in PEP 3101 format.
+    """
+    return self._resouce_file_helper.FormatMessageStringInPEP3101(
+        message_string)
+
+  def _FormatStringValues(
+      self, provider_identifier, log_source, string_values):
+    """Formats string values.
+
+    Parameter string references in the string values, such as "%%1833", are
+    replaced by the corresponding parameter string if available. The parameter
+    strings of all the references are retrieved in a single bulk lookup.
+
+    Args:
+      provider_identifier (str): EventLog provider identifier.
+      log_source (str): EventLog source, such as "Application Error".
+      string_values (list[object]): string values, where values that are not
+          a string are converted to one.
+
+    Returns:
+      list[str]: formatted string values.
+    """
+    formatted_string_values = []
+    unformatted_string_values = {}
+
+    for string_value in string_values or []:
+      if string_value is None:
+        string_value = ''
+
+      elif not isinstance(string_value, str):
+        string_value = f'{string_value!s}'
+
+      if '%%' in string_value:
+        lookup_key = (
+            'string_value', provider_identifier, log_source, string_value)
+        formatted_string_value = self._string_value_cache.GetValue(lookup_key)
+        if formatted_string_value is not None:
+          string_value = formatted_string_value
+        else:
+          unformatted_string_values.setdefault(lookup_key, []).append(
+              len(formatted_string_values))
+
+      formatted_string_values.append(string_value)
+
+    if unformatted_string_values:
+      # The split string value alternates between text and parameter string
+      # references.
+      string_parts_per_lookup_key = {
+          lookup_key: self._PARAMETER_RE.split(lookup_key[3])
+          for lookup_key in unformatted_string_values}
+
+      parameter_lookups = list({
+          (provider_identifier, log_source, int(string_part[2:], 10))
+          for string_parts in string_parts_per_lookup_key.values()
+          for string_part in string_parts[1::2]})
+      parameter_strings = dict(zip(
+          parameter_lookups, self.GetParameterStrings(parameter_lookups)))
+
+      for lookup_key, string_parts in string_parts_per_lookup_key.items():
+        string_parts[1::2] = [
+            parameter_strings[(
+                provider_identifier, log_source,
+                int(string_part[2:], 10))] or string_part
+            for string_part in string_parts[1::2]]
+
+        formatted_string_value = ''.join(string_parts)
+        self._string_value_cache.CacheValue(lookup_key, formatted_string_value)
+
+        for index in unformatted_string_values[lookup_key]:
+          formatted_string_values[index] = formatted_string_value
+
+    return formatted_string_values
+
+  def _GetCachedMessageString(
+      self, namespace, provider_identifier, log_source, message_identifier,
+      event_version):
+    """Retrieves a specific cached message string.
+
+    Args:
+      namespace (str): cache namespace, such as "event" or "parameter".
+      provider_identifier (str): EventLog provider identifier.
+      log_source (str): EventLog source, such as "Application Error".
+      message_identifier (int): message identifier.
+      event_version (int): event version or None if not set.
+
+    Returns:
+      str: message string or None if not available.
+    """
+    message_string = None
+
+    if provider_identifier:
+      message_string = self._message_string_cache.GetValue(
+          (namespace, provider_identifier, message_identifier, event_version))
+
+    if not message_string and log_source:
+      message_string = self._message_string_cache.GetValue(
+          (namespace, log_source, message_identifier, event_version))
+
+    return message_string
+
+  def _ExpandWindowsPath(self, path):
+    """Expands the environment variables in a Windows path.
+
+    Path segments of the form "%NAME%" or "%%environ_name%%" are replaced by
+    the value of the corresponding environment variable, where names are
+    case-insensitive, and a leading drive indicator is removed.
+
+    Args:
+      path (str): Windows path with environment variables.
+
+    Returns:
+      str: expanded Windows path.
+    """
+    environment_variables = self._environment_variables or {}
+
+    path_segments = []
+    for path_segment in path.split('\\'):
+      if (len(path_segment) > 2 and path_segment[0] == '%' and
+          path_segment[-1] == '%'):
+        path_segment_upper_case = path_segment.upper()
+        if path_segment_upper_case.startswith('%%ENVIRON_'):
+          lookup_key = path_segment_upper_case[10:-2]
+        else:
+          lookup_key = path_segment_upper_case[1:-1]
+
+        path_segment = environment_variables.get(lookup_key, path_segment)
+
+      path_segments.extend(path_segment.split('\\'))
+
+    path_segment = path_segments[0]
+    if ((len(path_segment) == 2 and path_segment[1] == ':' and
+         path_segment[0].isalpha()) or
+        path_segment.upper() in ('%%ENVIRON_SYSTEMDRIVE%%', '%SYSTEMDRIVE%')):
+      path_segments[0] = ''
+
+    return '\\'.join(path_segments)
+
+  def _GetEventDefinitions(
+      self, event_definitions, container_type='windows_wevt_template_event',
+      message_file_identifiers=None):
+    """Maps event definitions by event identifier and version.
+
+    Lookups without a version map to the event definition with the lowest
+    version, where the first event definition is used for equal versions.
+
+    Args:
+      event_definitions (iterable[AttributeContainer]): event definitions of
+          a specific provider, in storage order.
+      container_type (Optional[str]): attribute container type of the event
+          definitions, either "windows_wevt_template_event" or
+          "winevtrc_message_string_mapping".
+      message_file_identifiers (Optional[tuple[str]]): identifiers of the
+          message files the event definitions should be defined by, where
+          None represents any message file.
+
+    Returns:
+      dict[tuple[int, int], int]: message identifiers per event identifier
+          and version, where a version of None represents any version.
+    """
+    identifier_attribute, version_attribute = (
+        self._EVENT_DEFINITION_ATTRIBUTES[container_type])
+
+    mapped_event_definitions = {}
+    lowest_versions = {}
+
+    for event_definition in event_definitions:
+      if message_file_identifiers is not None:
+        identifier = event_definition.GetMessageFileIdentifier()
+        if (identifier and
+            identifier.CopyToString() not in message_file_identifiers):
+          continue
+
+      identifier = getattr(event_definition, identifier_attribute, None)
+      version = getattr(event_definition, version_attribute, None)
+      message_identifier = event_definition.message_identifier
+
+      if version is not None:
+        mapped_event_definitions.setdefault(
+            (identifier, version), message_identifier)
+
+      # An event definition without a version sorts before version 0.
+      sort_version = -1 if version is None else version
+      if (identifier not in lowest_versions or
+          sort_version < lowest_versions[identifier]):
+        lowest_versions[identifier] = sort_version
+        mapped_event_definitions[(identifier, None)] = message_identifier
+
+    return mapped_event_definitions
+
+  def _GetEventMessageFileIdentifiers(
+      self, message_files, container_type='windows_eventlog_message_file'):
+    """Retrieves event message file identifiers.
+
+    Args:
+      message_files (list[str]): Windows EventLog message files.
+      container_type (Optional[str]): attribute container type of the
+          message files.
+
+    Returns:
+      list[str]: message file identifiers.
+    """
+    windows_eventlog_message_files = self._windows_eventlog_message_files.get(
+        container_type, {})
+
+    message_file_identifiers = []
+    for windows_path in message_files or []:
+      path, filename = self._GetWindowsSystemPath(windows_path)
+
+      lookup_path = '\\'.join([path, filename]).lower()
+      message_file_identifier = windows_eventlog_message_files.get(
+          lookup_path, None)
+      if message_file_identifier:
+        message_file_identifiers.append(message_file_identifier)
+
+      mui_filename = f'{filename:s}.mui'
+      lookup_path = '\\'.join([path, self._language_tag, mui_filename]).lower()
+      message_file_identifier = windows_eventlog_message_files.get(
+          lookup_path, None)
+      if message_file_identifier:
+        message_file_identifiers.append(message_file_identifier)
+
+    return message_file_identifiers
+
+  def _GetLookupExecutor(self):
+    """Retrieves the executor of the asynchronous lookups.
+
+    Returns:
+      concurrent.futures.ThreadPoolExecutor: executor.
+    """
+    with self._lock:
+      if not self._lookup_executor:
+        self._lookup_executor = futures.ThreadPoolExecutor(
+            max_workers=self._MAXIMUM_NUMBER_OF_LOOKUP_THREADS,
+            thread_name_prefix='winevt_rc')
+
+    return self._lookup_executor
+
+  def _GetMessageTemplate(
+      self, provider_identifier, log_source, message_identifier, event_version):
+    """Retrieves a specific compiled message template.
+
+    Args:
+      provider_identifier (str): EventLog provider identifier.
+      log_source (str): EventLog source, such as "Application Error".
+      message_identifier (int): message identifier.
+      event_version (int): event version or None if not set.
+
+    Returns:
+      WinevtResourcesMessageTemplate: compiled message template or None if
+          not available.
+    """
+    message_string = self.GetMessageString(
+        provider_identifier, log_source, message_identifier, event_version)
+    if not message_string:
+      return None
+
+    # Message strings of different lookups can share the same template.
+    lookup_key = ('template', message_string)
+    message_template = self._message_template_cache.GetValue(lookup_key)
+    if not message_template:
+      message_template = WinevtResourcesMessageTemplate(message_string)
+      self._message_template_cache.CacheValue(lookup_key, message_template)
+
+    return message_template
+
+  def _GetLookupTiers(self):
+    """Retrieves the lookup tiers in order of precedence.
+
+    The winevt-rc database is only opened when its tier is needed.
+
+    Yields:
+      str: name of the lookup tier, either "storage_reader",
+          "winevt_rc_lookup_file", "winevt_rc_sqlite" or "winevt_rc_store".
+    """
+    if self._storage_reader:
+      yield 'storage_reader'
+
+    database_reader = self._GetWinevtRcDatabaseReader()
+    if isinstance(database_reader, WinevtResourcesLookupFile):
+      yield 'winevt_rc_lookup_file'
+    elif isinstance(database_reader, WinevtResourcesSqlite3DatabaseReader):
+      yield 'winevt_rc_sqlite'
+    elif database_reader:
+      yield 'winevt_rc_store'
+
+  def _GetMappedMessageIdentifier(
+      self, storage_reader, provider_identifier, message_identifier,
+      event_version, container_type='windows_wevt_template_event',
+      message_file_identifiers=None):
+    """Retrieves a WEVT_TEMPLATE mapped message identifier if available.
+
+    Args:
+      storage_reader (StorageReader): storage reader.
+      provider_identifier (str): EventLog provider identifier.
+      message_identifier (int): message identifier.
+      event_version (int): event version or None if not set.
+      container_type (Optional[str]): attribute container type of the event
+          definitions.
+      message_file_identifiers (Optional[tuple[str]]): identifiers of the
+          message files the event definitions should be defined by, where
+          None represents any message file.
+
+    Returns:
+      int: message identifier.
+    """
+    if not provider_identifier:
+      return message_identifier
+
+    # Map the event identifier to a message identifier as defined by the
+    # WEVT_TEMPLATE event definition.
+    event_definitions = self._event_definitions.get(
+        (container_type, provider_identifier), None)
+    if event_definitions is None:
+      event_definitions = self._ReadEventDefinitions(
+          storage_reader, provider_identifier, container_type=container_type,
+          message_file_identifiers=message_file_identifiers)
+
+    mapped_message_identifier = event_definitions.get(
+        (message_identifier, event_version), None)
+    if mapped_message_identifier is not None:
+      logger.debug((
+          f'Message: 0x{message_identifier:08x} of provider: '
+          f'{provider_identifier:s} maps to: '
+          f'0x{mapped_message_identifier:08x}'))
+
+      return mapped_message_identifier
+
+    return message_identifier
+
+  def _GetMessageStrings(
+      self, storage_reader, message_file_identifiers, message_identifier):
+    """Retrieves message strings.
+
+    Args:
+      storage_reader (StorageReader): storage reader.
+      message_file_identifiers (list[str]): message file identifiers.
+      message_identifier (int): message identifier.
+
+    Returns:
+      list[str]: message strings.
+    """
+    if self._index_message_strings:
+      if self._message_string_index is None:
+        self._ReadMessageStringIndex(storage_reader)
+
+      message_strings_per_file = self._message_string_index.get(
+          message_identifier, {})
+      return [
+          message_string
+          for identifier, message_string in message_strings_per_file.items()
+          if identifier in message_file_identifiers]
+
+    message_strings = []
+
+    # TODO: add message_file_identifiers to filter_expression
+    filter_expression = (
+        f'language_identifier == {self._lcid:d} and '
+        f'message_identifier == {message_identifier:d}')
+
+    for message_string in storage_reader.GetAttributeContainers(
+        'windows_eventlog_message_string', filter_expression=filter_expression):
+      identifier = message_string.GetMessageFileIdentifier()
+      identifier = identifier.CopyToString()
+      if identifier in message_file_identifiers:
+        message_strings.append(message_string.string)
+
+    return message_strings
+
+  def _GetMessageStringsWithMessageTable(
+      self, storage_reader, message_file_identifiers, message_identifier):
+    """Retrieves message strings.
+
+    Args:
+      storage_reader (StorageReader): storage reader.
+      message_file_identifiers (list[str]): message file identifiers.
+      message_identifier (int): message identifier.
+
+    Returns:
+      list[str]: message strings.
+    """
+    if self._message_table_identifiers is None:
+      self._ReadMessageTableIdentifiers(storage_reader)
+
+    message_table_identifiers = []
+    for message_file_identifier in message_file_identifiers:
+      message_table_identifiers.extend(self._message_table_identifiers.get(
+          message_file_identifier, []))
+
+    if not message_table_identifiers:
+      return []
+
+    message_strings_per_table = {
+        message_table_identifier: []
+        for message_table_identifier in message_table_identifiers}
+
+    unique_message_table_identifiers = list(message_strings_per_table.keys())
+    for chunk_index in range(
+        0, len(unique_message_table_identifiers),
+        self._MAXIMUM_NUMBER_OF_QUERY_VALUES):
+      chunk_message_table_identifiers = unique_message_table_identifiers[
+          chunk_index:chunk_index + self._MAXIMUM_NUMBER_OF_QUERY_VALUES]
+
+      # The filter expression does not support parentheses, hence the message
+      # identifier is repeated for every message table identifier.
+      filter_expression = ' or '.join([
+          (f'_message_table_identifier == "{message_table_identifier:s}" and '
+           f'message_identifier == {message_identifier:d}')
+          for message_table_identifier in chunk_message_table_identifiers
+          if _IsSupportedFilterValue(message_table_identifier)])
+      if not filter_expression:
+        continue
+
+      for message_string in storage_reader.GetAttributeContainers(
+          'winevtrc_message_string', filter_expression=filter_expression):
+        identifier = message_string.GetMessageTableIdentifier()
+        message_table_identifier = identifier.CopyToString()
+
+        message_strings = message_strings_per_table.get(
+            message_table_identifier, None)
+        if message_strings is not None:
+          message_strings.append(message_string.text)
+
+    message_strings = []
+    for message_table_identifier in message_table_identifiers:
+      message_strings.extend(
+          message_strings_per_table[message_table_identifier])
+
+    return message_strings
+
+  def _GetPersistentCacheFingerprint(self):
+    """Determines the fingerprint of the sources of the message strings.
+
+    The sources are every lookup tier the message strings can be resolved
+    from: the storage file, if the storage reader is used, and the winevt-rc
+    database, its index-augmented copy and its lookup file.
+
+    Returns:
+      str: fingerprint or None if the sources cannot be fingerprinted.
+    """
+    paths = []
+    if self._storage_reader:
+      if not self._storage_path or not os.path.isfile(self._storage_path):
+        return None
+
+      paths.append(self._storage_path)
+
+    if self._data_location:
+      database_path = os.path.join(
+          self._data_location, self._WINEVT_RC_DATABASE)
+      paths.extend([
+          database_path, GetIndexedDatabasePath(database_path),
+          GetLookupFilePath(database_path)])
+
+    return WinevtResourcesPersistentMessageStringCache.GetFingerprint(paths)
+
+  def _GetProviderMessageFileIdentifiers(
+      self, provider, message_file_type,
+      container_type='windows_eventlog_message_file'):
+    """Retrieves the message file identifiers of a specific provider.
+
+    The message file identifiers only depend on the provider and the language
+    tag, hence they are determined once per provider.
+
+    Args:
+      provider (WinevtResourcesProvider): Windows EventLog provider.
+      message_file_type (str): message file type, either "event" or
+          "parameter".
+      container_type (Optional[str]): attribute container type of the
+          message files.
+
+    Returns:
+      tuple[str]: message file identifiers.
+    """
+    if message_file_type == 'event':
+      message_file_identifiers = provider.event_message_file_identifiers
+    else:
+      message_file_identifiers = provider.parameter_message_file_identifiers
+
+    if message_file_identifiers is None:
+      if message_file_type == 'event':
+        message_files = provider.event_message_files
+      else:
+        message_files = provider.parameter_message_files
+        if not message_files:
+          # If no parameter message files are defined fallback to the event
+          # message files and default parameter message files.
+          message_files = list(provider.event_message_files)
+          message_files.extend(self._DEFAULT_PARAMETER_MESSAGE_FILES)
+
+      message_file_identifiers = tuple(self._GetEventMessageFileIdentifiers(
+          message_files, container_type=container_type))
+
+      if message_file_type == 'event':
+        provider.event_message_file_identifiers = message_file_identifiers
+      else:
+        provider.parameter_message_file_identifiers = message_file_identifiers
+
+    return message_file_identifiers
+
+  def _GetStatisticsIntervalFromEnviron(self):
+    """Retrieves the lookup statistics summary interval from the environment.
+
+    Returns:
+      float: interval, in seconds, between lookup statistics summary log
+          messages, where 0 represents no summary log messages.
+    """
+    value = os.environ.get(self._STATISTICS_INTERVAL_ENVIRONMENT_VARIABLE, None)
+    if value:
+      try:
+        return max(0.0, float(value))
+      except ValueError:
+        logger.warning((
+            f'Unsupported {self._STATISTICS_INTERVAL_ENVIRONMENT_VARIABLE:s} '
+            f'value: {value:s}'))
+
+    return 0
+
+  def _GetWindowsSystemPath(self, windows_path):
+    """Retrieves a Windows system path.
+
+    The expanded directories are cached, since most message files are stored
+    in a small number of directories.
+
+    Args:
+      windows_path (str): Windows path with environment variables.
+
+    Returns:
+      tuple[str, str]: Windows system path and filename.
+    """
+    path, _, filename = windows_path.rpartition('\\')
+
+    # If the path is just a filename assume the file is stored in:
+    # "%SystemRoot%\System32".
+    if not path:
+      path = '%SystemRoot%\\System32'
+
+    expanded_path = self._expanded_windows_paths.get(path, None)
+    if expanded_path is None:
+      expanded_path = self._ExpandWindowsPath(path)
+      self._expanded_windows_paths[path] = expanded_path
+
+    return expanded_path, filename
 
-    message_files = provider.parameter_message_files
-    if not message_files:
-      # If no parameter message files are defined fallback to the event
-      # message files and default parameter message files.
-      message_files = list(provider.event_message_files)
-      message_files.extend(self._DEFAULT_PARAMETER_MESSAGE_FILES)
+  def _GetWindowsEventLogProvider(
+      self, attribute_store, provider_identifier, log_source,
+      container_type='windows_eventlog_provider'):
+    """Retrieves a Windows EventLog provider.
+
+    Providers are read from the attribute store on first use and kept per
+    attribute container type and lookup key, such that only the providers
+    that are looked up are read.
+
+    Args:
+      attribute_store (AttributeContainerStore): attribute container store.
+      provider_identifier (str): EventLog provider identifier.
+      log_source (str): EventLog source, such as "Application Error".
+      container_type (Optional[str]): attribute container type.
+
+    Returns:
+      tuple[WinevtResourcesProvider, str]: Windows EventLog provider or None
+          if not available, and provider lookup key.
+    """
+    provider = None
+    lookup_key = None
+
+    if provider_identifier:
+      lookup_key = provider_identifier.lower()
+      provider_key = (container_type, lookup_key)
+      if provider_key not in self._windows_eventlog_providers:
+        self._windows_eventlog_providers[provider_key] = (
+            self._ReadWindowsEventLogProviderByIdentifier(
+                attribute_store, lookup_key, container_type=container_type))
+
+      provider = self._windows_eventlog_providers[provider_key]
+
+    if not provider and log_source:
+      lookup_key = log_source.lower()
+      provider_key = (container_type, lookup_key)
+      if provider_key not in self._windows_eventlog_providers:
+        self._windows_eventlog_providers[provider_key] = (
+            self._ReadWindowsEventLogProviderByLogSource(
+                attribute_store, lookup_key, container_type=container_type))
+
+      provider = self._windows_eventlog_providers[provider_key]
+
+    return provider, lookup_key
+
+  def _GetWinevtRcDatabaseReader(self):
+    """Opens the Windows EventLog resource database reader.
+
+    Returns:
+      object: Windows EventLog resource lookup file, SQLite database reader or
+          attribute container store, or None if not available.
+    """
+    with self._lock:
+      if not self._winevt_database_reader_opened and self._data_location:
+        # Only try to open the database once.
+        self._winevt_database_reader_opened = True
+
+        logger.warning((
+            f'Falling back to {self._WINEVT_RC_DATABASE:s}. Please make sure '
+            f'the Windows EventLog message strings in the database correspond '
+            f'to those in the EventLog files.'))
+
+        database_path = os.path.join(
+            self._data_location, self._WINEVT_RC_DATABASE)
+
+        # Prefer a lookup file compiled from the database, unless the database
+        # was changed after the lookup file was compiled.
+        lookup_file_path = GetLookupFilePath(database_path)
+        if os.path.isfile(lookup_file_path) and (
+            not os.path.isfile(database_path) or
+            os.path.getmtime(lookup_file_path) >=
+            os.path.getmtime(database_path)):
+          self._winevt_database_reader = self._OpenWinevtRcLookupFile(
+              lookup_file_path)
+          if self._winevt_database_reader:
+            return self._winevt_database_reader
+
+        if not os.path.isfile(database_path):
+          return None
+
+        # Prefer a copy of the database with additional lookup indexes, unless
+        # the database was changed after the copy was created.
+        indexed_database_path = GetIndexedDatabasePath(database_path)
+        if (os.path.isfile(indexed_database_path) and
+            os.path.getmtime(indexed_database_path) >=
+            os.path.getmtime(database_path)):
+          database_path = indexed_database_path
+
+        try:
+          self._winevt_database_reader = WinevtResourcesSqlite3DatabaseReader(
+              preload=self._preload_database)
+          if self._statistics:
+            self._statistics.InstrumentMethods(
+                self._winevt_database_reader,
+                self._INSTRUMENTED_DATABASE_READER_METHODS)
+
+          result = self._winevt_database_reader.Open(database_path)
+        except (RuntimeError, sqlite3.OperationalError):
+          result = False
+
+        if not result:
+          try:
+            self._winevt_database_reader = (
+                WinevtResourcesAttributeContainerStore())
+            self._winevt_database_reader.Open(path=database_path, read_only=True)  # pylint: disable=no-value-for-parameter,unexpected-keyword-arg
+            result = True
+          except IOError:
+            result = False
 
-    message_file_identifiers = self._GetEventMessageFileIdentifiers(
-        message_files)
+        if not result:
+          self._winevt_database_reader = None
+
+    return self._winevt_database_reader
+
+  def _OpenWinevtRcLookupFile(self, path):
+    """Opens a Windows EventLog resource lookup file.
+
+    Args:
+      path (str): path of the lookup file.
+
+    Returns:
+      WinevtResourcesLookupFile: Windows EventLog resource lookup file or None
+          if the lookup file cannot be opened or does not contain the message
+          strings of the LCID.
+    """
+    lookup_file = WinevtResourcesLookupFile()
+    if self._statistics:
+      self._statistics.InstrumentMethods(
+          lookup_file, self._INSTRUMENTED_LOOKUP_FILE_METHODS)
+
+    try:
+      result = lookup_file.Open(path)
+    except (IOError, OSError) as exception:
+      logger.warning(
+          f'Unable to open lookup file: {path:s} with error: {exception!s}')
+      result = False
+
+    if result and self._lcid not in lookup_file.lcids:
+      logger.debug((
+          f'Lookup file: {path:s} does not contain message strings of LCID: '
+          f'0x{self._lcid:08x}'))
+      lookup_file.Close()
+      result = False
+
+    if not result:
+      return None
+
+    return lookup_file
+
+  def _ReadWinevtRcStoreParameterString(
+      self, database_reader, provider_identifier, log_source,
+      message_identifier):
+    """Reads a parameter string from a Windows EventLog resource store.
+
+    Args:
+      database_reader (WinevtResourcesAttributeContainerStore): Windows
+          EventLog resource attribute container store.
+      provider_identifier (str): EventLog provider identifier.
+      log_source (str): EventLog source, such as "Application Error".
+      message_identifier (int): parameter identifier.
+
+    Returns:
+      str: parameter string or None if not available.
+    """
+    provider, provider_lookup_key = self._GetWindowsEventLogProvider(
+        database_reader, provider_identifier, log_source,
+        container_type='winevtrc_eventlog_provider')
+    if not provider:
+      return None
+
+    if 'winevtrc_message_file' not in self._windows_eventlog_message_files:
+      self._ReadWindowsEventLogMessageFiles(
+          database_reader, container_type='winevtrc_message_file',
+          path_attribute='windows_path')
+
+    message_file_identifiers = self._GetProviderMessageFileIdentifiers(
+        provider, 'parameter', container_type='winevtrc_message_file')
     if not message_file_identifiers:
       logger.warning((
           f'No parameter message file for identifier: '
           f'0x{message_identifier:08x} of provider: {provider_lookup_key:s}'))
       return None
 
-    message_strings = self._GetMessageStrings(
-        storage_reader, message_file_identifiers, message_identifier)
-    if not message_strings:
-      logger.warning((
-          f'No parameter string for identifier: 0x{message_identifier:08x} '
-          f'of provider: {provider_lookup_key:s}'))
-      return None
+    message_strings = self._GetMessageStringsWithMessageTable(
+        database_reader, message_file_identifiers, message_identifier)
+    if not message_strings:
+      logger.warning((
+          f'No parameter string for identifier: 0x{message_identifier:08x} '
+          f'of provider: {provider_lookup_key:s}'))
+      return None
+
+    return message_strings[0]
+
+  def _ReadWinevtRcStoreMessageString(
+      self, database_reader, provider_identifier, log_source,
+      message_identifier, event_version):
+    """Reads a message string from a Windows EventLog resource store.
+
+    Args:
+      database_reader (WinevtResourcesAttributeContainerStore): Windows
+          EventLog resource attribute container store.
+      provider_identifier (str): EventLog provider identifier.
+      log_source (str): EventLog source, such as "Application Error".
+      message_identifier (int): message identifier.
+      event_version (int): event version or None if not set.
+
+    Returns:
+      str: message string or None if not available.
+    """
+    provider, provider_lookup_key = self._GetWindowsEventLogProvider(
+        database_reader, provider_identifier, log_source,
+        container_type='winevtrc_eventlog_provider')
+    if not provider:
+      return None
+
+    if 'winevtrc_message_file' not in self._windows_eventlog_message_files:
+      self._ReadWindowsEventLogMessageFiles(
+          database_reader, container_type='winevtrc_message_file',
+          path_attribute='windows_path')
+
+    original_message_identifier = message_identifier
+
+    message_file_identifiers = self._GetProviderMessageFileIdentifiers(
+        provider, 'event', container_type='winevtrc_message_file')
+
+    message_identifier = self._GetMappedMessageIdentifier(
+        database_reader, provider_identifier, message_identifier, event_version,
+        container_type='winevtrc_message_string_mapping',
+        message_file_identifiers=message_file_identifiers)
+
+    if not message_file_identifiers:
+      logger.warning((
+          f'No event message file for identifier: 0x{message_identifier:08x} '
+          f'(original: 0x{original_message_identifier:08x}) '
+          f'of provider: {provider_lookup_key:s}'))
+      return None
+
+    message_strings = self._GetMessageStringsWithMessageTable(
+        database_reader, message_file_identifiers, message_identifier)
+    if not message_strings:
+      logger.warning((
+          f'No message string for identifier: 0x{message_identifier:08x} '
+          f'(original: 0x{original_message_identifier:08x}) '
+          f'of provider: {provider_lookup_key:s}'))
+      return None
+
+    message_string = message_strings[0]
+    if database_reader.string_format == 'wrc':
+      message_string = self._FormatMessageString(message_string)
+
+    return message_string
+
+  def _ReadEnvironmentVariables(self, storage_reader):
+    """Reads the environment variables.
+
+    The environment variables are read into a map of their upper case names
+    to their values, which is used to expand Windows paths.
+
+    Args:
+      storage_reader (StorageReader): storage reader.
+    """
+    # TODO: get environment variables related to the source.
+    self._environment_variables = {}
+    self._expanded_windows_paths = {}
+
+    # FIX: Add null check to prevent AttributeError when storage_reader is None
+    if storage_reader is None:
+      return
+
+    for environment_variable in storage_reader.GetAttributeContainers(
+        'environment_variable'):
+      if isinstance(environment_variable.value, str):
+        name = environment_variable.name.upper()
+        self._environment_variables[name] = environment_variable.value
+
+  def _ReadEventMessageString(
+      self, storage_reader, provider_identifier, log_source,
+      message_identifier, event_version):
+    """Reads an event message string.
+
+    Args:
+      storage_reader (StorageReader): storage reader.
+      provider_identifier (str): EventLog provider identifier.
+      log_source (str): EventLog source, such as "Application Error".
+      message_identifier (int): message identifier.
+      event_version (int): event version or None if not set.
+
+    Returns:
+      str: message string or None if not available.
+    """
+    if self._environment_variables is None:
+      self._ReadEnvironmentVariables(storage_reader)
+
+    provider, provider_lookup_key = self._GetWindowsEventLogProvider(
+        storage_reader, provider_identifier, log_source)
+    if not provider:
+      return None
+
+    if ('windows_eventlog_message_file' not in
+        self._windows_eventlog_message_files):
+      self._ReadWindowsEventLogMessageFiles(storage_reader)
+
+    if not storage_reader.HasAttributeContainers(
+        'windows_eventlog_message_string'):
+      return None
+
+    original_message_identifier = message_identifier
+
+    # TODO: pass message_file_identifiers
+    message_identifier = self._GetMappedMessageIdentifier(
+        storage_reader, provider_identifier, message_identifier, event_version)
+
+    message_file_identifiers = self._GetProviderMessageFileIdentifiers(
+        provider, 'event')
+    if not message_file_identifiers:
+      logger.warning((
+          f'No event message file for identifier: 0x{message_identifier:08x} '
+          f'(original: 0x{original_message_identifier:08x}) '
+          f'of provider: {provider_lookup_key:s}'))
+      return None
+
+    message_strings = self._GetMessageStrings(
+        storage_reader, message_file_identifiers, message_identifier)
+    if not message_strings:
+      logger.warning((
+          f'No message string for identifier: 0x{message_identifier:08x} '
+          f'(original: 0x{original_message_identifier:08x}) '
+          f'of provider: {provider_lookup_key:s}'))
+      return None
+
+    return message_strings[0]
+
+  def _ReadEventDefinitions(
+      self, storage_reader, provider_identifier,
+      container_type='windows_wevt_template_event',
+      message_file_identifiers=None):
+    """Reads the WEVT_TEMPLATE event definitions of a specific provider.
+
+    The event definitions are mapped by event identifier and version. Lookups
+    without a version map to the event definition with the lowest version,
+    where the first stored event definition is used for equal versions.
+
+    Args:
+      storage_reader (StorageReader): storage reader.
+      provider_identifier (str): EventLog provider identifier.
+      container_type (Optional[str]): attribute container type of the event
+          definitions, either "windows_wevt_template_event" or
+          "winevtrc_message_string_mapping".
+      message_file_identifiers (Optional[tuple[str]]): identifiers of the
+          message files the event definitions should be defined by, where
+          None represents any message file.
+
+    Returns:
+      dict[tuple[int, int], int]: message identifiers per event identifier
+          and version, where a version of None represents any version.
+    """
+    event_definitions = {}
+
+    # Only probe the attribute container store once per container type.
+    has_event_definitions = self._event_definition_container_types.get(
+        container_type, None)
+    if has_event_definitions is None:
+      has_event_definitions = storage_reader.HasAttributeContainers(
+          container_type)
+      self._event_definition_container_types[container_type] = (
+          has_event_definitions)
+
+    if has_event_definitions and _IsSupportedFilterValue(provider_identifier):
+      # TODO: add message_file_identifiers to filter_expression
+      filter_expression = f'provider_identifier == "{provider_identifier:s}"'
+
+      event_definitions = self._GetEventDefinitions(
+          storage_reader.GetAttributeContainers(
+              container_type, filter_expression=filter_expression),
+          container_type=container_type,
+          message_file_identifiers=message_file_identifiers)
+
+    self._event_definitions[(container_type, provider_identifier)] = (
+        event_definitions)
+
+    return event_definitions
+
+  def _ReadMessageStringIndex(self, storage_reader):
+    """Reads the message strings of the LCID into an in-memory index.
+
+    The index maps a message identifier to the message strings per message
+    file identifier, in the order they are stored.
+
+    Args:
+      storage_reader (StorageReader): storage reader.
+    """
+    start_time = time.perf_counter()
+
+    self._message_string_index = {}
+    number_of_message_strings = 0
+
+    filter_expression = f'language_identifier == {self._lcid:d}'
+    for message_string in storage_reader.GetAttributeContainers(
+        'windows_eventlog_message_string', filter_expression=filter_expression):
+      identifier = message_string.GetMessageFileIdentifier()
+      identifier = sys.intern(identifier.CopyToString())
+
+      message_strings_per_file = self._message_string_index.setdefault(
+          message_string.message_identifier, {})
+      if identifier not in message_strings_per_file:
+        message_strings_per_file[identifier] = message_string.string
+        number_of_message_strings += 1
+
+    elapsed_time = time.perf_counter() - start_time
+    logger.debug((
+        f'Indexed {number_of_message_strings:d} message strings of LCID: '
+        f'0x{self._lcid:08x} in {elapsed_time:.3f} seconds.'))
+
+  def _ReadMessageStrings(self, lookup_tier, namespace, lookups):
+    """Reads message strings from a specific lookup tier.
+
+    Args:
+      lookup_tier (str): name of the lookup tier.
+      namespace (str): namespace of the message strings, either "event" or
+          "parameter".
+      lookups (list[tuple]): EventLog provider identifier, EventLog source,
+          message identifier and, for event message strings, event version
+          of the requested message strings.
+
+    Returns:
+      dict[tuple, str]: message string, or None if not available, per lookup.
+    """
+    if lookup_tier == 'storage_reader':
+      with self._lock:
+        if namespace == 'parameter':
+          return self._ReadParameterMessageStrings(
+              self._storage_reader, lookups)
+
+        return {
+            lookup: self._ReadEventMessageString(self._storage_reader, *lookup)
+            for lookup in lookups}
+
+    database_reader = self._winevt_database_reader
+
+    if lookup_tier == 'winevt_rc_lookup_file':
+      # The lookup file does not contain parameter message strings.
+      if namespace == 'parameter':
+        return {}
+
+      message_strings = {}
+      for lookup in lookups:
+        provider_identifier, log_source, message_identifier, event_version = (
+            lookup)
+        message_strings[lookup] = database_reader.GetMessageString(
+            provider_identifier, log_source, self._lcid, message_identifier,
+            event_version)
+
+      return message_strings
+
+    if lookup_tier == 'winevt_rc_sqlite':
+      # The SQLite database does not distinguish parameter message files and
+      # is only keyed by EventLog source.
+      if namespace == 'parameter':
+        return {}
+
+      lookups = [lookup for lookup in lookups if lookup[1]]
+      if len(lookups) == 1:
+        _, log_source, message_identifier, _ = lookups[0]
+        message_strings = [database_reader.GetMessage(
+            log_source, self._lcid, message_identifier)]
+      else:
+        message_strings = database_reader.GetMessages([
+            (log_source, self._lcid, message_identifier)
+            for _, log_source, message_identifier, _ in lookups])
+
+      return dict(zip(lookups, message_strings))
+
+    with self._lock:
+      if namespace == 'parameter':
+        return {
+            lookup: self._ReadWinevtRcStoreParameterString(
+                database_reader, *lookup)
+            for lookup in lookups}
+
+      return {
+          lookup: self._ReadWinevtRcStoreMessageString(
+              database_reader, *lookup)
+          for lookup in lookups}
+
+  def _ReadMessageTableIdentifiers(self, attribute_store):
+    """Reads the message table identifiers of the LCID per message file.
+
+    Args:
+      attribute_store (AttributeContainerStore): attribute container store.
+    """
+    self._message_table_identifiers = {}
+
+    filter_expression = f'language_identifier == {self._lcid:d}'
+    for message_table in attribute_store.GetAttributeContainers(
+        'winevtrc_message_table', filter_expression=filter_expression):
+      identifier = message_table.GetMessageFileIdentifier()
+      message_file_identifier = identifier.CopyToString()
+
+      identifier = message_table.GetIdentifier()
+      message_table_identifier = identifier.CopyToString()
+
+      self._message_table_identifiers.setdefault(
+          message_file_identifier, []).append(message_table_identifier)
+
+  def _ReadParameterMessageStrings(self, storage_reader, lookups):
+    """Reads parameter message strings.
+
+    The message strings of all the parameters in the lookups that were not
+    read before are read in a single pass.
+
+    Args:
+      storage_reader (StorageReader): storage reader.
+      lookups (list[tuple[str, str, int]]): EventLog provider identifier,
+          EventLog source and parameter identifier of the requested parameter
+          strings.
+
+    Returns:
+      dict[tuple[str, str, int], str]: parameter string, or None if not
+          available, per lookup of a resolved provider.
+    """
+    if self._environment_variables is None:
+      self._ReadEnvironmentVariables(storage_reader)
+
+    message_file_identifiers_per_lookup = {}
+    for lookup in lookups:
+      provider_identifier, log_source, message_identifier = lookup
+
+      provider, provider_lookup_key = self._GetWindowsEventLogProvider(
+          storage_reader, provider_identifier, log_source)
+      if not provider:
+        continue
+
+      if ('windows_eventlog_message_file' not in
+          self._windows_eventlog_message_files):
+        self._ReadWindowsEventLogMessageFiles(storage_reader)
+
+      if not storage_reader.HasAttributeContainers(
+          'windows_eventlog_message_string'):
+        continue
+
+      message_file_identifiers = self._GetProviderMessageFileIdentifiers(
+          provider, 'parameter')
+      if not message_file_identifiers:
+        logger.warning((
+            f'No parameter message file for identifier: '
+            f'0x{message_identifier:08x} of provider: {provider_lookup_key:s}'))
+        continue
+
+      message_file_identifiers_per_lookup[lookup] = (
+          message_file_identifiers, provider_lookup_key)
+
+    message_strings_per_parameter = {}
+    if not self._index_message_strings:
+      unread_message_identifiers = set()
+      for lookup in message_file_identifiers_per_lookup:
+        message_identifier = lookup[2]
+        if (message_identifier in message_strings_per_parameter or
+            message_identifier in unread_message_identifiers):
+          continue
+
+        message_strings_per_file = (
+            self._parameter_message_string_index.GetValue(
+                ('parameter_index', message_identifier)))
+        if message_strings_per_file is None:
+          unread_message_identifiers.add(message_identifier)
+        else:
+          message_strings_per_parameter[message_identifier] = (
+              message_strings_per_file)
+
+      if unread_message_identifiers:
+        message_strings_per_parameter.update(
+            self._ReadParameterMessageStringIndex(
+                storage_reader, unread_message_identifiers))
+
+    parameter_strings = {}
+    for lookup, (message_file_identifiers, provider_lookup_key) in (
+        message_file_identifiers_per_lookup.items()):
+      message_identifier = lookup[2]
+
+      if self._index_message_strings:
+        message_strings = self._GetMessageStrings(
+            storage_reader, message_file_identifiers, message_identifier)
+      else:
+        message_strings_per_file = message_strings_per_parameter[
+            message_identifier]
+        message_strings = [
+            message_string
+            for identifier, message_string in message_strings_per_file.items()
+            if identifier in message_file_identifiers]
+
+      if not message_strings:
+        logger.warning((
+            f'No parameter string for identifier: 0x{message_identifier:08x} '
+            f'of provider: {provider_lookup_key:s}'))
+
+      parameter_strings[lookup] = None
+      if message_strings:
+        parameter_strings[lookup] = message_strings[0]
+
+    return parameter_strings
+
+  def _ReadParameterMessageStringIndex(
+      self, storage_reader, message_identifiers):
+    """Reads the message strings of specific parameters into an index.
+
+    Like the message string index, the parameter message string index maps a
+    message identifier to the message strings per message file identifier, in
+    the order they are stored, but it only contains the parameters that were
+    looked up. The message strings of the default parameter message files are
+    therefore read once and shared by all providers. The index is a bounded
+    cache, from which the least recently used parameters are evicted.
+
+    Args:
+      storage_reader (StorageReader): storage reader.
+      message_identifiers (set[int]): message identifiers of the parameters.
+
+    Returns:
+      dict[int, dict[str, str]]: message strings per message file identifier
+          per message identifier of the parameters.
+    """
+    message_strings_per_parameter = {}
+    message_identifiers = sorted(message_identifiers)
+
+    for chunk_index in range(
+        0, len(message_identifiers), self._MAXIMUM_NUMBER_OF_QUERY_VALUES):
+      chunk_message_identifiers = message_identifiers[
+          chunk_index:chunk_index + self._MAXIMUM_NUMBER_OF_QUERY_VALUES]
+
+      for message_identifier in chunk_message_identifiers:
+        message_strings_per_parameter[message_identifier] = {}
+
+      # The filter expression does not support parentheses, hence the language
+      # identifier is repeated for every message identifier.
+      filter_expression = ' or '.join([
+          (f'language_identifier == {self._lcid:d} and '
+           f'message_identifier == {message_identifier:d}')
+          for message_identifier in chunk_message_identifiers])
+
+      for message_string in storage_reader.GetAttributeContainers(
+          'windows_eventlog_message_string',
+          filter_expression=filter_expression):
+        identifier = message_string.GetMessageFileIdentifier()
+        identifier = sys.intern(identifier.CopyToString())
+
+        message_strings_per_file = message_strings_per_parameter[
+            message_string.message_identifier]
+        if identifier not in message_strings_per_file:
+          message_strings_per_file[identifier] = message_string.string
+
+    for message_identifier, message_strings_per_file in (
+        message_strings_per_parameter.items()):
+      self._parameter_message_string_index.CacheValue(
+          ('parameter_index', message_identifier), message_strings_per_file)
+
+    return message_strings_per_parameter
+
+  def _ReadPersistentCache(self):
+    """Reads the persistent message string cache.
+
+    The persistent cache is read once, on the first lookup that is not
+    cached in memory. Its message strings of the source and LCID are added
+    to the message string cache.
+    """
+    with self._lock:
+      if not self._persistent_cache_path:
+        return
+
+      path = self._persistent_cache_path
+      self._persistent_cache_path = None
+
+      fingerprint = self._GetPersistentCacheFingerprint()
+      if not fingerprint:
+        logger.debug((
+            'Persistent message string cache not used since the source of '
+            'the message strings cannot be fingerprinted.'))
+        return
+
+      persistent_cache = WinevtResourcesPersistentMessageStringCache()
+      if not persistent_cache.Open(path):
+        return
+
+      start_time = time.perf_counter()
+
+      message_strings = persistent_cache.GetMessageStrings(
+          fingerprint, self._lcid)
+      for lookup_key, message_string in message_strings:
+        self._message_string_cache.CacheValue(lookup_key, message_string)
+
+      elapsed_time = time.perf_counter() - start_time
+      logger.debug((
+          f'Read {len(message_strings):d} message strings from persistent '
+          f'cache: {path:s} in {elapsed_time:.3f} seconds.'))
+
+      self._persistent_cache_fingerprint = fingerprint
+      self._persistent_cache = persistent_cache
+
+  def _ReadWarmUpLookups(self, path):
+    """Reads the warm-up lookups from a file.
+
+    The file contains one lookup per line, formatted as:
+    "provider identifier,EventLog source,message identifier,event version"
+    where empty values represent None and the message identifier and event
+    version are integers, such as "4624" or "0x00001210". Empty lines and
+    lines starting with "#" are ignored.
 
-    return message_strings[0].string
+    Args:
+      path (str): path of the warm-up lookups file.
+
+    Returns:
+      list[tuple[str, str, int, int]]: EventLog provider identifier, EventLog
+          source, message identifier and event version of the lookups.
+    """
+    lookups = []
+
+    try:
+      with open(path, 'r', encoding='utf-8') as file_object:
+        for line_number, line in enumerate(file_object, start=1):
+          line = line.strip()
+          if not line or line.startswith('#'):
+            continue
+
+          try:
+            values = [value.strip() or None for value in line.split(',')]
+            provider_identifier, log_source, message_identifier, version = (
+                values)
+            message_identifier = int(message_identifier, 0)
+            if version is not None:
+              version = int(version, 0)
+
+          except (TypeError, ValueError):
+            logger.warning(
+                f'Unsupported warm-up lookup in {path:s}:{line_number:d}')
+            continue
+
+          lookups.append((
+              provider_identifier, log_source, message_identifier, version))
+
+    except IOError as exception:
+      logger.warning(
+          f'Unable to read warm-up lookups from {path:s} with error: '
+          f'{exception!s}')
+
+    return lookups
 
   def _ReadWindowsEventLogMessageFiles(
       self, attribute_store, container_type='windows_eventlog_message_file',
@@ -1139,36 +4062,467 @@ class WinevtResourcesHelper(object):
       path_attribute (Optional[str]): name of the attribute containing the path.
     """
     # TODO: get windows eventlog message files related to the source.
-    self._windows_eventlog_message_files = {}
+    windows_eventlog_message_files = {}
     if attribute_store.HasAttributeContainers(container_type):
       for message_file in attribute_store.GetAttributeContainers(
           container_type):
         message_file_path = getattr(message_file, path_attribute, None)
-        path, filename = path_helper.PathHelper.GetWindowsSystemPath(
-            message_file_path, self._environment_variables)
+        if not message_file_path:
+          continue
+
+        path, filename = self._GetWindowsSystemPath(message_file_path)
 
         lookup_path = '\\'.join([path, filename]).lower()
         message_file_identifier = message_file.GetIdentifier()
-        self._windows_eventlog_message_files[lookup_path] = (
-            message_file_identifier)
+        windows_eventlog_message_files[lookup_path] = sys.intern(
+            message_file_identifier.CopyToString())
+
+    self._windows_eventlog_message_files[container_type] = (
+        windows_eventlog_message_files)
+
+  def _ReadWindowsEventLogProviderByIdentifier(
+      self, attribute_store, lookup_key,
+      container_type='windows_eventlog_provider'):
+    """Reads a specific Windows EventLog provider by identifier.
+
+    Args:
+      attribute_store (AttributeContainerStore): attribute container store.
+      lookup_key (str): lower case EventLog provider identifier.
+      container_type (Optional[str]): attribute container type.
+
+    Returns:
+      WinevtResourcesProvider: Windows EventLog provider or None if not
+          available.
+    """
+    if not _IsSupportedFilterValue(lookup_key):
+      return None
+
+    if not attribute_store.HasAttributeContainers(container_type):
+      return None
+
+    provider = None
+
+    filter_expression = f'identifier == "{lookup_key:s}"'
+    for provider in attribute_store.GetAttributeContainers(
+        container_type, filter_expression=filter_expression):
+      # Use the last matching provider.
+      pass
 
-  def _ReadWindowsEventLogProviders(
+    if not provider:
+      return None
+
+    return WinevtResourcesProvider.FromAttributeContainer(provider)
+
+  def _ReadWindowsEventLogProviderByLogSource(
+      self, attribute_store, lookup_key,
+      container_type='windows_eventlog_provider'):
+    """Reads a specific Windows EventLog provider by EventLog source.
+
+    The EventLog sources are stored as part of a list, which cannot be
+    filtered on, hence an index of the provider identifiers per EventLog
+    source is read on first use.
+
+    Args:
+      attribute_store (AttributeContainerStore): attribute container store.
+      lookup_key (str): lower case EventLog source.
+      container_type (Optional[str]): attribute container type.
+
+    Returns:
+      WinevtResourcesProvider: Windows EventLog provider or None if not
+          available.
+    """
+    if container_type not in self._windows_eventlog_provider_log_sources:
+      self._ReadWindowsEventLogProviderLogSources(
+          attribute_store, container_type=container_type)
+
+    identifier = self._windows_eventlog_provider_log_sources[
+        container_type].get(lookup_key, None)
+    if not identifier:
+      return None
+
+    provider = attribute_store.GetAttributeContainerByIdentifier(
+        container_type, identifier)
+    if not provider:
+      return None
+
+    return WinevtResourcesProvider.FromAttributeContainer(provider)
+
+  def _ReadWindowsEventLogProviderLogSources(
       self, attribute_store, container_type='windows_eventlog_provider'):
-    """Reads Windows EventLog provider attribute containers.
+    """Reads the Windows EventLog provider identifiers per EventLog source.
+
+    Only the identifiers of the providers are kept, the providers are read
+    when looked up.
 
     Args:
       attribute_store (AttributeContainerStore): attribute container store.
       container_type (Optional[str]): attribute container type.
     """
-    self._windows_eventlog_providers = {}
+    start_time = time.perf_counter()
+
+    provider_log_sources = {}
     if attribute_store.HasAttributeContainers(container_type):
       for provider in attribute_store.GetAttributeContainers(container_type):
-        if provider.identifier:
-          self._windows_eventlog_providers[provider.identifier] = provider
+        identifier = provider.GetIdentifier()
+        for log_source in provider.log_sources or []:
+          log_source = sys.intern(log_source.lower())
+          provider_log_sources[log_source] = identifier
+
+    self._windows_eventlog_provider_log_sources[container_type] = (
+        provider_log_sources)
+
+    elapsed_time = time.perf_counter() - start_time
+    logger.debug((
+        f'Indexed {len(provider_log_sources):d} EventLog sources in '
+        f'{elapsed_time:.3f} seconds.'))
+
+  def _ResolveMessageStrings(self, namespace, lookups):
+    """Resolves message strings from the lookup tiers.
+
+    Lookups are first read from the lookup tier that resolved them before,
+    if known, and otherwise from the lookup tiers in order of precedence,
+    until they are resolved.
+
+    Args:
+      namespace (str): namespace of the message strings, either "event" or
+          "parameter".
+      lookups (list[tuple]): EventLog provider identifier, EventLog source,
+          message identifier and, for event message strings, event version
+          of the requested message strings.
+
+    Returns:
+      dict[tuple, str]: message string per resolved lookup.
+    """
+    message_strings = {}
+    unresolved_lookups = []
+
+    lookups_per_tier = {}
+    for lookup in lookups:
+      lookup_tier = self._lookup_tier_cache.GetValue((namespace, *lookup))
+      if lookup_tier:
+        lookups_per_tier.setdefault(lookup_tier, []).append(lookup)
+      else:
+        unresolved_lookups.append(lookup)
+
+    for lookup_tier, tier_lookups in lookups_per_tier.items():
+      tier_message_strings = self._ReadMessageStrings(
+          lookup_tier, namespace, tier_lookups)
+      for lookup in tier_lookups:
+        message_string = tier_message_strings.get(lookup, None)
+        if message_string:
+          message_strings[lookup] = message_string
+        else:
+          unresolved_lookups.append(lookup)
+
+    if not unresolved_lookups:
+      return message_strings
+
+    for lookup_tier in self._GetLookupTiers():
+      tier_message_strings = self._ReadMessageStrings(
+          lookup_tier, namespace, unresolved_lookups)
+
+      tier_unresolved_lookups = []
+      for lookup in unresolved_lookups:
+        message_string = tier_message_strings.get(lookup, None)
+        if message_string:
+          message_strings[lookup] = message_string
+          self._lookup_tier_cache.CacheValue((namespace, *lookup), lookup_tier)
+        else:
+          tier_unresolved_lookups.append(lookup)
+
+      unresolved_lookups = tier_unresolved_lookups
+      # Stop before the next lookup tier is opened.
+      if not unresolved_lookups:
+        break
+
+    return message_strings
+
+  def _TrackInFlightLookup(self, lookup_key, future):
+    """Tracks a pending asynchronous lookup until it is done.
+
+    Args:
+      lookup_key (tuple): lookup key of the message string.
+      future (asyncio.Future): future of the pending lookup.
+    """
+    self._in_flight_lookups[lookup_key] = future
+
+    def _RemoveInFlightLookup(completed_future):
+      if self._in_flight_lookups.get(lookup_key, None) is completed_future:
+        del self._in_flight_lookups[lookup_key]
+
+    future.add_done_callback(_RemoveInFlightLookup)
+
+  def AddWinevtRcStoreLookupValues(
+      self, writer, attribute_store, providers, message_strings_per_table,
+      event_definitions_per_provider):
+    """Adds the lookup values of a winevt-rc attribute container store.
+
+    The message strings and event definitions of the LCID of the helper are
+    resolved as the helper resolves them from the attribute container store.
+
+    Args:
+      writer (WinevtResourcesLookupFileWriter): lookup file writer.
+      attribute_store (WinevtResourcesAttributeContainerStore): winevt-rc
+          attribute container store.
+      providers (list[WinevtResourcesEventLogProvider]): EventLog providers
+          of the store, where the index of a provider is its provider number.
+      message_strings_per_table (dict[str, dict[int, str]]): message string
+          per message identifier per message table identifier, where the
+          message tables of the LCID are included.
+      event_definitions_per_provider (dict[str, list[
+          WinevtResourcesMessageStringMapping]]): event definitions per
+          EventLog provider identifier.
+
+    Returns:
+      int: number of message strings added.
+    """
+    self._ReadWindowsEventLogMessageFiles(
+        attribute_store, container_type='winevtrc_message_file',
+        path_attribute='windows_path')
+    self._ReadMessageTableIdentifiers(attribute_store)
+
+    number_of_message_strings = 0
+    for provider_number, provider in enumerate(providers):
+      # The message file identifiers are kept by the compact provider, hence
+      # a compact provider is created per helper.
+      compact_provider = WinevtResourcesProvider.FromAttributeContainer(
+          provider)
+      message_file_identifiers = self._GetProviderMessageFileIdentifiers(
+          compact_provider, 'event', container_type='winevtrc_message_file')
+      if not message_file_identifiers:
+        continue
+
+      # The first message table with a message string is used, as for
+      # lookups in the attribute container store.
+      message_strings = {}
+      for message_file_identifier in message_file_identifiers:
+        for message_table_identifier in self._message_table_identifiers.get(
+            message_file_identifier, []):
+          for message_identifier, message_string in (
+              message_strings_per_table[message_table_identifier].items()):
+            message_strings.setdefault(message_identifier, message_string)
+
+      for message_identifier, message_string in message_strings.items():
+        if message_string and attribute_store.string_format == 'wrc':
+          message_string = self._FormatMessageString(message_string)
+
+        if writer.AddMessageString(
+            provider_number, message_identifier, self._lcid, message_string):
+          number_of_message_strings += 1
+
+      event_definitions = event_definitions_per_provider.get(
+          provider.identifier, None)
+      if not provider.identifier or not event_definitions:
+        continue
+
+      event_definitions = self._GetEventDefinitions(
+          event_definitions, container_type='winevtrc_message_string_mapping',
+          message_file_identifiers=message_file_identifiers)
+
+      for (event_identifier, event_version), message_identifier in (
+          event_definitions.items()):
+        writer.AddEventDefinition(
+            provider_number, event_identifier, event_version, self._lcid,
+            message_identifier)
+
+    return number_of_message_strings
+
+  async def AsyncGetMessageString(
+      self, provider_identifier, log_source, message_identifier, event_version):
+    """Retrieves a specific Windows EventLog message string asynchronously.
+
+    Cached lookups are answered without leaving the event loop. Other lookups
+    run in a bounded thread pool, where concurrent lookups of the same message
+    string share a single pending lookup.
+
+    Args:
+      provider_identifier (str): EventLog provider identifier.
+      log_source (str): EventLog source, such as "Application Error".
+      message_identifier (int): message identifier.
+      event_version (int): event version or None if not set.
+
+    Returns:
+      str: message string or None if not available.
+    """
+    event_loop = asyncio.get_running_loop()
+
+    if self._persistent_cache_path:
+      await event_loop.run_in_executor(
+          self._GetLookupExecutor(), self._ReadPersistentCache)
+
+    message_string = self._GetCachedMessageString(
+        'event', provider_identifier, log_source, message_identifier,
+        event_version)
+    if message_string:
+      return message_string
+
+    lookup_key = (
+        'event', provider_identifier, log_source, message_identifier,
+        event_version)
+    if self._unresolved_lookup_cache.GetValue(lookup_key):
+      return None
+
+    future = self._in_flight_lookups.get(lookup_key, None)
+    if not future or future.get_loop() is not event_loop:
+      future = event_loop.run_in_executor(
+          self._GetLookupExecutor(), self.GetMessageString,
+          provider_identifier, log_source, message_identifier, event_version)
+      self._TrackInFlightLookup(lookup_key, future)
+
+    # Shield the shared lookup so that cancelling one caller does not cancel
+    # the lookup for the other callers.
+    return await asyncio.shield(future)
+
+  async def AsyncGetMessageStrings(self, lookups):
+    """Retrieves Windows EventLog message strings asynchronously.
+
+    Cached lookups are answered without leaving the event loop. The other
+    lookups, except for those that share a pending lookup, are resolved
+    together in a single call of GetMessageStrings in the thread pool.
+
+    Args:
+      lookups (list[tuple[str, str, int, int]]): EventLog provider identifier,
+          EventLog source, message identifier and event version of the
+          requested message strings.
+
+    Returns:
+      list[str]: message strings, or None if not available, in the order of
+          the lookups.
+    """
+    event_loop = asyncio.get_running_loop()
+
+    if self._persistent_cache_path:
+      await event_loop.run_in_executor(
+          self._GetLookupExecutor(), self._ReadPersistentCache)
+
+    message_strings = [None] * len(lookups)
+    pending_futures = {}
+    pending_indexes = {}
+    batch_futures = {}
+
+    for index, lookup in enumerate(lookups):
+      lookup = tuple(lookup)
+
+      message_string = self._GetCachedMessageString('event', *lookup)
+      if message_string:
+        message_strings[index] = message_string
+        continue
+
+      lookup_key = ('event', *lookup)
+      if self._unresolved_lookup_cache.GetValue(lookup_key):
+        continue
+
+      if lookup not in pending_futures:
+        future = self._in_flight_lookups.get(lookup_key, None)
+        if not future or future.get_loop() is not event_loop:
+          future = event_loop.create_future()
+          self._TrackInFlightLookup(lookup_key, future)
+          batch_futures[lookup] = future
+
+        pending_futures[lookup] = future
+
+      pending_indexes.setdefault(lookup, []).append(index)
+
+    if batch_futures:
+      batch_future = event_loop.run_in_executor(
+          self._GetLookupExecutor(), self.GetMessageStrings,
+          list(batch_futures))
+
+      def _SetBatchResults(completed_future):
+        exception = completed_future.exception()
+        for future_index, future in enumerate(batch_futures.values()):
+          if future.done():
+            continue
+          if exception:
+            future.set_exception(exception)
+          else:
+            future.set_result(completed_future.result()[future_index])
+
+      batch_future.add_done_callback(_SetBatchResults)
+
+    # Shield the shared lookups so that cancelling one caller does not cancel
+    # the lookups for the other callers.
+    pending_message_strings = await asyncio.gather(*[
+        asyncio.shield(future) for future in pending_futures.values()])
+
+    for lookup, message_string in zip(
+        pending_futures, pending_message_strings):
+      for index in pending_indexes[lookup]:
+        message_strings[index] = message_string
+
+    return message_strings
+
+  def Close(self):
+    """Closes the helper.
+
+    Waits for pending asynchronous lookups, shuts down their threads and
+    closes the persistent cache and the winevt-rc database. Long-lived
+    callers of the asynchronous lookups should close the helper when it is
+    no longer needed, to release the threads and file handles. The storage
+    reader is not closed, since it is owned by the caller.
+
+    After the helper is closed, lookups are only resolved from the storage
+    reader and the message string caches.
+    """
+    with self._lock:
+      lookup_executor = self._lookup_executor
+      self._lookup_executor = None
+
+    # Shut down the executor without holding the lock, since pending lookups
+    # can need the lock.
+    if lookup_executor:
+      lookup_executor.shutdown(wait=True)
+
+    with self._lock:
+      if self._persistent_cache:
+        self._persistent_cache.Close()
+        self._persistent_cache = None
+        self._persistent_cache_path = None
+
+      if self._winevt_database_reader:
+        self._winevt_database_reader.Close()
+        self._winevt_database_reader = None
+
+      # Prevent the winevt-rc database from being opened again.
+      self._winevt_database_reader_opened = True
+
+  def GetFormattedMessage(
+      self, provider_identifier, log_source, message_identifier, event_version,
+      string_values):
+    """Retrieves a specific formatted Windows EventLog message.
+
+    Args:
+      provider_identifier (str): EventLog provider identifier.
+      log_source (str): EventLog source, such as "Application Error".
+      message_identifier (int): message identifier.
+      event_version (int): event version or None if not set.
+      string_values (list[object]): string values of the event, where values
+          that are not a string are converted to one.
+
+    Returns:
+      str: formatted message or None if not available.
+    """
+    message_template = self._GetMessageTemplate(
+        provider_identifier, log_source, message_identifier, event_version)
+    if not message_template:
+      return None
 
-        for log_source in provider.log_sources:
-          log_source = log_source.lower()
-          self._windows_eventlog_providers[log_source] = provider
+    string_values = self._FormatStringValues(
+        provider_identifier, log_source, string_values)
+
+    try:
+      return message_template.Render(string_values)
+
+    except (IndexError, KeyError, TypeError, ValueError) as exception:
+      provider = provider_identifier or log_source or ''
+      strings = ', '.join([
+          f'{string_value!s}' for string_value in string_values])
+      logger.error((
+          f'Unable to format message: 0x{message_identifier:08x} of provider: '
+          f'{provider:s} template: "{message_template.template:s}" and '
+          f'strings: "{strings:s}" with error: {exception!s}'))
+
+    return None
 
   def GetMessageString(
       self, provider_identifier, log_source, message_identifier, event_version):
@@ -1183,24 +4537,80 @@ class WinevtResourcesHelper(object):
     Returns:
       str: message string or None if not available.
     """
+    if self._persistent_cache_path:
+      self._ReadPersistentCache()
+
     message_string = self._GetCachedMessageString(
-        provider_identifier, log_source, message_identifier, event_version)
+        'event', provider_identifier, log_source, message_identifier,
+        event_version)
     if not message_string:
-      if self._storage_reader:
-        message_string = self._ReadEventMessageString(
-            self._storage_reader, provider_identifier, log_source,
-            message_identifier, event_version)
-      else:
-        message_string = self._GetWinevtRcDatabaseMessageString(
-            provider_identifier, log_source, message_identifier, event_version)
+      lookup_key = (
+          'event', provider_identifier, log_source, message_identifier,
+          event_version)
+      if self._unresolved_lookup_cache.GetValue(lookup_key):
+        return None
+
+      lookup = (
+          provider_identifier, log_source, message_identifier, event_version)
+      message_string = self._ResolveMessageStrings('event', [lookup]).get(
+          lookup, None)
 
       if message_string:
         self._CacheMessageString(
-            provider_identifier, log_source, message_identifier, event_version,
-            message_string)
+            'event', provider_identifier, log_source, message_identifier,
+            event_version, message_string)
+      else:
+        self._unresolved_lookup_cache.CacheValue(lookup_key, True)
 
     return message_string
 
+  def GetMessageStrings(self, lookups):
+    """Retrieves Windows EventLog message strings.
+
+    The message strings that are not cached are resolved in a single bulk
+    lookup per lookup tier.
+
+    Args:
+      lookups (list[tuple[str, str, int, int]]): EventLog provider identifier,
+          EventLog source, message identifier and event version of the
+          requested message strings.
+
+    Returns:
+      list[str]: message strings, or None if not available, in the order of
+          the lookups.
+    """
+    if self._persistent_cache_path:
+      self._ReadPersistentCache()
+
+    message_strings = []
+    unresolved_lookups = {}
+
+    for lookup in lookups:
+      message_string = self._GetCachedMessageString('event', *lookup)
+      if not message_string:
+        lookup_key = ('event', ) + tuple(lookup)
+        if not self._unresolved_lookup_cache.GetValue(lookup_key):
+          unresolved_lookups.setdefault(tuple(lookup), []).append(
+              len(message_strings))
+
+      message_strings.append(message_string)
+
+    if unresolved_lookups:
+      resolved_message_strings = self._ResolveMessageStrings(
+          'event', list(unresolved_lookups))
+
+      for lookup, indexes in unresolved_lookups.items():
+        message_string = resolved_message_strings.get(lookup, None)
+        if message_string:
+          self._CacheMessageString('event', *lookup, message_string)
+          for index in indexes:
+            message_strings[index] = message_string
+        else:
+          self._unresolved_lookup_cache.CacheValue(
+              ('event', ) + lookup, True)
+
+    return message_strings
+
   def GetParameterString(
       self, provider_identifier, log_source, message_identifier):
     """Retrieves a specific Windows EventLog parameter string.
@@ -1213,18 +4623,629 @@ class WinevtResourcesHelper(object):
     Returns:
       str: parameter string or None if not available.
     """
+    if self._persistent_cache_path:
+      self._ReadPersistentCache()
+
     message_string = self._GetCachedMessageString(
-        provider_identifier, log_source, message_identifier, None)
+        'parameter', provider_identifier, log_source, message_identifier, None)
     if not message_string:
-      # FIX: PR #5023 - check self._storage_reader before calling _ReadParameterMessageString
-      if self._storage_reader:
-        message_string = self._ReadParameterMessageString(
-            self._storage_reader, provider_identifier, log_source,
-            message_identifier)
+      message_string = self.GetParameterStrings([
+          (provider_identifier, log_source, message_identifier)])[0]
+
+    return message_string
+
+  def GetParameterStrings(self, lookups):
+    """Retrieves Windows EventLog parameter strings.
+
+    The parameter strings that are not cached are resolved in a single bulk
+    lookup per lookup tier, which reads the message strings of all the
+    parameters in the lookups at once.
+
+    Args:
+      lookups (list[tuple[str, str, int]]): EventLog provider identifier,
+          EventLog source and parameter identifier of the requested parameter
+          strings.
+
+    Returns:
+      list[str]: parameter strings, or None if not available, in the order of
+          the lookups.
+    """
+    if self._persistent_cache_path:
+      self._ReadPersistentCache()
+
+    parameter_strings = []
+    unresolved_lookups = {}
+
+    for lookup in lookups:
+      provider_identifier, log_source, message_identifier = lookup
+
+      message_string = self._GetCachedMessageString(
+          'parameter', provider_identifier, log_source, message_identifier,
+          None)
+      if not message_string:
+        lookup_key = ('parameter', ) + tuple(lookup)
+        if not self._unresolved_lookup_cache.GetValue(lookup_key):
+          unresolved_lookups.setdefault(tuple(lookup), []).append(
+              len(parameter_strings))
+
+      parameter_strings.append(message_string)
+
+    if unresolved_lookups:
+      message_strings = self._ResolveMessageStrings(
+          'parameter', list(unresolved_lookups))
+
+      for lookup, indexes in unresolved_lookups.items():
+        provider_identifier, log_source, message_identifier = lookup
+
+        message_string = message_strings.get(lookup, None)
+        if message_string:
+          self._CacheMessageString(
+              'parameter', provider_identifier, log_source, message_identifier,
+              None, message_string)
+          for index in indexes:
+            parameter_strings[index] = message_string
+        else:
+          self._unresolved_lookup_cache.CacheValue(
+              ('parameter', ) + lookup, True)
+
+    return parameter_strings
+
+  def GetStatistics(self):
+    """Retrieves a snapshot of the lookup statistics.
+
+    The lookup phases are only available when statistics are collected. The
+    phases are:
+
+    * lookup: message string lookups, which include the other phases;
+    * parameter_lookup: parameter string lookups;
+    * cache_lookup: message and parameter string cache lookups;
+    * provider_resolution: Windows EventLog provider lookups;
+    * template_mapping: WEVT_TEMPLATE event definition lookups;
+    * message_file_resolution: message file identifier lookups;
+    * string_fetch: message string queries;
+    * format_conversion: conversions of message strings into PEP 3101 format;
+    * formatted_lookup: formatted message lookups, which include the lookup
+      of the message string;
+    * parameter_expansion: expansions of parameter string references in
+      string values;
+    * tier_resolution: lookups in the storage reader and winevt-rc database
+      lookup tiers.
+
+    Returns:
+      dict[str, object]: lookup statistics, which contain the statistics per
+          lookup phase and the cache statistics.
+    """
+    phases = {}
+    if self._statistics:
+      phases = self._statistics.GetPhases()
+
+    return {
+        'collect_statistics': bool(self._statistics),
+        'lookup_tier_cache': self._lookup_tier_cache.GetStatistics(),
+        'message_string_cache': self._message_string_cache.GetStatistics(),
+        'message_template_cache': (
+            self._message_template_cache.GetStatistics()),
+        'parameter_message_string_index': (
+            self._parameter_message_string_index.GetStatistics()),
+        'phases': phases,
+        'string_value_cache': self._string_value_cache.GetStatistics(),
+        'unresolved_lookup_cache': (
+            self._unresolved_lookup_cache.GetStatistics())}
+
+  def WarmUpMessageStringCache(self, lookups):
+    """Warms up the message string cache.
+
+    The lookups are resolved in a single pass per lookup tier, where lookups
+    in a winevt-rc SQLite database are batched per EventLog provider and
+    message table.
+
+    Args:
+      lookups (list[tuple[str, str, int, int]]): EventLog provider identifier,
+          EventLog source, message identifier and event version of the
+          message strings to look up.
+
+    Returns:
+      int: number of message strings that were resolved.
+    """
+    start_time = time.perf_counter()
 
+    if self._persistent_cache_path:
+      self._ReadPersistentCache()
+
+    lookups = [
+        tuple(lookup) for lookup in lookups
+        if not self._GetCachedMessageString('event', *lookup)]
+
+    message_strings = self._ResolveMessageStrings('event', lookups)
+
+    number_of_resolved = 0
+    for lookup in lookups:
+      message_string = message_strings.get(lookup, None)
       if message_string:
-        self._CacheMessageString(
-            provider_identifier, log_source, message_identifier,
-            None, message_string)
+        self._CacheMessageString('event', *lookup, message_string)
+        number_of_resolved += 1
+      else:
+        self._unresolved_lookup_cache.CacheValue(('event', *lookup), True)
+
+    elapsed_time = time.perf_counter() - start_time
+    logger.debug((
+        f'Warmed up message string cache with {number_of_resolved:d} of '
+        f'{len(lookups):d} message strings in {elapsed_time:.3f} seconds.'))
+
+    return number_of_resolved
+
+
+# Lookups, as table and column names, that are done on the winevt-rc
+# database. A column name can be followed by the collation of the lookup,
+# which the index of the column needs to match. The columns of the message
+# tables of the SQLite format are looked up as well, since their names are
+# not known in advance. The lookup of the WEVT_TEMPLATE event definitions
+# applies to a storage file with Windows EventLog artifacts, which is an
+# attribute container store as well.
+_WINEVT_RC_DATABASE_LOOKUPS = (
+    ('event_log_providers', ('log_source COLLATE NOCASE', )),
+    ('message_file_per_event_log_provider', ('event_log_provider_key', )),
+    ('windows_wevt_template_event', ('provider_identifier', )),
+    ('winevtrc_eventlog_provider', ('identifier', )),
+    ('winevtrc_message_string', (
+        '_message_table_identifier', 'message_identifier')),
+    ('winevtrc_message_string_mapping', ('provider_identifier', )),
+    ('winevtrc_message_table', ('_message_file_identifier', )),
+    ('winevtrc_message_table', ('language_identifier', )))
+
+
+def _GetDatabaseLookups(connection):
+  """Retrieves the lookups that apply to a specific winevt-rc database.
+
+  Args:
+    connection (sqlite3.Connection): connection to the database.
+
+  Returns:
+    list[tuple[str, tuple[str]]]: table and column names of the lookups.
+  """
+  cursor = connection.execute(
+      'SELECT name FROM sqlite_master WHERE type = "table"')
+  table_names = frozenset(row[0] for row in cursor)
 
-    return message_string
+  lookups = [
+      (table_name, column_names)
+      for table_name, column_names in _WINEVT_RC_DATABASE_LOOKUPS
+      if table_name in table_names]
+
+  for table_name in sorted(table_names):
+    if WinevtResourcesSqlite3DatabaseReader.IsMessageTableName(table_name):
+      lookups.append((table_name, ('message_identifier', )))
+
+  return lookups
+
+
+def _GetLookupQueryPlan(connection, table_name, column_names):
+  """Retrieves the query plan of a specific lookup.
+
+  Args:
+    connection (sqlite3.Connection): connection to the database.
+    table_name (str): name of the table.
+    column_names (tuple[str]): names of the columns.
+
+  Returns:
+    str: query plan or None if the lookup is not supported by the table.
+  """
+  conditions = ' AND '.join([
+      f'{column_name:s} = ?' for column_name in column_names])
+  sql_query = (
+      f'EXPLAIN QUERY PLAN SELECT * FROM {table_name:s} WHERE {conditions:s}')
+  try:
+    cursor = connection.execute(sql_query, (None, ) * len(column_names))
+  except sqlite3.OperationalError:
+    return None
+
+  return '; '.join(row[-1] for row in cursor)
+
+
+def _AddAttributeContainerStoreLookupValues(writer, store, lcids):
+  """Adds the lookup values of a winevt-rc attribute container store.
+
+  The message strings and event definitions are resolved as the helper
+  resolves them from the attribute container store.
+
+  Args:
+    writer (WinevtResourcesLookupFileWriter): lookup file writer.
+    store (WinevtResourcesAttributeContainerStore): attribute container store.
+    lcids (list[int]): language code identifiers (LCIDs) of the message
+        strings.
+
+  Returns:
+    int: number of message strings added.
+  """
+  providers = []
+  if store.HasAttributeContainers('winevtrc_eventlog_provider'):
+    providers = list(store.GetAttributeContainers(
+        'winevtrc_eventlog_provider'))
+
+  for provider_number, provider in enumerate(providers):
+    # The last provider of an identifier or EventLog source is used, as for
+    # lookups in the attribute container store.
+    if provider.identifier and _IsSupportedFilterValue(provider.identifier):
+      writer.AddProviderIdentifier(provider.identifier, provider_number)
+
+    for log_source in provider.log_sources or []:
+      writer.AddLogSource(log_source, provider_number)
+
+  event_definitions_per_provider = {}
+  if store.HasAttributeContainers('winevtrc_message_string_mapping'):
+    for event_definition in store.GetAttributeContainers(
+        'winevtrc_message_string_mapping'):
+      event_definitions_per_provider.setdefault(
+          event_definition.provider_identifier, []).append(event_definition)
+
+  message_strings_per_table = _ReadAttributeContainerStoreMessageStrings(
+      store, lcids)
+
+  number_of_message_strings = 0
+  for lcid in lcids:
+    helper = WinevtResourcesHelper(
+        None, None, lcid, index_message_strings=False, preload_database=False,
+        collect_statistics=False, warm_up=False, persistent_cache=False)
+    number_of_message_strings += helper.AddWinevtRcStoreLookupValues(
+        writer, store, providers, message_strings_per_table,
+        event_definitions_per_provider)
+
+  return number_of_message_strings
+
+
+def _AddSqlite3DatabaseLookupValues(writer, database_reader, lcids):
+  """Adds the lookup values of a winevt-rc SQLite database.
+
+  The message strings are resolved as the database reader resolves them,
+  where EventLog sources are case-insensitive.
+
+  Args:
+    writer (WinevtResourcesLookupFileWriter): lookup file writer.
+    database_reader (WinevtResourcesSqlite3DatabaseReader): SQLite database
+        reader.
+    lcids (list[int]): language code identifiers (LCIDs) of the message
+        strings.
+
+  Returns:
+    int: number of message strings added.
+  """
+  for log_source, event_log_provider_key in (
+      database_reader.GetEventLogProviderKeys().items()):
+    if event_log_provider_key:
+      writer.AddLogSource(log_source, event_log_provider_key)
+
+  message_file_keys_per_provider = database_reader.GetMessageFileKeys()
+
+  number_of_message_strings = 0
+  for lcid in lcids:
+    message_strings_per_file = {}
+    for event_log_provider_key, message_file_keys in (
+        message_file_keys_per_provider.items()):
+      if not event_log_provider_key:
+        continue
+
+      message_strings = _GetSqlite3DatabaseMessageStrings(
+          database_reader, message_file_keys, lcid, message_strings_per_file)
+
+      for message_identifier, message_string in message_strings.items():
+        if writer.AddMessageString(
+            event_log_provider_key, message_identifier, lcid, message_string):
+          number_of_message_strings += 1
+
+  return number_of_message_strings
+
+
+def _GetSqlite3DatabaseMessageStrings(
+    database_reader, message_file_keys, lcid, message_strings_per_file):
+  """Retrieves the message strings of specific message files.
+
+  Args:
+    database_reader (WinevtResourcesSqlite3DatabaseReader): SQLite database
+        reader.
+    message_file_keys (tuple[int]): message file keys.
+    lcid (int): language code identifier (LCID).
+    message_strings_per_file (dict[int, dict[int, str]]): message string per
+        message identifier per message file key of the LCID, which is used
+        to read every message table only once.
+
+  Returns:
+    dict[int, str]: message string per message identifier, where the first
+        message file with a message string is used.
+  """
+  message_strings = {}
+  for message_file_key in message_file_keys:
+    file_message_strings = message_strings_per_file.get(message_file_key, None)
+    if file_message_strings is None:
+      file_message_strings = database_reader.GetMessageTableStrings(
+          message_file_key, lcid)
+      message_strings_per_file[message_file_key] = file_message_strings
+
+    for message_identifier, message_string in file_message_strings.items():
+      message_strings.setdefault(message_identifier, message_string)
+
+  return message_strings
+
+
+def _ReadAttributeContainerStoreMessageStrings(store, lcids):
+  """Reads the message strings of a winevt-rc attribute container store.
+
+  The message strings are read in a single pass, where the first message
+  string of a message table is used, as for lookups in the attribute
+  container store.
+
+  Args:
+    store (WinevtResourcesAttributeContainerStore): attribute container store.
+    lcids (list[int]): language code identifiers (LCIDs) of the message
+        strings.
+
+  Returns:
+    dict[str, dict[int, str]]: message string per message identifier per
+        message table identifier of the LCIDs.
+  """
+  message_strings_per_table = {}
+  if store.HasAttributeContainers('winevtrc_message_table'):
+    for message_table in store.GetAttributeContainers(
+        'winevtrc_message_table'):
+      if message_table.language_identifier in lcids:
+        identifier = message_table.GetIdentifier()
+        message_strings_per_table[identifier.CopyToString()] = {}
+
+  if message_strings_per_table:
+    for message_string in store.GetAttributeContainers(
+        'winevtrc_message_string'):
+      identifier = message_string.GetMessageTableIdentifier()
+      message_strings = message_strings_per_table.get(
+          identifier.CopyToString(), None)
+      if message_strings is not None:
+        message_strings.setdefault(
+            message_string.message_identifier, message_string.text)
+
+  return message_strings_per_table
+
+
+def GetIndexedDatabasePath(path):
+  """Retrieves the path of the index-augmented copy of a winevt-rc database.
+
+  Args:
+    path (str): path of the winevt-rc database, such as "winevt-rc.db".
+
+  Returns:
+    str: path of the index-augmented copy, such as "winevt-rc.indexed.db".
+  """
+  path, extension = os.path.splitext(path)
+  return f'{path:s}.indexed{extension:s}'
+
+
+def GetLookupFilePath(path):
+  """Retrieves the path of the lookup file compiled from a winevt-rc database.
+
+  Args:
+    path (str): path of the winevt-rc database, such as "winevt-rc.db".
+
+  Returns:
+    str: path of the lookup file, such as "winevt-rc.lookup".
+  """
+  path, _ = os.path.splitext(path)
+  return f'{path:s}.lookup'
+
+
+def AuditDatabaseIndexes(path):
+  """Determines which lookups on a winevt-rc database are full table scans.
+
+  Both the SQLite and the attribute container store formats of the winevt-rc
+  database are supported. A lookup on multiple columns that uses an index on
+  only part of the columns, scans all the rows of the partial match and is
+  considered a full table scan as well.
+
+  Args:
+    path (str): path of the winevt-rc database.
+
+  Returns:
+    list[tuple[str, tuple[str], str]]: table name, column names and query
+        plan of the lookups that require a full table scan.
+
+  Raises:
+    sqlite3.DatabaseError: if the database cannot be read.
+  """
+  path_uri = pathlib.Path(os.path.abspath(path)).as_uri()
+  connection = sqlite3.connect(f'{path_uri:s}?mode=ro', uri=True)
+
+  try:
+    full_table_scans = []
+    for table_name, column_names in _GetDatabaseLookups(connection):
+      query_plan = _GetLookupQueryPlan(connection, table_name, column_names)
+      # The query plan refers to the columns without their collation.
+      if query_plan and (query_plan.startswith('SCAN') or not all(
+          f'{column_name.split()[0]:s}=?' in query_plan
+          for column_name in column_names)):
+        full_table_scans.append((table_name, column_names, query_plan))
+
+  finally:
+    connection.close()
+
+  return full_table_scans
+
+
+def CreateIndexedDatabase(path, output_path=None):
+  """Creates an index-augmented copy of a winevt-rc database.
+
+  The copy contains an index for every lookup that would otherwise require
+  a full table scan. WinevtResourcesHelper opens the copy in preference to
+  the original when it is stored next to the original.
+
+  Args:
+    path (str): path of the winevt-rc database.
+    output_path (Optional[str]): path of the copy, where None represents the
+        path returned by GetIndexedDatabasePath.
+
+  Returns:
+    int: number of indexes created.
+
+  Raises:
+    IOError: if the output path already exists.
+    OSError: if the output path already exists.
+    sqlite3.DatabaseError: if the database cannot be read or written.
+  """
+  full_table_scans = AuditDatabaseIndexes(path)
+
+  output_path = output_path or GetIndexedDatabasePath(path)
+  if os.path.exists(output_path):
+    raise IOError(f'Output path: {output_path:s} already exists.')
+
+  path_uri = pathlib.Path(os.path.abspath(path)).as_uri()
+  connection = sqlite3.connect(f'{path_uri:s}?mode=ro', uri=True)
+  output_connection = sqlite3.connect(output_path)
+
+  try:
+    connection.backup(output_connection)
+
+    for table_name, column_names, _ in full_table_scans:
+      index_name = '_'.join([
+          table_name, *[
+              column_name.split()[0].lstrip('_')
+              for column_name in column_names], 'index'])
+      output_connection.execute((
+          f'CREATE INDEX {index_name:s} ON {table_name:s} '
+          f'({", ".join(column_names):s})'))
+
+    # Update the statistics used by the query planner.
+    output_connection.execute('ANALYZE')
+    output_connection.commit()
+
+  finally:
+    output_connection.close()
+    connection.close()
+
+  return len(full_table_scans)
+
+
+def CreateLookupFile(path, lcids, output_path=None):
+  """Compiles a lookup file from a winevt-rc database.
+
+  Both the SQLite and the attribute container store formats of the winevt-rc
+  database are supported. WinevtResourcesHelper opens the lookup file in
+  preference to the database when it is stored next to the database and
+  contains the message strings of the LCID of the helper.
+
+  Args:
+    path (str): path of the winevt-rc database.
+    lcids (list[int]): language code identifiers (LCIDs) of the message
+        strings to compile.
+    output_path (Optional[str]): path of the lookup file, where None
+        represents the path returned by GetLookupFilePath.
+
+  Returns:
+    int: number of message strings in the lookup file.
+
+  Raises:
+    IOError: if the output path already exists or the database cannot be
+        read.
+    OSError: if the output path already exists or the database cannot be
+        read.
+    sqlite3.DatabaseError: if the database cannot be read.
+  """
+  output_path = output_path or GetLookupFilePath(path)
+  if os.path.exists(output_path):
+    raise IOError(f'Output path: {output_path:s} already exists.')
+
+  writer = WinevtResourcesLookupFileWriter()
+
+  database_reader = WinevtResourcesSqlite3DatabaseReader(preload=True)
+  try:
+    result = database_reader.Open(path)
+  except (RuntimeError, sqlite3.OperationalError):
+    result = False
+
+  if result:
+    try:
+      number_of_message_strings = _AddSqlite3DatabaseLookupValues(
+          writer, database_reader, lcids)
+    finally:
+      database_reader.Close()
+
+  else:
+    store = WinevtResourcesAttributeContainerStore()
+    store.Open(path=path, read_only=True)  # pylint: disable=no-value-for-parameter,unexpected-keyword-arg
+    try:
+      number_of_message_strings = _AddAttributeContainerStoreLookupValues(
+          writer, store, lcids)
+    finally:
+      store.Close()
+
+  writer.Write(output_path, lcids)
+
+  return number_of_message_strings
+
+
+def Main():
+  """Audits, indexes or compiles a lookup file of a winevt-rc database.
+
+  Returns:
+    int: exit code that is provided to sys.exit().
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Audits the indexes of a winevt-rc database, creates a copy with '
+      'indexes for every lookup that would otherwise scan a full table or '
+      'compiles a memory mapped lookup file.'))
+
+  argument_parser.add_argument(
+      'action', choices=['audit', 'compile', 'index'],
+      help='action to perform.')
+
+  argument_parser.add_argument(
+      'source', action='store', metavar='PATH', help=(
+          'path of the winevt-rc database.'))
+
+  argument_parser.add_argument(
+      'output', action='store', metavar='OUTPUT', nargs='?', default=None,
+      help=(
+          'path of the index-augmented copy or lookup file, by default the '
+          'path of the database with ".indexed" added before the extension '
+          'or with the extension replaced by ".lookup".'))
+
+  argument_parser.add_argument(
+      '--lcids', dest='lcids', action='store', default='0x0409', help=(
+          'comma separated language code identifiers (LCIDs) of the message '
+          'strings to compile into the lookup file.'))
+
+  options = argument_parser.parse_args()
+
+  try:
+    if options.action == 'audit':
+      full_table_scans = AuditDatabaseIndexes(options.source)
+      for table_name, column_names, query_plan in full_table_scans:
+        print(f'{table_name:s}.{",".join(column_names):s}: {query_plan:s}')
+
+      print(f'Number of lookups that are full table scans: '
+            f'{len(full_table_scans):d}')
+      return 1 if full_table_scans else 0
+
+    if options.action == 'compile':
+      try:
+        lcids = [int(lcid, 0) for lcid in options.lcids.split(',')]
+      except ValueError:
+        print(f'Unsupported LCIDs: {options.lcids:s}')
+        return 1
+
+      output_path = options.output or GetLookupFilePath(options.source)
+      number_of_message_strings = CreateLookupFile(
+          options.source, lcids, output_path=output_path)
+      print(f'Created: {output_path:s} with {number_of_message_strings:d} '
+            f'message strings.')
+      return 0
+
+    output_path = options.output or GetIndexedDatabasePath(options.source)
+    number_of_indexes = CreateIndexedDatabase(
+        options.source, output_path=output_path)
+    print(f'Created: {output_path:s} with {number_of_indexes:d} additional '
+          f'indexes.')
+
+  except (IOError, OSError, sqlite3.DatabaseError) as exception:
+    print(f'Unable to {options.action:s} database with error: {exception!s}')
+    return 1
+
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(Main())
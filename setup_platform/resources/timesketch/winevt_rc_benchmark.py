@@ -0,0 +1,836 @@
+# -*- coding: utf-8 -*-
+"""Synthetic corpus generator and lookup benchmarks for winevt_rc.
+
+Generates synthetic Windows EventLog resources, as a winevt-rc SQLite
+database, a winevt-rc lookup file, a winevt-rc attribute container store or
+a storage reader with Windows EventLog artifacts, and benchmarks the lookups
+of the Windows EventLog resources helper against them. The results are
+written as JSON.
+
+Usage:
+  python3 winevt_rc_benchmark.py --source_type sqlite --providers 500
+"""
+
+import argparse
+import ast
+import json
+import logging
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+from acstore.containers import interface as containers_interface
+
+# Benchmark the winevt_rc module stored next to this script, which is the
+# one that is mounted into the Timesketch worker.
+import winevt_rc
+
+
+class SyntheticAttributeContainer(object):
+  """Synthetic attribute container.
+
+  Attributes:
+    attribute_values (dict[str, object]): values of the attributes that can
+        be used in filter expressions.
+  """
+
+  def __init__(self, container_type, sequence_number, **kwargs):
+    """Initializes a synthetic attribute container.
+
+    Args:
+      container_type (str): attribute container type.
+      sequence_number (int): sequence number of the attribute container.
+      kwargs (dict[str, object]): attribute values.
+    """
+    super(SyntheticAttributeContainer, self).__init__()
+    self._identifier = containers_interface.AttributeContainerIdentifier(
+        name=container_type, sequence_number=sequence_number)
+    self._message_file_identifier = None
+    self.attribute_values = dict(kwargs)
+
+    for name, value in kwargs.items():
+      setattr(self, name, value)
+
+  def GetIdentifier(self):
+    """Retrieves the identifier of the attribute container.
+
+    Returns:
+      AttributeContainerIdentifier: attribute container identifier.
+    """
+    return self._identifier
+
+  def GetMessageFileIdentifier(self):
+    """Retrieves the identifier of the associated message file.
+
+    Returns:
+      AttributeContainerIdentifier: message file identifier or None when not
+          set.
+    """
+    return self._message_file_identifier
+
+  def SetMessageFileIdentifier(self, message_file_identifier):
+    """Sets the identifier of the associated message file.
+
+    Args:
+      message_file_identifier (AttributeContainerIdentifier): message file
+          identifier.
+    """
+    self._message_file_identifier = message_file_identifier
+    self.attribute_values['_message_file_identifier'] = (
+        message_file_identifier.CopyToString())
+
+
+class SyntheticStorageReader(object):
+  """Synthetic storage reader with Windows EventLog artifacts.
+
+  Filter expressions are evaluated against every attribute container of the
+  requested type, like a store without indexes would.
+
+  Attributes:
+    number_of_queries (int): number of attribute container queries.
+  """
+
+  def __init__(self):
+    """Initializes a synthetic storage reader."""
+    super(SyntheticStorageReader, self).__init__()
+    self._attribute_containers = {}
+    self._filter_expressions = {}
+    self.number_of_queries = 0
+
+  def AddAttributeContainer(self, container_type, **kwargs):
+    """Adds an attribute container.
+
+    Args:
+      container_type (str): attribute container type.
+      kwargs (dict[str, object]): attribute values.
+
+    Returns:
+      SyntheticAttributeContainer: attribute container.
+    """
+    attribute_containers = self._attribute_containers.setdefault(
+        container_type, [])
+    container = SyntheticAttributeContainer(
+        container_type, len(attribute_containers) + 1, **kwargs)
+    attribute_containers.append(container)
+    return container
+
+  def GetAttributeContainerByIdentifier(self, container_type, identifier):
+    """Retrieves a specific type of container with a specific identifier.
+
+    Args:
+      container_type (str): container type.
+      identifier (AttributeContainerIdentifier): attribute container identifier.
+
+    Returns:
+      SyntheticAttributeContainer: attribute container or None if not
+          available.
+    """
+    self.number_of_queries += 1
+
+    attribute_containers = self._attribute_containers.get(container_type, [])
+    index = identifier.sequence_number - 1
+    if index < 0 or index >= len(attribute_containers):
+      return None
+
+    return attribute_containers[index]
+
+  def GetAttributeContainers(self, container_type, filter_expression=None):
+    """Retrieves a specific type of attribute containers.
+
+    Args:
+      container_type (str): attribute container type.
+      filter_expression (Optional[str]): expression to filter the resulting
+          attribute containers by.
+
+    Yields:
+      SyntheticAttributeContainer: attribute container.
+    """
+    self.number_of_queries += 1
+
+    compiled_expression = None
+    if filter_expression:
+      compiled_expression = self._filter_expressions.get(
+          filter_expression, None)
+      if not compiled_expression:
+        expression_ast = ast.parse(filter_expression, mode='eval')
+        compiled_expression = compile(expression_ast, '<filter>', 'eval')
+        self._filter_expressions[filter_expression] = compiled_expression
+
+    for container in self._attribute_containers.get(container_type, []):
+      if compiled_expression and not eval(  # pylint: disable=eval-used
+          compiled_expression, {}, container.attribute_values):
+        continue
+
+      yield container
+
+  def HasAttributeContainers(self, container_type):
+    """Determines if a store contains a specific type of attribute container.
+
+    Args:
+      container_type (str): attribute container type.
+
+    Returns:
+      bool: True if the store contains the specified type of attribute
+          containers.
+    """
+    return bool(self._attribute_containers.get(container_type, None))
+
+
+class SyntheticCorpusGenerator(object):
+  """Synthetic Windows EventLog resources corpus generator.
+
+  Every provider has a number of event message files and one parameter
+  message file. The event messages of a provider are spread across its event
+  message files, such that resolving them requires checking multiple message
+  files.
+  """
+
+  _PARAMETER_IDENTIFIER_BASE = 0x1000
+
+  _SYSTEM_ROOT = 'C:\\Windows'
+
+  def __init__(
+      self, number_of_providers=100, number_of_message_files=2,
+      lcids=None, number_of_strings=200):
+    """Initializes a synthetic corpus generator.
+
+    Args:
+      number_of_providers (Optional[int]): number of EventLog providers.
+      number_of_message_files (Optional[int]): number of event message files
+          per provider.
+      lcids (Optional[list[int]]): language code identifiers (LCIDs) of the
+          message tables, where None represents en-US only.
+      number_of_strings (Optional[int]): number of message strings per
+          provider and LCID.
+    """
+    super(SyntheticCorpusGenerator, self).__init__()
+    self.lcids = lcids or [winevt_rc.WinevtResourcesHelper.DEFAULT_LCID]
+    self.number_of_message_files = number_of_message_files
+    self.number_of_providers = number_of_providers
+    self.number_of_strings = number_of_strings
+
+  def _GetMessageFileIndex(self, message_identifier):
+    """Retrieves the index of the message file that defines a message.
+
+    Args:
+      message_identifier (int): message identifier.
+
+    Returns:
+      int: index of the message file.
+    """
+    return message_identifier % self.number_of_message_files
+
+  def _GetMessageString(self, provider_index, message_identifier, lcid):
+    """Retrieves a synthetic message string.
+
+    Args:
+      provider_index (int): index of the provider.
+      message_identifier (int): message identifier.
+      lcid (int): language code identifier (LCID).
+
+    Returns:
+      str: message string in Windows Resource (wrc) format.
+    """
+    return (
+        f'Synthetic provider {provider_index:d} message '
+        f'0x{message_identifier:08x} (LCID 0x{lcid:04x}): %1 with %2.\r\n')
+
+  def _GetParameterString(self, provider_index, parameter_identifier):
+    """Retrieves a synthetic parameter string.
+
+    Args:
+      provider_index (int): index of the provider.
+      parameter_identifier (int): parameter identifier.
+
+    Returns:
+      str: parameter string.
+    """
+    return f'Parameter {parameter_identifier:d} of provider {provider_index:d}'
+
+  def GetEventMessageFilename(self, provider_index, file_index):
+    """Retrieves the filename of an event message file.
+
+    Args:
+      provider_index (int): index of the provider.
+      file_index (int): index of the message file.
+
+    Returns:
+      str: filename.
+    """
+    return f'synthetic{provider_index:d}_{file_index:d}.dll'
+
+  def GetLogSource(self, provider_index):
+    """Retrieves the EventLog source of a provider.
+
+    Args:
+      provider_index (int): index of the provider.
+
+    Returns:
+      str: EventLog source.
+    """
+    return f'Synthetic-Provider-{provider_index:d}'
+
+  def GetMessageIdentifiers(self):
+    """Retrieves the identifiers of the messages defined by every provider.
+
+    Returns:
+      list[int]: message identifiers.
+    """
+    return list(range(1, self.number_of_strings + 1))
+
+  def GetParameterFilename(self, provider_index):
+    """Retrieves the filename of a parameter message file.
+
+    Args:
+      provider_index (int): index of the provider.
+
+    Returns:
+      str: filename.
+    """
+    return f'synthetic{provider_index:d}_parameters.dll'
+
+  def GetParameterIdentifiers(self):
+    """Retrieves the identifiers of the parameters defined by every provider.
+
+    Returns:
+      list[int]: parameter identifiers.
+    """
+    number_of_parameters = max(1, self.number_of_strings // 10)
+    return list(range(
+        self._PARAMETER_IDENTIFIER_BASE,
+        self._PARAMETER_IDENTIFIER_BASE + number_of_parameters))
+
+  def GetProviderIdentifier(self, provider_index):
+    """Retrieves the identifier of a provider.
+
+    Args:
+      provider_index (int): index of the provider.
+
+    Returns:
+      str: provider identifier, which contains a GUID.
+    """
+    return f'{{5e7e1c0d-0000-4000-8000-{provider_index:012x}}}'
+
+  def CreateStorageReader(self):
+    """Creates a synthetic storage reader.
+
+    Returns:
+      SyntheticStorageReader: storage reader with Windows EventLog artifacts.
+    """
+    storage_reader = SyntheticStorageReader()
+    storage_reader.AddAttributeContainer(
+        'environment_variable', case_sensitive=False, name='SystemRoot',
+        value=self._SYSTEM_ROOT)
+
+    message_identifiers = self.GetMessageIdentifiers()
+    parameter_identifiers = self.GetParameterIdentifiers()
+
+    for provider_index in range(self.number_of_providers):
+      provider_identifier = self.GetProviderIdentifier(provider_index)
+
+      event_message_files = []
+      message_file_identifiers = []
+      for file_index in range(self.number_of_message_files):
+        filename = self.GetEventMessageFilename(provider_index, file_index)
+        event_message_files.append(f'%SystemRoot%\\System32\\{filename:s}')
+
+        message_file = storage_reader.AddAttributeContainer(
+            'windows_eventlog_message_file',
+            path=f'{self._SYSTEM_ROOT:s}\\System32\\{filename:s}')
+        message_file_identifiers.append(message_file.GetIdentifier())
+
+      filename = self.GetParameterFilename(provider_index)
+      parameter_file = storage_reader.AddAttributeContainer(
+          'windows_eventlog_message_file',
+          path=f'{self._SYSTEM_ROOT:s}\\System32\\{filename:s}')
+
+      storage_reader.AddAttributeContainer(
+          'windows_eventlog_provider', additional_identifier=None,
+          category_message_files=[], event_message_files=event_message_files,
+          identifier=provider_identifier,
+          log_sources=[self.GetLogSource(provider_index)],
+          log_types=['Application'],
+          parameter_message_files=[f'%SystemRoot%\\System32\\{filename:s}'])
+
+      for message_identifier in message_identifiers:
+        file_index = self._GetMessageFileIndex(message_identifier)
+        for lcid in self.lcids:
+          message_string = storage_reader.AddAttributeContainer(
+              'windows_eventlog_message_string', language_identifier=lcid,
+              message_identifier=message_identifier,
+              string=self._GetMessageString(
+                  provider_index, message_identifier, lcid))
+          message_string.SetMessageFileIdentifier(
+              message_file_identifiers[file_index])
+
+        storage_reader.AddAttributeContainer(
+            'windows_wevt_template_event', identifier=message_identifier,
+            message_identifier=message_identifier,
+            provider_identifier=provider_identifier, version=0)
+
+      for parameter_identifier in parameter_identifiers:
+        for lcid in self.lcids:
+          message_string = storage_reader.AddAttributeContainer(
+              'windows_eventlog_message_string', language_identifier=lcid,
+              message_identifier=parameter_identifier,
+              string=self._GetParameterString(
+                  provider_index, parameter_identifier))
+          message_string.SetMessageFileIdentifier(
+              parameter_file.GetIdentifier())
+
+    return storage_reader
+
+  def WriteAttributeContainerStore(self, path):
+    """Writes a winevt-rc attribute container store.
+
+    Args:
+      path (str): path of the store.
+    """
+    store = winevt_rc.WinevtResourcesAttributeContainerStore()
+    store.Open(path=path, read_only=False)  # pylint: disable=no-value-for-parameter,unexpected-keyword-arg
+
+    try:
+      store._WriteMetadataValue('string_format', 'wrc')  # pylint: disable=protected-access
+
+      message_identifiers = self.GetMessageIdentifiers()
+
+      for provider_index in range(self.number_of_providers):
+        provider_identifier = self.GetProviderIdentifier(provider_index)
+
+        provider = winevt_rc.WinevtResourcesEventLogProvider()
+        provider.identifier = provider_identifier
+        provider.log_sources = [self.GetLogSource(provider_index)]
+        provider.name = self.GetLogSource(provider_index)
+
+        message_table_identifiers = []
+        for file_index in range(self.number_of_message_files):
+          filename = self.GetEventMessageFilename(provider_index, file_index)
+          windows_path = f'%SystemRoot%\\System32\\{filename:s}'
+          provider.event_message_files.add(windows_path)
+
+          message_file = winevt_rc.WinevtResourcesMessageFile(
+              windows_path=windows_path)
+          store.AddAttributeContainer(message_file)
+
+          message_table_identifiers.append({})
+          for lcid in self.lcids:
+            message_table = winevt_rc.WinevtResourcesMessageTable(
+                language_identifier=lcid)
+            message_table.SetMessageFileIdentifier(
+                message_file.GetIdentifier())
+            store.AddAttributeContainer(message_table)
+
+            message_table_identifiers[file_index][lcid] = (
+                message_table.GetIdentifier())
+
+        # The attribute container store does not support sets.
+        provider.event_message_files = sorted(provider.event_message_files)
+        provider.parameter_message_files = []
+        store.AddAttributeContainer(provider)
+
+        for message_identifier in message_identifiers:
+          file_index = self._GetMessageFileIndex(message_identifier)
+          for lcid in self.lcids:
+            message_string = winevt_rc.WinevtResourcesMessageString(
+                message_identifier=message_identifier,
+                text=self._GetMessageString(
+                    provider_index, message_identifier, lcid))
+            message_string.SetMessageTableIdentifier(
+                message_table_identifiers[file_index][lcid])
+            store.AddAttributeContainer(message_string)
+
+          mapping = winevt_rc.WinevtResourcesMessageStringMapping(
+              event_identifier=message_identifier, event_version=0,
+              message_identifier=message_identifier,
+              provider_identifier=provider_identifier)
+          store.AddAttributeContainer(mapping)
+
+    finally:
+      store.Close()
+
+  def WriteSqlite3Database(self, path):
+    """Writes a winevt-rc SQLite database.
+
+    Args:
+      path (str): path of the database.
+    """
+    connection = sqlite3.connect(path)
+
+    try:
+      connection.execute('CREATE TABLE metadata (name TEXT, value TEXT)')
+      connection.executemany('INSERT INTO metadata VALUES (?, ?)', [
+          ('version', '20150315'), ('string_format', 'wrc')])
+
+      connection.execute((
+          'CREATE TABLE event_log_providers (event_log_provider_key INTEGER '
+          'PRIMARY KEY, log_source TEXT, log_type TEXT, provider_guid TEXT)'))
+      connection.execute((
+          'CREATE TABLE message_files (message_file_key INTEGER PRIMARY KEY, '
+          'message_filename TEXT, message_file_path TEXT)'))
+      connection.execute((
+          'CREATE TABLE message_file_per_event_log_provider ('
+          'message_file_key INTEGER, event_log_provider_key INTEGER)'))
+
+      message_identifiers = self.GetMessageIdentifiers()
+      message_file_key = 0
+
+      for provider_index in range(self.number_of_providers):
+        event_log_provider_key = provider_index + 1
+        connection.execute(
+            'INSERT INTO event_log_providers VALUES (?, ?, ?, ?)', (
+                event_log_provider_key, self.GetLogSource(provider_index),
+                'Application', self.GetProviderIdentifier(provider_index)))
+
+        for file_index in range(self.number_of_message_files):
+          message_file_key += 1
+          filename = self.GetEventMessageFilename(provider_index, file_index)
+          connection.execute('INSERT INTO message_files VALUES (?, ?, ?)', (
+              message_file_key, filename,
+              f'%SystemRoot%\\System32\\{filename:s}'))
+          connection.execute(
+              'INSERT INTO message_file_per_event_log_provider VALUES (?, ?)',
+              (message_file_key, event_log_provider_key))
+
+          for lcid in self.lcids:
+            table_name = f'message_table_{message_file_key:d}_0x{lcid:08x}'
+            connection.execute((
+                f'CREATE TABLE {table_name:s} (message_identifier TEXT, '
+                f'message_string TEXT)'))
+            connection.executemany(
+                f'INSERT INTO {table_name:s} VALUES (?, ?)', [
+                    (f'0x{message_identifier:08x}', self._GetMessageString(
+                        provider_index, message_identifier, lcid))
+                    for message_identifier in message_identifiers
+                    if self._GetMessageFileIndex(
+                        message_identifier) == file_index])
+
+      connection.commit()
+
+    finally:
+      connection.close()
+
+
+class LookupBenchmark(object):
+  """Windows EventLog resources helper lookup benchmark."""
+
+  # Identifier of messages that are not defined by any provider.
+  _UNDEFINED_MESSAGE_IDENTIFIER_BASE = 0x7fff0000
+
+  def __init__(
+      self, corpus_generator, source_type, number_of_lookups=10000,
+      zipf_exponent=1.1, seed=0, collect_statistics=False):
+    """Initializes a lookup benchmark.
+
+    Args:
+      corpus_generator (SyntheticCorpusGenerator): corpus generator.
+      source_type (str): type of the source of the Windows EventLog
+          resources, either "sqlite", "lookup_file", "acstore" or "storage".
+      number_of_lookups (Optional[int]): maximum number of lookups per
+          scenario.
+      zipf_exponent (Optional[float]): exponent of the Zipf distribution of
+          the event identifier stream.
+      seed (Optional[int]): seed of the random number generator.
+      collect_statistics (Optional[bool]): True if the helper should collect
+          statistics per lookup phase.
+    """
+    super(LookupBenchmark, self).__init__()
+    self._collect_statistics = collect_statistics
+    self._corpus_generator = corpus_generator
+    self._data_location = None
+    self._random = random.Random(seed)
+    self._source_type = source_type
+    self._storage_reader = None
+    self.number_of_lookups = number_of_lookups
+    self.zipf_exponent = zipf_exponent
+
+  def _CreateHelper(self):
+    """Creates a Windows EventLog resources helper with empty caches.
+
+    Returns:
+      WinevtResourcesHelper: Windows EventLog resources helper.
+    """
+    return winevt_rc.WinevtResourcesHelper(
+        self._storage_reader, self._data_location,
+        winevt_rc.WinevtResourcesHelper.DEFAULT_LCID,
+        collect_statistics=self._collect_statistics)
+
+  def _GetLookups(self):
+    """Retrieves the lookups of every message of every provider.
+
+    Returns:
+      list[tuple[str, str, int, int]]: provider identifier, EventLog source,
+          message identifier and event version.
+    """
+    lookups = []
+    for provider_index in range(self._corpus_generator.number_of_providers):
+      provider_identifier = self._corpus_generator.GetProviderIdentifier(
+          provider_index)
+      log_source = self._corpus_generator.GetLogSource(provider_index)
+      for message_identifier in self._corpus_generator.GetMessageIdentifiers():
+        lookups.append((provider_identifier, log_source, message_identifier, 0))
+
+    self._random.shuffle(lookups)
+    return lookups[:self.number_of_lookups]
+
+  def _GetZipfLookups(self):
+    """Retrieves a Zipf-distributed stream of lookups.
+
+    Returns:
+      list[tuple[str, str, int, int]]: provider identifier, EventLog source,
+          message identifier and event version.
+    """
+    lookups = self._GetLookups()
+    weights = [
+        1.0 / (rank ** self.zipf_exponent)
+        for rank in range(1, len(lookups) + 1)]
+    return self._random.choices(
+        lookups, weights=weights, k=self.number_of_lookups)
+
+  def _MeasureLookups(self, helper, method_name, lookups):
+    """Measures the latency of lookups.
+
+    Args:
+      helper (WinevtResourcesHelper): Windows EventLog resources helper.
+      method_name (str): name of the lookup method of the helper.
+      lookups (list[tuple]): arguments of the lookups.
+
+    Returns:
+      dict[str, object]: latency and throughput statistics, and the lookup
+          statistics of the helper after the lookups.
+    """
+    lookup_function = getattr(helper, method_name)
+    latencies = []
+    number_of_resolved = 0
+
+    start_time = time.perf_counter()
+    for lookup in lookups:
+      lookup_start_time = time.perf_counter_ns()
+      result = lookup_function(*lookup)
+      latencies.append(time.perf_counter_ns() - lookup_start_time)
+      if result:
+        number_of_resolved += 1
+
+    elapsed_time = time.perf_counter() - start_time
+
+    latencies.sort()
+    number_of_latencies = len(latencies)
+
+    def _GetPercentile(percentile):
+      if not number_of_latencies:
+        return 0.0
+      index = min(
+          number_of_latencies - 1, int(number_of_latencies * percentile / 100))
+      return latencies[index] / 1000.0
+
+    return {
+        'number_of_lookups': number_of_latencies,
+        'number_of_resolved': number_of_resolved,
+        'p50_us': _GetPercentile(50),
+        'p99_us': _GetPercentile(99),
+        'statistics': helper.GetStatistics(),
+        'throughput_per_second': (
+            number_of_latencies / elapsed_time if elapsed_time else 0.0)}
+
+  def _PrepareSource(self, directory):
+    """Generates the source of the Windows EventLog resources.
+
+    Args:
+      directory (str): directory to store generated databases in.
+    """
+    if self._source_type == 'storage':
+      self._storage_reader = self._corpus_generator.CreateStorageReader()
+      return
+
+    self._data_location = directory
+    path = os.path.join(directory, 'winevt-rc.db')
+    if self._source_type == 'acstore':
+      self._corpus_generator.WriteAttributeContainerStore(path)
+    else:
+      self._corpus_generator.WriteSqlite3Database(path)
+
+    if self._source_type == 'lookup_file':
+      winevt_rc.CreateLookupFile(path, self._corpus_generator.lcids)
+
+  def Run(self):
+    """Runs the benchmark scenarios.
+
+    Returns:
+      dict[str, object]: results of the benchmark scenarios.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+      start_time = time.perf_counter()
+      self._PrepareSource(directory)
+      generation_time = time.perf_counter() - start_time
+
+      lookups = self._GetLookups()
+      undefined_lookups = [
+          (provider_identifier, log_source,
+           self._UNDEFINED_MESSAGE_IDENTIFIER_BASE + index, 0)
+          for index, (provider_identifier, log_source, _, _) in enumerate(
+              lookups)]
+
+      results = {
+          'configuration': {
+              'lcids': self._corpus_generator.lcids,
+              'number_of_lookups': self.number_of_lookups,
+              'number_of_message_files': (
+                  self._corpus_generator.number_of_message_files),
+              'number_of_providers': self._corpus_generator.number_of_providers,
+              'number_of_strings': self._corpus_generator.number_of_strings,
+              'source_type': self._source_type,
+              'zipf_exponent': self.zipf_exponent},
+          'generation_time_seconds': generation_time,
+          'scenarios': {}}
+
+      helper = self._CreateHelper()
+      results['scenarios']['cold_miss'] = self._MeasureLookups(
+          helper, 'GetMessageString', lookups)
+      results['scenarios']['warm_hit'] = self._MeasureLookups(
+          helper, 'GetMessageString', lookups)
+
+      # Parameter string references are only resolved from a storage reader.
+      string_values = ['value', 'value']
+      if self._source_type == 'storage':
+        parameter_identifier = (
+            self._corpus_generator.GetParameterIdentifiers()[0])
+        string_values[1] = f'%%{parameter_identifier:d}'
+
+      formatted_lookups = [
+          lookup + (string_values, ) for lookup in lookups]
+      results['scenarios']['formatted_warm_hit'] = self._MeasureLookups(
+          helper, 'GetFormattedMessage', formatted_lookups)
+
+      helper = self._CreateHelper()
+      results['scenarios']['negative_cold'] = self._MeasureLookups(
+          helper, 'GetMessageString', undefined_lookups)
+      results['scenarios']['negative_warm'] = self._MeasureLookups(
+          helper, 'GetMessageString', undefined_lookups)
+
+      helper = self._CreateHelper()
+      results['scenarios']['zipf_stream'] = self._MeasureLookups(
+          helper, 'GetMessageString', self._GetZipfLookups())
+
+      # Parameter strings are only resolved from a storage reader.
+      if self._source_type == 'storage':
+        parameter_lookups = [
+            (provider_identifier, log_source, parameter_identifier)
+            for provider_identifier, log_source, _, _ in lookups
+            for parameter_identifier in (
+                self._corpus_generator.GetParameterIdentifiers()[:1])]
+
+        helper = self._CreateHelper()
+        results['scenarios']['parameter_cold_miss'] = self._MeasureLookups(
+            helper, 'GetParameterString', parameter_lookups)
+        results['scenarios']['parameter_warm_hit'] = self._MeasureLookups(
+            helper, 'GetParameterString', parameter_lookups)
+
+        results['number_of_storage_queries'] = (
+            self._storage_reader.number_of_queries)
+
+    return results
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    int: exit code that is provided to sys.exit().
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Benchmarks Windows EventLog resources helper lookups against a '
+      'synthetic corpus.'))
+
+  argument_parser.add_argument(
+      '--source_type', '--source-type', dest='source_type', action='store',
+      choices=['acstore', 'lookup_file', 'sqlite', 'storage'],
+      default='sqlite', help=(
+          'type of the source of the Windows EventLog resources: a winevt-rc '
+          'SQLite database, a winevt-rc lookup file compiled from a SQLite '
+          'database, a winevt-rc attribute container store or a storage '
+          'reader.'))
+
+  argument_parser.add_argument(
+      '--providers', dest='providers', type=int, action='store', default=100,
+      help='number of EventLog providers.')
+
+  argument_parser.add_argument(
+      '--message_files', '--message-files', dest='message_files', type=int,
+      action='store', default=2,
+      help='number of event message files per provider.')
+
+  argument_parser.add_argument(
+      '--lcids', dest='lcids', action='store', default='0x0409', help=(
+          'comma separated language code identifiers (LCIDs) of the message '
+          'tables.'))
+
+  argument_parser.add_argument(
+      '--strings', dest='strings', type=int, action='store', default=200,
+      help='number of message strings per provider and LCID.')
+
+  argument_parser.add_argument(
+      '--lookups', dest='lookups', type=int, action='store', default=10000,
+      help='maximum number of lookups per scenario.')
+
+  argument_parser.add_argument(
+      '--zipf_exponent', '--zipf-exponent', dest='zipf_exponent', type=float,
+      action='store', default=1.1,
+      help='exponent of the Zipf distribution of the event identifier stream.')
+
+  argument_parser.add_argument(
+      '--seed', dest='seed', type=int, action='store', default=0,
+      help='seed of the random number generator.')
+
+  argument_parser.add_argument(
+      '--collect_statistics', '--collect-statistics',
+      dest='collect_statistics', action='store_true', default=False,
+      help='collect statistics per lookup phase.')
+
+  argument_parser.add_argument(
+      '--debug', dest='debug', action='store_true', default=False, help=(
+          'enable logging, which is disabled by default since it affects the '
+          'latency of failed lookups.'))
+
+  argument_parser.add_argument(
+      '--output', dest='output', action='store', default=None, help=(
+          'path of the JSON results file, by default the results are written '
+          'to stdout.'))
+
+  options = argument_parser.parse_args()
+
+  logging.basicConfig(
+      level=logging.DEBUG if options.debug else logging.CRITICAL,
+      format='[%(levelname)s] %(message)s')
+
+  try:
+    lcids = [int(lcid, 0) for lcid in options.lcids.split(',')]
+  except ValueError:
+    print(f'Unsupported LCIDs: {options.lcids:s}')
+    return 1
+
+  corpus_generator = SyntheticCorpusGenerator(
+      number_of_providers=options.providers,
+      number_of_message_files=options.message_files, lcids=lcids,
+      number_of_strings=options.strings)
+
+  benchmark = LookupBenchmark(
+      corpus_generator, options.source_type,
+      number_of_lookups=options.lookups, zipf_exponent=options.zipf_exponent,
+      seed=options.seed, collect_statistics=options.collect_statistics)
+
+  results = benchmark.Run()
+  output = json.dumps(results, indent=2, sort_keys=True)
+
+  if options.output:
+    with open(options.output, 'w', encoding='utf-8') as file_object:
+      file_object.write(output)
+  else:
+    print(output)
+
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(Main())
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""Tests that the winevt_rc lookup tiers resolve the same message strings.
+
+The lookup tiers are compared on a synthetic corpus of the benchmark, such
+that a different tier, or a performance option such as preloading, never
+changes what a lookup resolves to.
+
+Usage:
+  python3 -m pytest winevt_rc_test.py
+"""
+
+import os
+
+import pytest
+
+import winevt_rc
+import winevt_rc_benchmark
+
+
+# Identifier of a message that is not defined by any provider.
+_UNDEFINED_MESSAGE_IDENTIFIER = 0x7fff0000
+
+
+def _CreateHelper(data_location, lcid, preload_database=False):
+  """Creates a Windows EventLog resources helper without a storage reader.
+
+  Args:
+    data_location (str): data location of the winevt-rc database.
+    lcid (int): language code identifier (LCID).
+    preload_database (Optional[bool]): True if the EventLog providers of the
+        winevt-rc database should be loaded into memory.
+
+  Returns:
+    WinevtResourcesHelper: Windows EventLog resources helper.
+  """
+  return winevt_rc.WinevtResourcesHelper(
+      None, data_location, lcid, index_message_strings=False,
+      preload_database=preload_database, collect_statistics=False,
+      warm_up=False, persistent_cache=False)
+
+
+def _GetLogSourceLookups(corpus_generator):
+  """Retrieves lookups by EventLog source.
+
+  Args:
+    corpus_generator (SyntheticCorpusGenerator): synthetic corpus generator.
+
+  Returns:
+    list[tuple[str, str, int, int]]: lookups of every message of every case
+        variant of every EventLog source, including undefined messages and
+        an undefined EventLog source.
+  """
+  message_identifiers = corpus_generator.GetMessageIdentifiers() + [
+      _UNDEFINED_MESSAGE_IDENTIFIER]
+
+  lookups = []
+  for provider_index in range(corpus_generator.number_of_providers):
+    log_source = corpus_generator.GetLogSource(provider_index)
+    for lookup_log_source in (
+        log_source, log_source.lower(), log_source.upper()):
+      for message_identifier in message_identifiers:
+        lookups.append((None, lookup_log_source, message_identifier, None))
+
+  lookups.append((None, 'Undefined-Provider', 1, None))
+  return lookups
+
+
+def _GetProviderIdentifierLookups(corpus_generator):
+  """Retrieves lookups by EventLog provider identifier.
+
+  Args:
+    corpus_generator (SyntheticCorpusGenerator): synthetic corpus generator.
+
+  Returns:
+    list[tuple[str, str, int, int]]: lookups of every message and event
+        version of every EventLog provider, including undefined messages.
+  """
+  message_identifiers = corpus_generator.GetMessageIdentifiers() + [
+      _UNDEFINED_MESSAGE_IDENTIFIER]
+
+  lookups = []
+  for provider_index in range(corpus_generator.number_of_providers):
+    provider_identifier = corpus_generator.GetProviderIdentifier(
+        provider_index)
+    for message_identifier in message_identifiers:
+      for event_version in (0, 1, None):
+        lookups.append((
+            provider_identifier, None, message_identifier, event_version))
+
+  return lookups
+
+
+def _ResolveLookups(data_location, lcid, lookups, preload_database=False):
+  """Resolves lookups one by one and in bulk.
+
+  Args:
+    data_location (str): data location of the winevt-rc database.
+    lcid (int): language code identifier (LCID).
+    lookups (list[tuple[str, str, int, int]]): EventLog provider identifier,
+        EventLog source, message identifier and event version of the
+        requested message strings.
+    preload_database (Optional[bool]): True if the EventLog providers of the
+        winevt-rc database should be loaded into memory.
+
+  Returns:
+    tuple[str, list[str]]: name of the class of the winevt-rc database
+        reader and the message strings, or None if not available, in the
+        order of the lookups.
+  """
+  helper = _CreateHelper(
+      data_location, lcid, preload_database=preload_database)
+  try:
+    database_reader = helper._GetWinevtRcDatabaseReader()  # pylint: disable=protected-access
+    message_strings = [helper.GetMessageString(*lookup) for lookup in lookups]
+  finally:
+    helper.Close()
+
+  helper = _CreateHelper(
+      data_location, lcid, preload_database=preload_database)
+  try:
+    assert helper.GetMessageStrings(lookups) == message_strings
+  finally:
+    helper.Close()
+
+  return type(database_reader).__name__, message_strings
+
+
+@pytest.fixture(name='corpus', scope='module')
+def fixture_corpus(tmp_path_factory):
+  """Generates the synthetic corpus in every winevt-rc format.
+
+  Args:
+    tmp_path_factory (pytest.TempPathFactory): temporary path factory.
+
+  Returns:
+    dict[str, object]: corpus generator and data location per format.
+  """
+  corpus_generator = winevt_rc_benchmark.SyntheticCorpusGenerator(
+      number_of_providers=12, number_of_message_files=2,
+      lcids=[0x0409, 0x0407], number_of_strings=16)
+
+  data_locations = {}
+  for name in ('acstore', 'acstore_lookup_file', 'sqlite',
+               'sqlite_lookup_file'):
+    data_location = str(tmp_path_factory.mktemp(name))
+    path = os.path.join(data_location, 'winevt-rc.db')
+
+    if name.startswith('acstore'):
+      corpus_generator.WriteAttributeContainerStore(path)
+    else:
+      corpus_generator.WriteSqlite3Database(path)
+
+    if name.endswith('lookup_file'):
+      winevt_rc.CreateLookupFile(path, corpus_generator.lcids)
+
+    data_locations[name] = data_location
+
+  return {'generator': corpus_generator, 'data_locations': data_locations}
+
+
+@pytest.mark.parametrize('lcid', [0x0409, 0x0407])
+def testLookupTiersByLogSource(corpus, lcid):
+  """Tests that all the tiers resolve EventLog sources the same."""
+  corpus_generator = corpus['generator']
+  data_locations = corpus['data_locations']
+
+  lookups = _GetLogSourceLookups(corpus_generator)
+
+  # Data location, whether the database is preloaded and expected type of
+  # the winevt-rc database reader per tier.
+  tiers = {
+      'acstore': (
+          'acstore', False, 'WinevtResourcesAttributeContainerStore'),
+      'acstore_lookup_file': (
+          'acstore_lookup_file', False, 'WinevtResourcesLookupFile'),
+      'sqlite': ('sqlite', False, 'WinevtResourcesSqlite3DatabaseReader'),
+      'sqlite_lookup_file': (
+          'sqlite_lookup_file', False, 'WinevtResourcesLookupFile'),
+      'sqlite_preload': (
+          'sqlite', True, 'WinevtResourcesSqlite3DatabaseReader')}
+
+  message_strings_per_tier = {}
+  for tier_name, (data_location_name, preload_database, expected_type) in (
+      tiers.items()):
+    tier_type, message_strings_per_tier[tier_name] = _ResolveLookups(
+        data_locations[data_location_name], lcid, lookups,
+        preload_database=preload_database)
+    assert tier_type == expected_type, tier_name
+
+  # Every case variant of every EventLog source resolves every message.
+  expected_message_strings = message_strings_per_tier['sqlite']
+  assert len(list(filter(None, expected_message_strings))) == (
+      3 * corpus_generator.number_of_providers *
+      corpus_generator.number_of_strings)
+
+  for tier_name, message_strings in message_strings_per_tier.items():
+    assert message_strings == expected_message_strings, tier_name
+
+
+def testLookupTiersByProviderIdentifier(corpus):
+  """Tests that the attribute container store tiers resolve the same."""
+  lookups = _GetProviderIdentifierLookups(corpus['generator'])
+  data_locations = corpus['data_locations']
+
+  message_strings_per_tier = {}
+  for tier_name in ('acstore', 'acstore_lookup_file'):
+    _, message_strings_per_tier[tier_name] = _ResolveLookups(
+        data_locations[tier_name], 0x0409, lookups)
+
+  expected_message_strings = message_strings_per_tier['acstore']
+  assert any(expected_message_strings)
+  assert message_strings_per_tier['acstore_lookup_file'] == (
+      expected_message_strings)